@@ -0,0 +1,54 @@
+"""adds sessions keyset index
+
+Revision ID: 0b4e7d2a9c58
+Revises: f2d8b6a4c915
+Create Date: 2026-10-18 20:41:12.384590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b4e7d2a9c58'
+down_revision: Union[str, Sequence[str], None] = 'f2d8b6a4c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_sessions_therapist_date',
+            'sessions',
+            ['therapist_id', 'is_deleted', sa.text('session_date DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # A prefix of the new index.
+        op.drop_index(
+            'idx_sessions_therapist',
+            table_name='sessions',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_sessions_therapist',
+            'sessions',
+            ['therapist_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_sessions_therapist_date',
+            table_name='sessions',
+            postgresql_concurrently=True,
+        )
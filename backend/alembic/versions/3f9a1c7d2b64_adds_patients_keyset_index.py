@@ -0,0 +1,41 @@
+"""adds patients keyset pagination index
+
+Revision ID: 3f9a1c7d2b64
+Revises: e4febd4a32e5
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7d2b64'
+down_revision: Union[str, Sequence[str], None] = 'e4febd4a32e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_patients_therapist_created',
+            'patients',
+            ['therapist_id', 'is_deleted', sa.text('created_at DESC'), 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_patients_therapist_created',
+            table_name='patients',
+            postgresql_concurrently=True,
+        )
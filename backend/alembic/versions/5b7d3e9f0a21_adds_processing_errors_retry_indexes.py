@@ -0,0 +1,55 @@
+"""adds processing_errors retry indexes
+
+Revision ID: 5b7d3e9f0a21
+Revises: 8c2e4f6a1d93
+Create Date: 2026-10-18 14:21:40.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7d3e9f0a21'
+down_revision: Union[str, Sequence[str], None] = '8c2e4f6a1d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_processing_errors_due',
+            'processing_errors',
+            ['next_retry_at'],
+            unique=False,
+            postgresql_where=sa.text('is_resolved = false'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_processing_errors_session_unresolved',
+            'processing_errors',
+            ['session_id'],
+            unique=False,
+            postgresql_where=sa.text('is_resolved = false'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_processing_errors_session_unresolved',
+            table_name='processing_errors',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_processing_errors_due',
+            table_name='processing_errors',
+            postgresql_concurrently=True,
+        )
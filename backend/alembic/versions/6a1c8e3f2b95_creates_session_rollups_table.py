@@ -0,0 +1,93 @@
+"""creates session_rollups table
+
+Revision ID: 6a1c8e3f2b95
+Revises: 9d3f6b1e4a70
+Create Date: 2026-10-18 22:14:08.630521
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1c8e3f2b95'
+down_revision: Union[str, Sequence[str], None] = '9d3f6b1e4a70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same mapping as app.services.progress_service.RISK_LEVELS.
+RISK_LEVELS = {
+    'low': ('low', 'baixo', 'baixa'),
+    'medium': ('medium', 'moderate', 'medio', 'médio', 'moderado', 'moderada', 'média'),
+    'high': ('high', 'critical', 'severe', 'alto', 'alta', 'crítico', 'grave'),
+}
+
+
+def _levels(bucket: str) -> str:
+    return ', '.join(f"'{level}'" for level in RISK_LEVELS[bucket])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('session_rollups',
+    sa.Column('therapist_id', sa.UUID(), nullable=False),
+    sa.Column('patient_id', sa.UUID(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('session_count', sa.Integer(), nullable=False),
+    sa.Column('total_minutes', sa.Integer(), nullable=False),
+    sa.Column('risk_low', sa.Integer(), nullable=False),
+    sa.Column('risk_medium', sa.Integer(), nullable=False),
+    sa.Column('risk_high', sa.Integer(), nullable=False),
+    sa.Column('risk_unknown', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ),
+    sa.ForeignKeyConstraint(['therapist_id'], ['therapists.id'], ),
+    sa.PrimaryKeyConstraint('therapist_id', 'patient_id', 'week_start')
+    )
+    op.create_index('idx_session_rollups_therapist_week', 'session_rollups', ['therapist_id', 'week_start'], unique=False)
+
+    # Backfill from the sessions completed so far. Sessions completing
+    # while this runs are counted by the new code only, so stop the
+    # workers for the upgrade.
+    op.execute(
+        f"""
+        INSERT INTO session_rollups (
+            therapist_id, patient_id, week_start, session_count, total_minutes,
+            risk_low, risk_medium, risk_high, risk_unknown, updated_at
+        )
+        SELECT
+            therapist_id,
+            patient_id,
+            date_trunc('week', session_date AT TIME ZONE 'UTC')::date,
+            count(*),
+            sum(session_duration_minutes),
+            count(*) FILTER (WHERE level IN ({_levels('low')})),
+            count(*) FILTER (WHERE level IN ({_levels('medium')})),
+            count(*) FILTER (WHERE level IN ({_levels('high')})),
+            count(*) FILTER (
+                WHERE level IS NULL
+                OR level NOT IN ({_levels('low')}, {_levels('medium')}, {_levels('high')})
+            ),
+            now()
+        FROM (
+            SELECT
+                therapist_id,
+                patient_id,
+                session_date,
+                session_duration_minutes,
+                lower(btrim(summary #>> '{{risk_assessment,level}}')) AS level
+            FROM sessions
+            WHERE processing_status = 'completed'
+        ) AS completed
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_session_rollups_therapist_week', table_name='session_rollups')
+    op.drop_table('session_rollups')
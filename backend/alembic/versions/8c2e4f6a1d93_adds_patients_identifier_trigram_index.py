@@ -0,0 +1,56 @@
+"""adds patients identifier trigram index
+
+Revision ID: 8c2e4f6a1d93
+Revises: 3f9a1c7d2b64
+Create Date: 2026-10-18 10:03:17.552910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c2e4f6a1d93'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_patients_identifier_trgm',
+            'patients',
+            ['identifier'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'identifier': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_patients_therapist_identifier_prefix',
+            'patients',
+            ['therapist_id', sa.text('lower(identifier) text_pattern_ops')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_patients_therapist_identifier_prefix',
+            table_name='patients',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_patients_identifier_trgm',
+            table_name='patients',
+            postgresql_concurrently=True,
+        )
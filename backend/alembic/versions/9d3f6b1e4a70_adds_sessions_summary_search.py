@@ -0,0 +1,83 @@
+"""adds sessions summary full-text search
+
+Revision ID: 9d3f6b1e4a70
+Revises: 0b4e7d2a9c58
+Create Date: 2026-10-18 21:27:45.102337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f6b1e4a70'
+down_revision: Union[str, Sequence[str], None] = '0b4e7d2a9c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Both are IMMUTABLE so a generated column may call them.
+SUMMARY_TEXT_FUNCTION = """
+CREATE OR REPLACE FUNCTION session_summary_text(summary jsonb) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT coalesce(string_agg(value #>> '{}', E'\\n'), '')
+    FROM jsonb_path_query(summary, 'strict $.** ? (@.type() == "string")') AS value
+$$
+"""
+
+SEARCH_CONFIG_FUNCTION = """
+CREATE OR REPLACE FUNCTION session_search_config(audio_metadata jsonb) RETURNS regconfig
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT CASE WHEN audio_metadata ->> 'transcript_language' LIKE 'en%'
+        THEN 'english'::regconfig
+        ELSE 'portuguese'::regconfig
+    END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(SUMMARY_TEXT_FUNCTION)
+    op.execute(SEARCH_CONFIG_FUNCTION)
+    # A stored generated column rewrites the table once, under an exclusive
+    # lock; run this in a quiet window on large installs.
+    op.add_column(
+        'sessions',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                'to_tsvector(session_search_config(audio_metadata), '
+                'session_summary_text(summary))',
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_sessions_search',
+            'sessions',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_sessions_search',
+            table_name='sessions',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('sessions', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS session_search_config(jsonb)")
+    op.execute("DROP FUNCTION IF EXISTS session_summary_text(jsonb)")
@@ -0,0 +1,125 @@
+"""partitions audit_logs by month
+
+Revision ID: a4c81e2f9d37
+Revises: 5b7d3e9f0a21
+Create Date: 2026-10-18 16:02:51.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c81e2f9d37'
+down_revision: Union[str, Sequence[str], None] = '5b7d3e9f0a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Creates the monthly partitions (named audit_logs_yYYYYmMM, bounds in UTC)
+# from from_month through months_ahead months past the current one. Run by
+# the audit retention job so future months always exist before rows arrive.
+ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION audit_logs_ensure_partitions(from_month date, months_ahead integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                        + make_interval(months => months_ahead))::date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        partition_name := 'audit_logs_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                month_start::text || ' 00:00:00+00',
+                (month_start + interval '1 month')::date::text || ' 00:00:00+00'
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$
+"""
+
+COLUMNS = (
+    'id, user_id, user_email, action, resource_type, resource_id, datails, '
+    'ip_address, user_agent, request_id, created_at'
+)
+
+
+def _audit_columns() -> list:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('user_email', sa.String(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('resource_type', sa.String(), nullable=False),
+        sa.Column('resource_id', sa.UUID(), nullable=False),
+        sa.Column('datails', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('ip_address', sa.String(), nullable=False),
+        sa.Column('user_agent', sa.String(), nullable=False),
+        sa.Column('request_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['therapists.id'], ),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('idx_audit_user', table_name='audit_logs')
+    op.drop_index('idx_audit_action', table_name='audit_logs')
+    op.rename_table('audit_logs', 'audit_logs_unpartitioned')
+    op.execute(
+        'ALTER TABLE audit_logs_unpartitioned '
+        'RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey'
+    )
+
+    # The partition key has to be part of the primary key.
+    op.create_table(
+        'audit_logs',
+        *_audit_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index('idx_audit_action', 'audit_logs', ['action'], unique=False)
+    op.create_index('idx_audit_user', 'audit_logs', ['user_id'], unique=False)
+
+    op.execute(ENSURE_PARTITIONS)
+    op.execute(
+        "SELECT audit_logs_ensure_partitions("
+        "COALESCE((SELECT min(created_at) AT TIME ZONE 'UTC' FROM audit_logs_unpartitioned)::date, "
+        "(now() AT TIME ZONE 'UTC')::date), 3)"
+    )
+    op.execute(
+        f'INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_unpartitioned'
+    )
+    op.drop_table('audit_logs_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('audit_logs', 'audit_logs_partitioned')
+    op.drop_index('idx_audit_user', table_name='audit_logs_partitioned')
+    op.drop_index('idx_audit_action', table_name='audit_logs_partitioned')
+    op.execute(
+        'ALTER TABLE audit_logs_partitioned '
+        'RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey'
+    )
+    op.create_table('audit_logs', *_audit_columns(), sa.PrimaryKeyConstraint('id'))
+    op.create_index('idx_audit_action', 'audit_logs', ['action'], unique=False)
+    op.create_index('idx_audit_user', 'audit_logs', ['user_id'], unique=False)
+    op.execute(
+        f'INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned'
+    )
+    # Drops the partitions with it.
+    op.drop_table('audit_logs_partitioned')
+    op.execute('DROP FUNCTION IF EXISTS audit_logs_ensure_partitions(date, integer)')
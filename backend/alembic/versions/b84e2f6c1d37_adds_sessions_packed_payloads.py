@@ -0,0 +1,142 @@
+"""adds sessions packed payloads
+
+Revision ID: b84e2f6c1d37
+Revises: 6a1c8e3f2b95
+Create Date: 2026-10-18 23:02:51.417306
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.compression import compress, decompress, payload_codec_enabled
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84e2f6c1d37'
+down_revision: Union[str, Sequence[str], None] = '6a1c8e3f2b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same keys as app.models.session.PACKED_KEYS when this was written.
+PACKED_KEYS = {
+    'audio_metadata': ('timings', 'transcript_segments'),
+    'summary': ('transcript_segments',),
+}
+BATCH_SIZE = 500
+
+SELECT_UNPACKED = sa.text(
+    """
+    SELECT id, version, audio_metadata, summary FROM sessions
+    WHERE (audio_metadata ?| :audio_metadata_keys OR summary ?| :summary_keys)
+    AND id > :after
+    ORDER BY id
+    LIMIT :limit
+    """
+)
+# version is matched but not bumped: a row written in the meantime is
+# skipped, and the data a reader sees does not change.
+UPDATE_PACKED = sa.text(
+    """
+    UPDATE sessions SET
+        audio_metadata = CAST(:audio_metadata AS jsonb),
+        summary = CAST(:summary AS jsonb),
+        audio_metadata_packed = :audio_metadata_packed,
+        summary_packed = :summary_packed
+    WHERE id = :id AND version = :version
+    """
+)
+SELECT_PACKED = sa.text(
+    """
+    SELECT id, audio_metadata_packed, summary_packed FROM sessions
+    WHERE (audio_metadata_packed IS NOT NULL OR summary_packed IS NOT NULL)
+    AND id > :after
+    ORDER BY id
+    LIMIT :limit
+    """
+)
+UPDATE_UNPACKED = sa.text(
+    """
+    UPDATE sessions SET
+        audio_metadata = audio_metadata || CAST(:audio_metadata AS jsonb),
+        summary = summary || CAST(:summary AS jsonb),
+        audio_metadata_packed = NULL,
+        summary_packed = NULL
+    WHERE id = :id
+    """
+)
+_FIRST_ID = '00000000-0000-0000-0000-000000000000'
+
+
+def _pack(row) -> dict:
+    values = {'id': str(row.id), 'version': row.version}
+    for column, keys in PACKED_KEYS.items():
+        value = getattr(row, column) or {}
+        packed = {key: item for key, item in value.items() if key in keys}
+        values[column] = json.dumps(
+            {key: item for key, item in value.items() if key not in keys}
+        )
+        values[f'{column}_packed'] = (
+            compress(json.dumps(packed, separators=(',', ':')).encode()) if packed else None
+        )
+    return values
+
+
+def _unpack(row) -> dict:
+    values = {'id': str(row.id)}
+    for column in PACKED_KEYS:
+        packed = getattr(row, f'{column}_packed')
+        values[column] = decompress(bytes(packed)).decode() if packed else '{}'
+    return values
+
+
+def _in_batches(select_stmt, update_stmt, convert, params: dict) -> None:
+    # Each batch commits on its own, and only rows still to do are selected,
+    # so an interrupted run picks up where it stopped.
+    connection = op.get_bind()
+    after = _FIRST_ID
+    while True:
+        rows = connection.execute(
+            select_stmt, {**params, 'after': after, 'limit': BATCH_SIZE}
+        ).all()
+        if not rows:
+            return
+        connection.execute(update_stmt, [convert(row) for row in rows])
+        after = str(rows[-1].id)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'sessions',
+        sa.Column('audio_metadata_packed', sa.LargeBinary(), nullable=True),
+        if_not_exists=True,
+    )
+    op.add_column(
+        'sessions',
+        sa.Column('summary_packed', sa.LargeBinary(), nullable=True),
+        if_not_exists=True,
+    )
+    if not payload_codec_enabled():
+        return
+    with op.get_context().autocommit_block():
+        _in_batches(
+            SELECT_UNPACKED,
+            UPDATE_PACKED,
+            _pack,
+            {
+                'audio_metadata_keys': list(PACKED_KEYS['audio_metadata']),
+                'summary_keys': list(PACKED_KEYS['summary']),
+            },
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        _in_batches(SELECT_PACKED, UPDATE_UNPACKED, _unpack, {})
+    op.drop_column('sessions', 'summary_packed')
+    op.drop_column('sessions', 'audio_metadata_packed')
@@ -0,0 +1,57 @@
+"""fixes patients keyset index order
+
+Revision ID: c5d9a3e7f102
+Revises: b84e2f6c1d37
+Create Date: 2026-10-19 09:41:17.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d9a3e7f102'
+down_revision: Union[str, Sequence[str], None] = 'b84e2f6c1d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rebuild(id_order: str) -> None:
+    # Built beside the old index and swapped in by name, so the patient list
+    # is never left without one.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_patients_therapist_created_new',
+            'patients',
+            [
+                'therapist_id',
+                'is_deleted',
+                sa.text('created_at DESC'),
+                sa.text(f'id {id_order}'),
+            ],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_patients_therapist_created',
+            table_name='patients',
+            postgresql_concurrently=True,
+        )
+        op.execute(
+            'ALTER INDEX idx_patients_therapist_created_new '
+            'RENAME TO idx_patients_therapist_created'
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The list orders by (created_at DESC, id DESC); with id ascending the
+    # index could not return that order and every page sorted.
+    _rebuild('DESC')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild('ASC')
@@ -0,0 +1,50 @@
+"""adds audit_logs query indexes
+
+Revision ID: c7e2a9d4f613
+Revises: a4c81e2f9d37
+Create Date: 2026-10-18 17:12:08.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2a9d4f613'
+down_revision: Union[str, Sequence[str], None] = 'a4c81e2f9d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Indexes on a partitioned table cannot be built CONCURRENTLY; each one
+    # is created on every partition. The single-column indexes are prefixes
+    # of the new composites and go away.
+    op.create_index(
+        'idx_audit_user_created', 'audit_logs', ['user_id', 'created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'idx_audit_resource_created',
+        'audit_logs',
+        ['resource_type', 'resource_id', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'idx_audit_action_created', 'audit_logs', ['action', 'created_at', 'id'], unique=False
+    )
+    op.create_index('idx_audit_created', 'audit_logs', ['created_at', 'id'], unique=False)
+    op.drop_index('idx_audit_user', table_name='audit_logs')
+    op.drop_index('idx_audit_action', table_name='audit_logs')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_audit_action', 'audit_logs', ['action'], unique=False)
+    op.create_index('idx_audit_user', 'audit_logs', ['user_id'], unique=False)
+    op.drop_index('idx_audit_created', table_name='audit_logs')
+    op.drop_index('idx_audit_action_created', table_name='audit_logs')
+    op.drop_index('idx_audit_resource_created', table_name='audit_logs')
+    op.drop_index('idx_audit_user_created', table_name='audit_logs')
@@ -0,0 +1,130 @@
+"""adds audit_logs default partition
+
+Revision ID: d7f3b91c4a26
+Revises: c5d9a3e7f102
+Create Date: 2026-10-19 10:26:03.581942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3b91c4a26'
+down_revision: Union[str, Sequence[str], None] = 'c5d9a3e7f102'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# As in a4c81e2f9d37, except that rows which landed in audit_logs_default
+# for a month are moved into that month's partition when it is created;
+# with them left there, creating the partition would fail.
+ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION audit_logs_ensure_partitions(from_month date, months_ahead integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                        + make_interval(months => months_ahead))::date;
+    partition_name text;
+    lower_bound text;
+    upper_bound text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        partition_name := 'audit_logs_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM');
+        lower_bound := month_start::text || ' 00:00:00+00';
+        upper_bound := (month_start + interval '1 month')::date::text || ' 00:00:00+00';
+        IF to_regclass(partition_name) IS NULL THEN
+            IF to_regclass('audit_logs_default') IS NOT NULL AND EXISTS (
+                SELECT 1 FROM audit_logs_default
+                WHERE created_at >= lower_bound::timestamptz
+                AND created_at < upper_bound::timestamptz
+            ) THEN
+                EXECUTE format(
+                    'CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                    partition_name
+                );
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM audit_logs_default '
+                    'WHERE created_at >= %L AND created_at < %L RETURNING *) '
+                    'INSERT INTO %I SELECT * FROM moved',
+                    lower_bound, upper_bound, partition_name
+                );
+                EXECUTE format(
+                    'ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, lower_bound, upper_bound
+                );
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, lower_bound, upper_bound
+                );
+            END IF;
+            created := created + 1;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$
+"""
+
+PREVIOUS_ENSURE_PARTITIONS = """
+CREATE OR REPLACE FUNCTION audit_logs_ensure_partitions(from_month date, months_ahead integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                        + make_interval(months => months_ahead))::date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        partition_name := 'audit_logs_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                month_start::text || ' 00:00:00+00',
+                (month_start + interval '1 month')::date::text || ' 00:00:00+00'
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(ENSURE_PARTITIONS)
+    # Catches rows past the last monthly partition, so audit writes keep
+    # working when the retention job is disabled or no worker runs. The
+    # job moves them into their month once it creates it.
+    op.execute('CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "SELECT audit_logs_ensure_partitions("
+        "COALESCE((SELECT min(created_at) AT TIME ZONE 'UTC' FROM audit_logs_default)::date, "
+        "(now() AT TIME ZONE 'UTC')::date), 3)"
+    )
+    op.execute(
+        "DO $$ BEGIN IF EXISTS (SELECT 1 FROM audit_logs_default) THEN "
+        "RAISE EXCEPTION 'audit_logs_default still holds rows past the partitions'; "
+        "END IF; END $$"
+    )
+    op.drop_table('audit_logs_default')
+    op.execute(PREVIOUS_ENSURE_PARTITIONS)
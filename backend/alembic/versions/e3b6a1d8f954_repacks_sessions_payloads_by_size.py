@@ -0,0 +1,98 @@
+"""repacks sessions payloads by size
+
+Revision ID: e3b6a1d8f954
+Revises: d7f3b91c4a26
+Create Date: 2026-10-19 14:12:37.904516
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.compression import compress, decompress, worth_packing
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b6a1d8f954'
+down_revision: Union[str, Sequence[str], None] = 'd7f3b91c4a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same keys as app.models.session.PACKED_KEYS when this was written.
+PACKED_KEYS = {
+    'audio_metadata': ('upload',),
+    'summary': (),
+}
+BATCH_SIZE = 500
+
+SELECT_PACKED = sa.text(
+    """
+    SELECT id, version, audio_metadata, summary, audio_metadata_packed, summary_packed
+    FROM sessions
+    WHERE (audio_metadata_packed IS NOT NULL OR summary_packed IS NOT NULL)
+    AND id > :after
+    ORDER BY id
+    LIMIT :limit
+    """
+)
+# As in b84e2f6c1d37: version is matched but not bumped.
+UPDATE_REPACKED = sa.text(
+    """
+    UPDATE sessions SET
+        audio_metadata = CAST(:audio_metadata AS jsonb),
+        summary = CAST(:summary AS jsonb),
+        audio_metadata_packed = :audio_metadata_packed,
+        summary_packed = :summary_packed
+    WHERE id = :id AND version = :version
+    """
+)
+_FIRST_ID = '00000000-0000-0000-0000-000000000000'
+
+
+def _repack(row) -> dict:
+    # Rows packed under the old key list (timings) go back inline unless
+    # they are still packed keys and big enough.
+    values = {'id': str(row.id), 'version': row.version}
+    for column, keys in PACKED_KEYS.items():
+        packed_column = getattr(row, f'{column}_packed')
+        value = {
+            **(getattr(row, column) or {}),
+            **(json.loads(decompress(bytes(packed_column))) if packed_column else {}),
+        }
+        packed = {key: item for key, item in value.items() if key in keys}
+        if not worth_packing(packed):
+            packed = {}
+        values[column] = json.dumps(
+            {key: item for key, item in value.items() if key not in packed}
+        )
+        values[f'{column}_packed'] = (
+            compress(json.dumps(packed, separators=(',', ':')).encode()) if packed else None
+        )
+    return values
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each batch commits on its own; a repacked row is either selected again
+    # (still large, unchanged) or no longer selected, so a rerun is safe.
+    connection = op.get_bind()
+    with op.get_context().autocommit_block():
+        after = _FIRST_ID
+        while True:
+            rows = connection.execute(
+                SELECT_PACKED, {'after': after, 'limit': BATCH_SIZE}
+            ).all()
+            if not rows:
+                return
+            connection.execute(UPDATE_REPACKED, [_repack(row) for row in rows])
+            after = str(rows[-1].id)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The previous revision reads any packed key back, so there is nothing
+    # to undo.
+    pass
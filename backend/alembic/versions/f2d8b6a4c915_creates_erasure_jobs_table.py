@@ -0,0 +1,75 @@
+"""creates erasure_jobs table
+
+Revision ID: f2d8b6a4c915
+Revises: e5b1f3c8a027
+Create Date: 2026-10-18 19:26:47.602118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d8b6a4c915'
+down_revision: Union[str, Sequence[str], None] = 'e5b1f3c8a027'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('erasure_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('therapist_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('step', sa.String(), nullable=True),
+    sa.Column('progress', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_erasure_jobs_therapist', 'erasure_jobs', ['therapist_id'], unique=False)
+    op.create_index(
+        'idx_erasure_jobs_active',
+        'erasure_jobs',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("status != 'completed'"),
+    )
+
+    # Audit entries survive an erasure with the actor reference cleared.
+    # Re-adding the key validates existing rows once (partitioned tables
+    # do not take NOT VALID foreign keys).
+    op.alter_column('audit_logs', 'user_id', existing_type=sa.UUID(), nullable=True)
+    op.drop_constraint('audit_logs_user_id_fkey', 'audit_logs', type_='foreignkey')
+    op.create_foreign_key(
+        'audit_logs_user_id_fkey',
+        'audit_logs',
+        'therapists',
+        ['user_id'],
+        ['id'],
+        ondelete='SET NULL',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('audit_logs_user_id_fkey', 'audit_logs', type_='foreignkey')
+    op.create_foreign_key(
+        'audit_logs_user_id_fkey', 'audit_logs', 'therapists', ['user_id'], ['id']
+    )
+    # Fails if erased actors' entries remain; those have no user to restore.
+    op.alter_column('audit_logs', 'user_id', existing_type=sa.UUID(), nullable=False)
+    op.drop_index(
+        'idx_erasure_jobs_active',
+        table_name='erasure_jobs',
+        postgresql_where=sa.text("status != 'completed'"),
+    )
+    op.drop_index('idx_erasure_jobs_therapist', table_name='erasure_jobs')
+    op.drop_table('erasure_jobs')
@@ -0,0 +1,109 @@
+import uuid
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Optional
+import datetime
+from app.core.dependencies import get_current_therapist, get_current_therapist_async
+from app.core.database import get_async_db, get_db
+from app.schemas.audit import AuditLogFilter, PaginatedAuditLogResponse
+from app.schemas.therapist import TherapistResponse
+from app.services.audit_service import audit_log
+from app.services.audit_log_service import (
+    AsyncAuditLogService,
+    AuditLogService,
+    audit_criteria,
+)
+
+router = APIRouter(prefix="/audit-logs", tags=["Audit"])
+async_router = APIRouter(prefix="/audit-logs", tags=["Audit"])
+
+
+def audit_filters(
+    user_id: Optional[uuid.UUID] = Query(
+        None, description="Actor; only admins may ask for someone else"
+    ),
+    resource_type: Optional[str] = Query(None, description="e.g. patient, session"),
+    resource_id: Optional[uuid.UUID] = Query(None, description="Requires resource_type"),
+    action: Optional[str] = Query(None, description="e.g. patient.update"),
+    created_after: Optional[datetime.datetime] = Query(
+        None, description="Only entries at or after this time"
+    ),
+    created_before: Optional[datetime.datetime] = Query(
+        None, description="Only entries before this time"
+    ),
+) -> AuditLogFilter:
+    return AuditLogFilter(
+        user_id=user_id,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        action=action,
+        created_after=created_after,
+        created_before=created_before,
+    )
+
+
+def _export_response(
+    therapist: TherapistResponse, filters: AuditLogFilter, body
+) -> StreamingResponse:
+    audit_log.record(
+        therapist,
+        "audit.export",
+        "therapist",
+        therapist.id,
+        filters.model_dump(mode="json", exclude_none=True),
+    )
+    return StreamingResponse(
+        body,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="audit-logs.ndjson"'},
+    )
+
+
+@router.get("/", response_model=PaginatedAuditLogResponse)
+def list_audit_logs(
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+    filters: AuditLogFilter = Depends(audit_filters),
+    page_size: int = Query(50, ge=1, le=500, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page"),
+):
+    criteria = audit_criteria(current_therapist, filters)
+    return AuditLogService.get_audit_logs(criteria, db, page_size, cursor)
+
+
+@router.get("/export")
+def export_audit_logs(
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+    filters: AuditLogFilter = Depends(audit_filters),
+):
+    """All matching entries as NDJSON, newest first, streamed as they are read."""
+    criteria = audit_criteria(current_therapist, filters)
+    return _export_response(
+        current_therapist, filters, AuditLogService.export_audit_logs(criteria)
+    )
+
+
+@async_router.get("/", response_model=PaginatedAuditLogResponse)
+async def list_audit_logs_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+    filters: AuditLogFilter = Depends(audit_filters),
+    page_size: int = Query(50, ge=1, le=500, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page"),
+):
+    criteria = audit_criteria(current_therapist, filters)
+    return await AsyncAuditLogService.get_audit_logs(criteria, db, page_size, cursor)
+
+
+@async_router.get("/export")
+async def export_audit_logs_async(
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+    filters: AuditLogFilter = Depends(audit_filters),
+):
+    """All matching entries as NDJSON, newest first, streamed as they are read."""
+    criteria = audit_criteria(current_therapist, filters)
+    return _export_response(
+        current_therapist, filters, AsyncAuditLogService.export_audit_logs(criteria)
+    )
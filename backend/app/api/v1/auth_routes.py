@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends
 from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.schemas.auth import LoginResponse, ResetPassword
 from app.schemas.therapist import TherapistCreate, TherapistLogin, TherapistResponse
-from app.services.auth_service import AuthService
-from app.services.therapist_service import TherapistService
-from app.core.dependencies import get_current_therapist
+from app.services.audit_service import audit_log
+from app.services.auth_service import AsyncAuthService, AuthService
+from app.services.therapist_service import AsyncTherapistService, TherapistService
+from app.core.dependencies import get_current_therapist, get_current_therapist_async
 
 router = APIRouter()
+async_router = APIRouter()
 
 
 @router.post("/signup", response_model=TherapistResponse)
@@ -18,7 +21,10 @@ def signup(data: TherapistCreate, db: Session = Depends(get_db)):
 
 @router.post("/login", response_model=LoginResponse)
 def login(data: TherapistLogin, db: Session = Depends(get_db)):
-    return AuthService.authenticate(data, db)
+    response = AuthService.authenticate(data, db)
+    therapist = response["therapist"]
+    audit_log.record(therapist, "auth.login", "therapist", therapist.id)
+    return response
 
 
 @router.post("/logout")
@@ -26,7 +32,9 @@ def logout(
     therapist: TherapistResponse = Depends(get_current_therapist),
     db: Session = Depends(get_db),
 ):
-    return AuthService.logout(therapist.id, db)
+    response = AuthService.logout(therapist.id, db)
+    audit_log.record(therapist, "auth.logout", "therapist", therapist.id)
+    return response
 
 
 @router.get("/refresh-token")
@@ -47,3 +55,48 @@ def forgot_password(email: EmailStr, db: Session = Depends(get_db)):
 def reset_password(token: str, data: ResetPassword, db: Session = Depends(get_db)):
     print(f"Reset password request for token: {token}")
     return AuthService.reset_password(token, data, db)
+
+
+@async_router.post("/signup", response_model=TherapistResponse)
+async def signup_async(data: TherapistCreate, db: AsyncSession = Depends(get_async_db)):
+    return await AsyncTherapistService.create_therapist(data, db)
+
+
+@async_router.post("/login", response_model=LoginResponse)
+async def login_async(data: TherapistLogin, db: AsyncSession = Depends(get_async_db)):
+    response = await AsyncAuthService.authenticate(data, db)
+    therapist = response["therapist"]
+    audit_log.record(therapist, "auth.login", "therapist", therapist.id)
+    return response
+
+
+@async_router.post("/logout")
+async def logout_async(
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    response = await AsyncAuthService.logout(therapist.id, db)
+    audit_log.record(therapist, "auth.logout", "therapist", therapist.id)
+    return response
+
+
+@async_router.get("/refresh-token")
+async def refresh_token_async(
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await AsyncAuthService.refresh_token(therapist.id, db)
+
+
+@async_router.post("/forgot-password")
+async def forgot_password_async(
+    email: EmailStr, db: AsyncSession = Depends(get_async_db)
+):
+    return await AsyncAuthService.forgot_password(email, db)
+
+
+@async_router.post("/reset-password")
+async def reset_password_async(
+    token: str, data: ResetPassword, db: AsyncSession = Depends(get_async_db)
+):
+    return await AsyncAuthService.reset_password(token, data, db)
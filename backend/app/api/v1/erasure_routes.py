@@ -0,0 +1,23 @@
+import uuid
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import get_async_db, get_db
+from app.schemas.erasure import ErasureJobResponse
+from app.services.erasure_service import AsyncErasureService, ErasureService
+
+# Unauthenticated on purpose: the account's tokens stop working as soon as
+# erasure starts. The unguessable job id is the capability, and the
+# response carries no personal data.
+router = APIRouter(prefix="/erasure-jobs", tags=["Erasure"])
+async_router = APIRouter(prefix="/erasure-jobs", tags=["Erasure"])
+
+
+@router.get("/{job_id}", response_model=ErasureJobResponse)
+def get_erasure_job(job_id: uuid.UUID, db: Session = Depends(get_db)):
+    return ErasureService.get_job(job_id, db)
+
+
+@async_router.get("/{job_id}", response_model=ErasureJobResponse)
+async def get_erasure_job_async(job_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    return await AsyncErasureService.get_job(job_id, db)
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Optional
+from fastapi import (
+    APIRouter,
+    Header,
+    HTTPException,
+    Query,
+    WebSocket,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from app.core.dependencies import authenticate_stream
+from app.services.notification_service import NOTIFY_HEARTBEAT_SECONDS, status_broker
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+# Reconnect delay suggested to EventSource clients.
+_SSE_RETRY_MS = 5000
+
+
+async def _events(queue: asyncio.Queue, payload: dict) -> AsyncIterator[Optional[dict]]:
+    """Events from ``queue``, None when a heartbeat is due; ends when the
+    token expires."""
+    expires_at = payload.get("exp")
+    while True:
+        timeout = NOTIFY_HEARTBEAT_SECONDS
+        if expires_at is not None:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                return
+            timeout = min(timeout, remaining)
+        try:
+            async with asyncio.timeout(timeout):
+                event = await queue.get()
+        except TimeoutError:
+            event = None
+        yield event
+
+
+@router.get("/sessions")
+async def session_events(
+    token: Optional[str] = Query(None, description="JWT, for clients that cannot set headers"),
+    authorization: Optional[str] = Header(None),
+):
+    """Server-Sent Events stream of the therapist's session status changes."""
+    therapist, payload = await authenticate_stream(token, authorization)
+
+    async def stream():
+        async with status_broker.subscribe(therapist.id) as queue:
+            yield f"retry: {_SSE_RETRY_MS}\n\n"
+            async for event in _events(queue, payload):
+                if event is None:
+                    yield ": ping\n\n"
+                else:
+                    yield f"event: session_status\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/sessions/ws")
+async def session_events_ws(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    authorization: Optional[str] = Header(None),
+):
+    """WebSocket stream of the therapist's session status changes."""
+    try:
+        therapist, payload = await authenticate_stream(token, authorization)
+    except HTTPException as exc:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=exc.detail)
+        return
+    await websocket.accept()
+
+    async def send(queue: asyncio.Queue) -> None:
+        async for event in _events(queue, payload):
+            if event is None:
+                await websocket.send_json({"type": "ping"})
+            else:
+                await websocket.send_json({"type": "session_status", **event})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired")
+
+    async def receive() -> None:
+        # Clients only listen; reading is how a disconnect is noticed.
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    async with status_broker.subscribe(therapist.id) as queue:
+        tasks = [asyncio.create_task(send(queue)), asyncio.create_task(receive())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # Either side ending ends the stream; a send racing the
+            # client's close is expected and not worth surfacing. wait(),
+            # unlike gather(return_exceptions=True), lets our own
+            # cancellation propagate.
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks)
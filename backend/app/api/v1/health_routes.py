@@ -0,0 +1,39 @@
+import os
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from app.core.counting import count_cache
+from app.core.database import pool_stats
+from app.core.identity_cache import identity_cache
+from app.services.audit_service import audit_log
+from app.services.notification_service import status_broker
+from app.worker.runtime import embedded_worker_stats
+
+# Required in the X-Metrics-Token header; /health/metrics is off when unset.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+def require_metrics_token(x_metrics_token: Optional[str] = Header(None)) -> None:
+    if not METRICS_TOKEN or not secrets.compare_digest(
+        (x_metrics_token or "").encode(), METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+
+@router.get("/")
+def health():
+    return {"status": "ok"}
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_token)])
+def metrics():
+    return {
+        "db_pool": pool_stats(),
+        "identity_cache": identity_cache.stats(),
+        "count_cache": count_cache.stats(),
+        "worker": embedded_worker_stats(),
+        "notifications": status_broker.stats(),
+        "audit": audit_log.stats(),
+    }
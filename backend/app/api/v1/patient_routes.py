@@ -1,20 +1,54 @@
 import uuid
-from fastapi import APIRouter, Body, Depends, Query
+from fastapi import APIRouter, Body, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Literal, Optional
 import datetime
-from app.core.dependencies import get_current_therapist
-from app.core.database import get_db
+from app.core.dependencies import get_current_therapist, get_current_therapist_async
+from app.core.database import get_async_db, get_db
+from app.core.counting import DEFAULT_COUNT_STRATEGY, CountStrategy
 from app.schemas.therapist import TherapistResponse
 from app.schemas.patient import (
+    PatientBatchDelete,
+    PatientBatchResult,
+    PatientBatchUpdate,
     PatientCreate,
+    PatientImportReport,
     PaginatedPatientResponse,
     PatientFilter,
     PatientUpdate,
 )
-from app.services.patient_service import PatientService
+from app.schemas.progress import ProgressResponse
+from app.services.audit_service import audit_log
+from app.services.patient_service import AsyncPatientService, PatientService
+from app.services.progress_service import AsyncProgressService, ProgressService
+from app.services.patient_import_service import (
+    PatientImportService,
+    resolve_import_format,
+)
 
 router = APIRouter(prefix="/patients", tags=["Patients"])
+async_router = APIRouter(prefix="/patients", tags=["Patients"])
+
+
+def _audit_batch(
+    therapist: TherapistResponse, action: str, result: PatientBatchResult
+) -> None:
+    for outcome in result.results:
+        if outcome.status != "not_found":
+            audit_log.record(therapist, action, "patient", outcome.id, {"batch": True})
+
+
+def _audit_import(therapist: TherapistResponse, report: PatientImportReport) -> None:
+    # Imported rows are not returned individually; one row covers the import.
+    audit_log.record(
+        therapist,
+        "patient.import",
+        "therapist",
+        therapist.id,
+        report.model_dump(include={"total_rows", "inserted", "duplicates", "invalid"}),
+    )
 
 
 @router.get("/", response_model=PaginatedPatientResponse)
@@ -24,6 +58,9 @@ def list_patients(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
     identifier: Optional[str] = Query(None, description="Search by patient identifier"),
+    identifier_match: Literal["contains", "prefix", "closest"] = Query(
+        "contains", description="Identifier match mode (closest = ranked fuzzy match)"
+    ),
     consent_given: Optional[bool] = Query(None, description="Filter by consent status"),
     created_after: Optional[datetime.datetime] = Query(
         None, description="Filter patients created after this date"
@@ -31,9 +68,24 @@ def list_patients(
     created_before: Optional[datetime.datetime] = Query(
         None, description="Filter patients created before this date"
     ),
+    pagination: Literal["offset", "cursor"] = Query(
+        "offset", description="Pagination mode; cursor mode ignores page"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Opaque next_cursor from a previous page (implies cursor mode)"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute total/total_pages (default: true for offset, false for cursor)",
+    ),
+    count: CountStrategy = Query(
+        DEFAULT_COUNT_STRATEGY,
+        description="How total is computed: exact, cached (per filter, TTL) or estimate (planner)",
+    ),
 ):
     filters = PatientFilter(
         identifier=identifier,
+        identifier_match=identifier_match,
         consent_given=consent_given,
         created_after=created_after,
         created_before=created_before,
@@ -44,6 +96,10 @@ def list_patients(
         page=page,
         page_size=page_size,
         filters=filters,
+        cursor=cursor,
+        keyset=pagination == "cursor",
+        include_total=include_total,
+        count_strategy=count,
     )
 
 
@@ -53,7 +109,54 @@ def create_patient(
     current_therapist: TherapistResponse = Depends(get_current_therapist),
     patient: PatientCreate = Body(...),
 ):
-    return PatientService.create_patient(current_therapist.id, patient, db)
+    created = PatientService.create_patient(current_therapist.id, patient, db)
+    audit_log.record(current_therapist, "patient.create", "patient", created.id)
+    return created
+
+
+@router.post("/import", response_model=PatientImportReport)
+async def import_patients(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+    format: Optional[Literal["csv", "ndjson"]] = Query(
+        None, description="Body format; defaults to the Content-Type"
+    ),
+):
+    fmt = resolve_import_format(request.headers.get("content-type"), format)
+
+    async def write_batch(rows):
+        return await run_in_threadpool(
+            PatientService.import_batch, current_therapist.id, rows, db
+        )
+
+    report = await PatientImportService.import_stream(request.stream(), fmt, write_batch)
+    _audit_import(current_therapist, report)
+    return report
+
+
+@router.post("/batch/update", response_model=PatientBatchResult)
+def batch_update_patients(
+    data: PatientBatchUpdate,
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    result = PatientService.batch_update_patients(
+        current_therapist.id, data.ids, data.patch, db
+    )
+    _audit_batch(current_therapist, "patient.update", result)
+    return result
+
+
+@router.post("/batch/delete", response_model=PatientBatchResult)
+def batch_delete_patients(
+    data: PatientBatchDelete,
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    result = PatientService.batch_delete_patients(current_therapist.id, data.ids, db)
+    _audit_batch(current_therapist, "patient.delete", result)
+    return result
 
 
 @router.put("/{patient_id}")
@@ -63,7 +166,19 @@ def update_patient(
     db: Session = Depends(get_db),
     current_therapist: TherapistResponse = Depends(get_current_therapist),
 ):
-    return PatientService.update_patient(current_therapist.id, patient_id, data, db)
+    updated = PatientService.update_patient(current_therapist.id, patient_id, data, db)
+    audit_log.record(current_therapist, "patient.update", "patient", patient_id)
+    return updated
+
+
+@router.get("/{patient_id}/progress", response_model=ProgressResponse)
+def get_patient_progress(
+    patient_id: uuid.UUID,
+    weeks: int = Query(26, ge=1, le=260, description="Weeks back, this week included"),
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return ProgressService.get_progress(current_therapist.id, db, patient_id, weeks)
 
 
 @router.delete("/{patient_id}")
@@ -72,4 +187,153 @@ def delete_patient(
     db: Session = Depends(get_db),
     current_therapist: TherapistResponse = Depends(get_current_therapist),
 ):
-    return PatientService.delete_patient(current_therapist.id, patient_id, db)
+    response = PatientService.delete_patient(current_therapist.id, patient_id, db)
+    audit_log.record(current_therapist, "patient.delete", "patient", patient_id)
+    return response
+
+
+@async_router.get("/", response_model=PaginatedPatientResponse)
+async def list_patients_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    identifier: Optional[str] = Query(None, description="Search by patient identifier"),
+    identifier_match: Literal["contains", "prefix", "closest"] = Query(
+        "contains", description="Identifier match mode (closest = ranked fuzzy match)"
+    ),
+    consent_given: Optional[bool] = Query(None, description="Filter by consent status"),
+    created_after: Optional[datetime.datetime] = Query(
+        None, description="Filter patients created after this date"
+    ),
+    created_before: Optional[datetime.datetime] = Query(
+        None, description="Filter patients created before this date"
+    ),
+    pagination: Literal["offset", "cursor"] = Query(
+        "offset", description="Pagination mode; cursor mode ignores page"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Opaque next_cursor from a previous page (implies cursor mode)"
+    ),
+    include_total: Optional[bool] = Query(
+        None,
+        description="Compute total/total_pages (default: true for offset, false for cursor)",
+    ),
+    count: CountStrategy = Query(
+        DEFAULT_COUNT_STRATEGY,
+        description="How total is computed: exact, cached (per filter, TTL) or estimate (planner)",
+    ),
+):
+    filters = PatientFilter(
+        identifier=identifier,
+        identifier_match=identifier_match,
+        consent_given=consent_given,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    return await AsyncPatientService.get_patients(
+        therapist_id=current_therapist.id,
+        db=db,
+        page=page,
+        page_size=page_size,
+        filters=filters,
+        cursor=cursor,
+        keyset=pagination == "cursor",
+        include_total=include_total,
+        count_strategy=count,
+    )
+
+
+@async_router.post("/")
+async def create_patient_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+    patient: PatientCreate = Body(...),
+):
+    created = await AsyncPatientService.create_patient(current_therapist.id, patient, db)
+    audit_log.record(current_therapist, "patient.create", "patient", created.id)
+    return created
+
+
+@async_router.post("/import", response_model=PatientImportReport)
+async def import_patients_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+    format: Optional[Literal["csv", "ndjson"]] = Query(
+        None, description="Body format; defaults to the Content-Type"
+    ),
+):
+    fmt = resolve_import_format(request.headers.get("content-type"), format)
+
+    async def write_batch(rows):
+        return await AsyncPatientService.import_batch(current_therapist.id, rows, db)
+
+    report = await PatientImportService.import_stream(request.stream(), fmt, write_batch)
+    _audit_import(current_therapist, report)
+    return report
+
+
+@async_router.post("/batch/update", response_model=PatientBatchResult)
+async def batch_update_patients_async(
+    data: PatientBatchUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    result = await AsyncPatientService.batch_update_patients(
+        current_therapist.id, data.ids, data.patch, db
+    )
+    _audit_batch(current_therapist, "patient.update", result)
+    return result
+
+
+@async_router.post("/batch/delete", response_model=PatientBatchResult)
+async def batch_delete_patients_async(
+    data: PatientBatchDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    result = await AsyncPatientService.batch_delete_patients(
+        current_therapist.id, data.ids, db
+    )
+    _audit_batch(current_therapist, "patient.delete", result)
+    return result
+
+
+@async_router.put("/{patient_id}")
+async def update_patient_async(
+    patient_id: uuid.UUID,
+    data: PatientUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    updated = await AsyncPatientService.update_patient(
+        current_therapist.id, patient_id, data, db
+    )
+    audit_log.record(current_therapist, "patient.update", "patient", patient_id)
+    return updated
+
+
+@async_router.get("/{patient_id}/progress", response_model=ProgressResponse)
+async def get_patient_progress_async(
+    patient_id: uuid.UUID,
+    weeks: int = Query(26, ge=1, le=260, description="Weeks back, this week included"),
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await AsyncProgressService.get_progress(
+        current_therapist.id, db, patient_id, weeks
+    )
+
+
+@async_router.delete("/{patient_id}")
+async def delete_patient_async(
+    patient_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    response = await AsyncPatientService.delete_patient(
+        current_therapist.id, patient_id, db
+    )
+    audit_log.record(current_therapist, "patient.delete", "patient", patient_id)
+    return response
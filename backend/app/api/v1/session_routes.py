@@ -0,0 +1,323 @@
+import datetime
+import uuid
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Body, Depends, Header, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.dependencies import get_current_therapist, get_current_therapist_async
+from app.core.database import get_async_db, get_db
+from app.schemas.therapist import TherapistResponse
+from app.schemas.session import (
+    PaginatedSessionResponse,
+    SessionCreate,
+    SessionDetailResponse,
+    SessionEnqueueResponse,
+    SessionFilter,
+    SessionResponse,
+    SessionSearchResponse,
+    SessionStatus,
+    SessionStatusResponse,
+    SessionUploadComplete,
+    SessionUploadInit,
+    SessionUploadResult,
+    SessionUploadStatus,
+)
+from app.services.session_service import AsyncSessionService, SessionService
+from app.services.session_upload_service import (
+    AsyncSessionStore,
+    SessionUploadService,
+    SyncSessionStore,
+)
+
+router = APIRouter(prefix="/sessions", tags=["Sessions"])
+async_router = APIRouter(prefix="/sessions", tags=["Sessions"])
+
+SessionInclude = Literal["summary", "audio_metadata"]
+
+
+def session_filters(
+    patient_id: Optional[uuid.UUID] = Query(None),
+    processing_status: Optional[SessionStatus] = Query(None),
+    session_after: Optional[datetime.datetime] = Query(
+        None, description="Sessions on or after this date"
+    ),
+    session_before: Optional[datetime.datetime] = Query(
+        None, description="Sessions before this date"
+    ),
+) -> SessionFilter:
+    return SessionFilter(
+        patient_id=patient_id,
+        processing_status=processing_status,
+        session_after=session_after,
+        session_before=session_before,
+    )
+
+
+@router.post("/", response_model=SessionResponse)
+def create_session(
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+    session: SessionCreate = Body(...),
+):
+    return SessionService.create_session(current_therapist.id, session, db)
+
+
+@router.get("/", response_model=PaginatedSessionResponse)
+def list_sessions(
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+    filters: SessionFilter = Depends(session_filters),
+    summary_keys: List[str] = Query(
+        [], description="Summary keys to return with each session"
+    ),
+    page_size: int = Query(50, ge=1, le=200, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page"),
+):
+    return SessionService.list_sessions(
+        current_therapist.id, filters, db, summary_keys, page_size, cursor
+    )
+
+
+@router.get("/search", response_model=SessionSearchResponse)
+def search_sessions(
+    q: str = Query(..., min_length=2, max_length=200, description="Web-search syntax"),
+    patient_id: Optional[uuid.UUID] = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return SessionService.search_sessions(current_therapist.id, q, db, patient_id, limit)
+
+
+@router.get("/{session_id}", response_model=SessionDetailResponse)
+def get_session(
+    session_id: uuid.UUID,
+    include: List[SessionInclude] = Query(
+        ["summary"], description="Heavy fields to load"
+    ),
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return SessionService.get_session(current_therapist.id, session_id, include, db)
+
+
+@router.post("/{session_id}/enqueue", response_model=SessionEnqueueResponse)
+def enqueue_session(
+    session_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return SessionService.enqueue_session(current_therapist.id, session_id, db)
+
+
+@router.get("/{session_id}/status", response_model=SessionStatusResponse)
+def get_session_status(
+    session_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return SessionService.get_status(current_therapist.id, session_id, db)
+
+
+@router.post("/{session_id}/upload", response_model=SessionUploadStatus)
+async def start_upload(
+    session_id: uuid.UUID,
+    data: SessionUploadInit,
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return await SessionUploadService.start(
+        current_therapist.id, session_id, data, SyncSessionStore(db)
+    )
+
+
+@router.get("/{session_id}/upload", response_model=SessionUploadStatus)
+async def get_upload_status(
+    session_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return await SessionUploadService.get_status(
+        current_therapist.id, session_id, SyncSessionStore(db)
+    )
+
+
+@router.put("/{session_id}/upload", response_model=SessionUploadStatus)
+async def upload_chunk(
+    session_id: uuid.UUID,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk"),
+    content_length: Optional[int] = Header(None),
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return await SessionUploadService.write_chunk(
+        current_therapist.id,
+        session_id,
+        offset,
+        content_length,
+        request.stream(),
+        SyncSessionStore(db),
+    )
+
+
+@router.post("/{session_id}/upload/complete", response_model=SessionUploadResult)
+async def complete_upload(
+    session_id: uuid.UUID,
+    data: SessionUploadComplete = Body(SessionUploadComplete()),
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return await SessionUploadService.complete(
+        current_therapist.id, session_id, data, SyncSessionStore(db)
+    )
+
+
+@router.delete("/{session_id}/upload")
+async def abort_upload(
+    session_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist),
+):
+    return await SessionUploadService.abort(
+        current_therapist.id, session_id, SyncSessionStore(db)
+    )
+
+
+@async_router.post("/", response_model=SessionResponse)
+async def create_session_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+    session: SessionCreate = Body(...),
+):
+    return await AsyncSessionService.create_session(current_therapist.id, session, db)
+
+
+@async_router.get("/", response_model=PaginatedSessionResponse)
+async def list_sessions_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+    filters: SessionFilter = Depends(session_filters),
+    summary_keys: List[str] = Query(
+        [], description="Summary keys to return with each session"
+    ),
+    page_size: int = Query(50, ge=1, le=200, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page"),
+):
+    return await AsyncSessionService.list_sessions(
+        current_therapist.id, filters, db, summary_keys, page_size, cursor
+    )
+
+
+@async_router.get("/search", response_model=SessionSearchResponse)
+async def search_sessions_async(
+    q: str = Query(..., min_length=2, max_length=200, description="Web-search syntax"),
+    patient_id: Optional[uuid.UUID] = Query(None),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await AsyncSessionService.search_sessions(
+        current_therapist.id, q, db, patient_id, limit
+    )
+
+
+@async_router.get("/{session_id}", response_model=SessionDetailResponse)
+async def get_session_async(
+    session_id: uuid.UUID,
+    include: List[SessionInclude] = Query(
+        ["summary"], description="Heavy fields to load"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await AsyncSessionService.get_session(
+        current_therapist.id, session_id, include, db
+    )
+
+
+@async_router.post("/{session_id}/enqueue", response_model=SessionEnqueueResponse)
+async def enqueue_session_async(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await AsyncSessionService.enqueue_session(
+        current_therapist.id, session_id, db
+    )
+
+
+@async_router.get("/{session_id}/status", response_model=SessionStatusResponse)
+async def get_session_status_async(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await AsyncSessionService.get_status(current_therapist.id, session_id, db)
+
+
+@async_router.post("/{session_id}/upload", response_model=SessionUploadStatus)
+async def start_upload_async(
+    session_id: uuid.UUID,
+    data: SessionUploadInit,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await SessionUploadService.start(
+        current_therapist.id, session_id, data, AsyncSessionStore(db)
+    )
+
+
+@async_router.get("/{session_id}/upload", response_model=SessionUploadStatus)
+async def get_upload_status_async(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await SessionUploadService.get_status(
+        current_therapist.id, session_id, AsyncSessionStore(db)
+    )
+
+
+@async_router.put("/{session_id}/upload", response_model=SessionUploadStatus)
+async def upload_chunk_async(
+    session_id: uuid.UUID,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk"),
+    content_length: Optional[int] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await SessionUploadService.write_chunk(
+        current_therapist.id,
+        session_id,
+        offset,
+        content_length,
+        request.stream(),
+        AsyncSessionStore(db),
+    )
+
+
+@async_router.post(
+    "/{session_id}/upload/complete", response_model=SessionUploadResult
+)
+async def complete_upload_async(
+    session_id: uuid.UUID,
+    data: SessionUploadComplete = Body(SessionUploadComplete()),
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await SessionUploadService.complete(
+        current_therapist.id, session_id, data, AsyncSessionStore(db)
+    )
+
+
+@async_router.delete("/{session_id}/upload")
+async def abort_upload_async(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return await SessionUploadService.abort(
+        current_therapist.id, session_id, AsyncSessionStore(db)
+    )
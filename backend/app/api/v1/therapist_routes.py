@@ -1,14 +1,94 @@
-from fastapi import APIRouter, Body, Depends
+import uuid
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
+from app.schemas.data_export import DataExportFormat, DataExportResponse
+from app.schemas.erasure import ErasureJobResponse
+from app.schemas.progress import ProgressResponse
 from app.schemas.therapist import (
     TherapistResponse,
     TherapistBase,
 )
-from app.core.dependencies import get_current_therapist
-from app.services.therapist_service import TherapistService
+from app.core.dependencies import get_current_therapist, get_current_therapist_async
+from app.models.dataExport import DataExport
+from app.services.audit_service import audit_log
+from app.services.data_export_service import (
+    MEDIA_TYPES,
+    AsyncDataExportService,
+    DataExportService,
+    export_chunks,
+    export_chunks_async,
+    export_filename,
+    run_export_job,
+)
+from app.services.erasure_service import AsyncErasureService, ErasureService
+from app.services.progress_service import AsyncProgressService, ProgressService
+from app.services.storage_service import get_storage
+from app.services.therapist_service import AsyncTherapistService, TherapistService
 
 router = APIRouter(prefix="/me", tags=["Me"])
+async_router = APIRouter(prefix="/me", tags=["Me"])
+
+_FORMAT_QUERY = Query("ndjson", description="ndjson: one typed record per line; zip: a file per section")
+
+
+def _stream_export(therapist: TherapistResponse, fmt: str, body) -> StreamingResponse:
+    audit_log.record(
+        therapist, "therapist.data_export", "therapist", therapist.id, {"format": fmt}
+    )
+    # No Content-Length, so the body goes out with chunked transfer encoding.
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(fmt)}"'},
+    )
+
+
+def _start_export_job(
+    therapist: TherapistResponse,
+    job: DataExportResponse,
+    created: bool,
+    background_tasks: BackgroundTasks,
+    response: Response,
+) -> DataExportResponse:
+    if created:
+        audit_log.record(
+            therapist,
+            "therapist.data_export",
+            "data_export",
+            job.id,
+            {"format": job.format, "background": True},
+        )
+        background_tasks.add_task(run_export_job, job.id)
+    else:
+        response.status_code = status.HTTP_200_OK
+    return job
+
+
+def _erasure_started(
+    therapist: TherapistResponse,
+    job: ErasureJobResponse,
+    created: bool,
+    response: Response,
+) -> ErasureJobResponse:
+    if created:
+        audit_log.record(therapist, "therapist.erase", "therapist", therapist.id)
+    else:
+        response.status_code = status.HTTP_200_OK
+    return job
+
+
+def _download(export: DataExport) -> StreamingResponse:
+    return StreamingResponse(
+        get_storage().iter_bytes(export.storage_key),
+        media_type=MEDIA_TYPES[export.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(export.format)}"',
+            "Content-Length": str(export.size_bytes),
+        },
+    )
 
 
 @router.get("/", response_model=TherapistResponse)
@@ -28,9 +108,151 @@ def update_therapist(
     return TherapistService.update_therapist(therapist.id, data, db)
 
 
-@router.delete("/", response_model=None)
+@router.delete(
+    "/", response_model=ErasureJobResponse, status_code=status.HTTP_202_ACCEPTED
+)
 def delete_therapist(
+    response: Response,
+    therapist: TherapistResponse = Depends(get_current_therapist),
+    db: Session = Depends(get_db),
+):
+    """Locks the account and erases its data in the background (GDPR Art. 17)."""
+    job, created = ErasureService.start_erasure(therapist.id, db)
+    return _erasure_started(therapist, job, created, response)
+
+
+@router.get("/progress", response_model=ProgressResponse)
+def get_progress(
+    weeks: int = Query(26, ge=1, le=260, description="Weeks back, this week included"),
+    therapist: TherapistResponse = Depends(get_current_therapist),
+    db: Session = Depends(get_db),
+):
+    return ProgressService.get_progress(therapist.id, db, weeks=weeks)
+
+
+@router.get("/data-export")
+def data_export(
+    therapist: TherapistResponse = Depends(get_current_therapist),
+    format: DataExportFormat = _FORMAT_QUERY,
+):
+    """Everything held about the therapist (GDPR Art. 15), streamed."""
+    return _stream_export(therapist, format, export_chunks(therapist.id, format))
+
+
+@router.post(
+    "/data-export/jobs",
+    response_model=DataExportResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def create_data_export_job(
+    background_tasks: BackgroundTasks,
+    response: Response,
+    therapist: TherapistResponse = Depends(get_current_therapist),
+    db: Session = Depends(get_db),
+    format: DataExportFormat = _FORMAT_QUERY,
+):
+    """Builds the export in the background, for accounts too large to
+    download in one request; poll the job for its download_url."""
+    job, created = DataExportService.create_job(therapist.id, format, db)
+    return _start_export_job(therapist, job, created, background_tasks, response)
+
+
+@router.get("/data-export/jobs/{export_id}", response_model=DataExportResponse)
+def get_data_export_job(
+    export_id: uuid.UUID,
+    therapist: TherapistResponse = Depends(get_current_therapist),
+    db: Session = Depends(get_db),
+):
+    return DataExportService.get_job(therapist.id, export_id, db)
+
+
+@router.get("/data-export/jobs/{export_id}/download")
+def download_data_export(
+    export_id: uuid.UUID,
     therapist: TherapistResponse = Depends(get_current_therapist),
     db: Session = Depends(get_db),
 ):
-    return TherapistService.delete_therapist(therapist.id, db)
+    return _download(DataExportService.get_download(therapist.id, export_id, db))
+
+
+@async_router.get("/", response_model=TherapistResponse)
+async def me_async(
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+):
+    return therapist
+
+
+@async_router.put("/", response_model=TherapistResponse)
+async def update_therapist_async(
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+    db: AsyncSession = Depends(get_async_db),
+    data: TherapistBase = Body(...),
+):
+    return await AsyncTherapistService.update_therapist(therapist.id, data, db)
+
+
+@async_router.delete(
+    "/", response_model=ErasureJobResponse, status_code=status.HTTP_202_ACCEPTED
+)
+async def delete_therapist_async(
+    response: Response,
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Locks the account and erases its data in the background (GDPR Art. 17)."""
+    job, created = await AsyncErasureService.start_erasure(therapist.id, db)
+    return _erasure_started(therapist, job, created, response)
+
+
+@async_router.get("/progress", response_model=ProgressResponse)
+async def get_progress_async(
+    weeks: int = Query(26, ge=1, le=260, description="Weeks back, this week included"),
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await AsyncProgressService.get_progress(therapist.id, db, weeks=weeks)
+
+
+@async_router.get("/data-export")
+async def data_export_async(
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+    format: DataExportFormat = _FORMAT_QUERY,
+):
+    """Everything held about the therapist (GDPR Art. 15), streamed."""
+    return _stream_export(therapist, format, export_chunks_async(therapist.id, format))
+
+
+@async_router.post(
+    "/data-export/jobs",
+    response_model=DataExportResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_data_export_job_async(
+    background_tasks: BackgroundTasks,
+    response: Response,
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+    db: AsyncSession = Depends(get_async_db),
+    format: DataExportFormat = _FORMAT_QUERY,
+):
+    """Builds the export in the background, for accounts too large to
+    download in one request; poll the job for its download_url."""
+    job, created = await AsyncDataExportService.create_job(therapist.id, format, db)
+    return _start_export_job(therapist, job, created, background_tasks, response)
+
+
+@async_router.get("/data-export/jobs/{export_id}", response_model=DataExportResponse)
+async def get_data_export_job_async(
+    export_id: uuid.UUID,
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await AsyncDataExportService.get_job(therapist.id, export_id, db)
+
+
+@async_router.get("/data-export/jobs/{export_id}/download")
+async def download_data_export_async(
+    export_id: uuid.UUID,
+    therapist: TherapistResponse = Depends(get_current_therapist_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return _download(await AsyncDataExportService.get_download(therapist.id, export_id, db))
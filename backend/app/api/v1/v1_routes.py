@@ -1,10 +1,49 @@
 from fastapi import APIRouter
-from app.api.v1.therapist_routes import router as therapist_routes
-from app.api.v1.auth_routes import router as auth_routes
-from app.api.v1.patient_routes import router as patient_routes
+from app.api.v1 import (
+    audit_routes,
+    auth_routes,
+    erasure_routes,
+    event_routes,
+    health_routes,
+    patient_routes,
+    session_routes,
+    therapist_routes,
+)
+from app.core.database import DATABASE_ASYNC
 
 router = APIRouter(prefix="/v1")
 
-router.include_router(auth_routes)
-router.include_router(therapist_routes)
-router.include_router(patient_routes)
+ROUTE_MODULES = [
+    auth_routes,
+    therapist_routes,
+    patient_routes,
+    session_routes,
+    event_routes,
+    audit_routes,
+    erasure_routes,
+    health_routes,
+]
+
+
+def _without_shadowed(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    shadowed = {
+        (route.path, method)
+        for route in async_router.routes
+        for method in getattr(route, "methods", ())
+    }
+    fallback = APIRouter()
+    for route in sync_router.routes:
+        methods = getattr(route, "methods", ())
+        if not any((route.path, method) in shadowed for method in methods):
+            fallback.routes.append(route)
+    return fallback
+
+
+for module in ROUTE_MODULES:
+    async_router = getattr(module, "async_router", None)
+    if DATABASE_ASYNC and async_router is not None:
+        # Endpoints without an async counterpart keep running on the threadpool.
+        router.include_router(async_router)
+        router.include_router(_without_shadowed(module.router, async_router))
+    else:
+        router.include_router(module.router)
@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+import zlib
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+logger = logging.getLogger(__name__)
+
+# zstd | zlib | off. zstd comes from compression.zstd (Python 3.14+) or the
+# zstandard package (in requirements.txt). With off, packed keys stay in
+# their JSONB column.
+SESSION_PAYLOAD_CODEC = os.getenv("SESSION_PAYLOAD_CODEC", "zstd")
+SESSION_PAYLOAD_LEVEL = int(os.getenv("SESSION_PAYLOAD_LEVEL", 3))
+# Packed keys smaller than this, serialized, stay inline: below it the
+# extra column costs more than the compression saves.
+SESSION_PAYLOAD_MIN_BYTES = int(os.getenv("SESSION_PAYLOAD_MIN_BYTES", 2048))
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _zstd() -> Optional[Tuple[Callable, Callable]]:
+    try:
+        from compression import zstd
+
+        return (
+            lambda data, level: zstd.compress(data, level=level),
+            zstd.decompress,
+        )
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return (
+        lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+        # Frames from ZstdCompressor.compress carry their content size.
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+
+
+_zstd_codec = _zstd()
+
+
+def compress(data: bytes) -> bytes:
+    if SESSION_PAYLOAD_CODEC == "zstd":
+        if _zstd_codec is None:
+            raise RuntimeError(
+                "SESSION_PAYLOAD_CODEC=zstd requires Python 3.14+ or the 'zstandard' package"
+            )
+        return _zstd_codec[0](data, SESSION_PAYLOAD_LEVEL)
+    return zlib.compress(data, min(SESSION_PAYLOAD_LEVEL, 9))
+
+
+def decompress(data: bytes) -> bytes:
+    # Told apart by the frame magic, so rows written under another codec
+    # setting stay readable.
+    if data[:4] != _ZSTD_MAGIC:
+        return zlib.decompress(data)
+    if _zstd_codec is None:
+        raise RuntimeError(
+            "Reading zstd payloads requires Python 3.14+ or the 'zstandard' package"
+        )
+    return _zstd_codec[1](data)
+
+
+def check_payload_codec() -> None:
+    """Called at startup: a host that cannot run the configured codec must
+    not quietly write another one, and one without zstd cannot read rows
+    its peers wrote with it."""
+    if SESSION_PAYLOAD_CODEC not in ("zstd", "zlib", "off"):
+        raise ValueError(f"Unknown SESSION_PAYLOAD_CODEC: {SESSION_PAYLOAD_CODEC}")
+    if _zstd_codec is not None:
+        return
+    if SESSION_PAYLOAD_CODEC == "zstd":
+        raise RuntimeError(
+            "SESSION_PAYLOAD_CODEC=zstd requires Python 3.14+ or the 'zstandard' package"
+        )
+    logger.warning(
+        "zstd is not available; session payloads packed with zstd by other "
+        "hosts cannot be read here"
+    )
+
+
+def payload_codec_enabled() -> bool:
+    return SESSION_PAYLOAD_CODEC != "off"
+
+
+def worth_packing(value: dict) -> bool:
+    return (
+        payload_codec_enabled()
+        and len(json.dumps(value, separators=(",", ":"))) >= SESSION_PAYLOAD_MIN_BYTES
+    )
+
+
+class CompressedJSON(TypeDecorator):
+    """A JSON document stored compressed in a bytea column."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress(json.dumps(value, separators=(",", ":")).encode())
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return json.loads(decompress(bytes(value)))
@@ -0,0 +1,205 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import Select, func
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+COUNT_CACHE_TTL_SECONDS = int(os.getenv("COUNT_CACHE_TTL_SECONDS", 60))
+COUNT_CACHE_MAX_SIZE = int(os.getenv("COUNT_CACHE_MAX_SIZE", 10000))
+# Below this many estimated rows an exact count is cheap enough to just run.
+COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", 1000))
+
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
+
+DEFAULT_COUNT_STRATEGY = CountStrategy(os.getenv("COUNT_STRATEGY", "exact"))
+
+
+@dataclass(frozen=True)
+class CountKey:
+    scope: str
+    owner_id: uuid.UUID
+    filter_key: str = ""
+
+
+@dataclass
+class CountResult:
+    total: int
+    estimated: bool = False
+
+
+def filter_key(filters: Optional[dict]) -> str:
+    if not filters:
+        return ""
+    return json.dumps(filters, sort_keys=True, default=str)
+
+
+class CountCache:
+    """TTL/LRU cache of list totals, keyed per owner and filter set.
+
+    Inserts and deletes adjust the unfiltered total in place; every write
+    drops the filtered totals for that owner, since we cannot tell which
+    filters a row matches.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CountKey, tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CountKey) -> Optional[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: CountKey, total: int) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def adjust(self, scope: str, owner_id: uuid.UUID, delta: int) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                if key.scope != scope or key.owner_id != owner_id:
+                    continue
+                if key.filter_key:
+                    del self._entries[key]
+                else:
+                    expires_at, total = self._entries[key]
+                    self._entries[key] = (expires_at, max(total + delta, 0))
+
+    def invalidate(
+        self, scope: str, owner_id: uuid.UUID, filtered_only: bool = False
+    ) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                if key.scope != scope or key.owner_id != owner_id:
+                    continue
+                if key.filter_key or not filtered_only:
+                    del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+count_cache = CountCache(
+    max_size=COUNT_CACHE_MAX_SIZE, ttl_seconds=COUNT_CACHE_TTL_SECONDS
+)
+
+
+def _count_statement(stmt: Select) -> Select:
+    return stmt.with_only_columns(func.count(), maintain_column_froms=True).order_by(
+        None
+    )
+
+
+def _explain_statement(stmt: Select, dialect) -> Optional[str]:
+    if dialect.name != "postgresql":
+        return None
+    try:
+        compiled = str(
+            stmt.order_by(None).compile(
+                dialect=dialect, compile_kwargs={"literal_binds": True}
+            )
+        )
+    except CompileError:
+        return None
+    if dialect.paramstyle in ("format", "pyformat"):
+        # The statement runs with no_parameters, so the driver will not
+        # collapse the %% escapes the compiler added.
+        compiled = compiled.replace("%%", "%")
+    return f"EXPLAIN (FORMAT JSON) {compiled}"
+
+
+_RAW = {"no_parameters": True}
+
+
+def _plan_rows(plan) -> int:
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(
+    db: Session,
+    stmt: Select,
+    strategy: CountStrategy = DEFAULT_COUNT_STRATEGY,
+    key: Optional[CountKey] = None,
+) -> CountResult:
+    if strategy == CountStrategy.ESTIMATE:
+        explain = _explain_statement(stmt, db.get_bind().dialect)
+        if explain is not None:
+            result = db.connection().exec_driver_sql(explain, execution_options=_RAW)
+            estimate = _plan_rows(result.scalar_one())
+            if estimate >= COUNT_ESTIMATE_THRESHOLD:
+                return CountResult(total=estimate, estimated=True)
+
+    if strategy == CountStrategy.CACHED and key is not None:
+        cached = count_cache.get(key)
+        if cached is not None:
+            return CountResult(total=cached)
+
+    total = db.scalar(_count_statement(stmt)) or 0
+    if strategy == CountStrategy.CACHED and key is not None:
+        count_cache.set(key, total)
+    return CountResult(total=total)
+
+
+async def count_rows_async(
+    db: AsyncSession,
+    stmt: Select,
+    strategy: CountStrategy = DEFAULT_COUNT_STRATEGY,
+    key: Optional[CountKey] = None,
+) -> CountResult:
+    if strategy == CountStrategy.ESTIMATE:
+        explain = _explain_statement(stmt, db.get_bind().dialect)
+        if explain is not None:
+            connection = await db.connection()
+            result = await connection.exec_driver_sql(explain, execution_options=_RAW)
+            estimate = _plan_rows(result.scalar_one())
+            if estimate >= COUNT_ESTIMATE_THRESHOLD:
+                return CountResult(total=estimate, estimated=True)
+
+    if strategy == CountStrategy.CACHED and key is not None:
+        cached = count_cache.get(key)
+        if cached is not None:
+            return CountResult(total=cached)
+
+    total = await db.scalar(_count_statement(stmt)) or 0
+    if strategy == CountStrategy.CACHED and key is not None:
+        count_cache.set(key, total)
+    return CountResult(total=total)
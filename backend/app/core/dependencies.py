@@ -1,15 +1,18 @@
+from typing import Optional
 from fastapi import Depends, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
 from jose import JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.auth import decode_token
 from app.models.therapist import Therapist
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, SessionLocal, get_async_db, get_db
+from app.core.identity_cache import identity_cache
 from app.schemas.therapist import TherapistResponse
 
 
-def get_current_therapist(
-    authorization: str = Header(...), db: Session = Depends(get_db)
-) -> TherapistResponse:
+def _extract_token(authorization: str) -> str:
     if not authorization:
         raise HTTPException(status_code=401, detail="Authorization header missing")
 
@@ -25,7 +28,10 @@ def get_current_therapist(
         raise HTTPException(
             status_code=401, detail="Token missing in authorization header"
         )
+    return token
 
+
+def _decode_payload(token: str) -> dict:
     try:
         payload = decode_token(token)
         if not payload:
@@ -35,9 +41,73 @@ def get_current_therapist(
             raise HTTPException(status_code=401, detail="Invalid token payload")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return payload
+
 
-    therapist = db.query(Therapist).filter_by(id=therapist_id).first()
+def _cache_identity(token: str, payload: dict, therapist: Therapist | None):
     if not therapist:
         raise HTTPException(status_code=404, detail="Therapist not found")
+    if not therapist.is_active:
+        raise HTTPException(status_code=403, detail="Account is inactive")
+
+    therapist_response = TherapistResponse.model_validate(therapist)
+    identity_cache.set(token, therapist_response, token_exp=payload.get("exp"))
+    return therapist_response
+
+
+def get_current_therapist(
+    authorization: str = Header(...), db: Session = Depends(get_db)
+) -> TherapistResponse:
+    token = _extract_token(authorization)
+
+    cached = identity_cache.get(token)
+    if cached is not None:
+        return cached
+
+    payload = _decode_payload(token)
+    therapist = db.query(Therapist).filter_by(id=payload["sub"]).first()
+    return _cache_identity(token, payload, therapist)
+
+
+async def get_current_therapist_async(
+    authorization: str = Header(...), db: AsyncSession = Depends(get_async_db)
+) -> TherapistResponse:
+    token = _extract_token(authorization)
+
+    cached = identity_cache.get(token)
+    if cached is not None:
+        return cached
+
+    payload = _decode_payload(token)
+    therapist = await db.scalar(select(Therapist).filter_by(id=payload["sub"]))
+    return _cache_identity(token, payload, therapist)
+
+
+def _load_therapist(therapist_id: str) -> Therapist | None:
+    with SessionLocal() as db:
+        return db.query(Therapist).filter_by(id=therapist_id).first()
+
+
+async def authenticate_stream(
+    token: Optional[str], authorization: Optional[str]
+) -> tuple[TherapistResponse, dict]:
+    """Identity for long-lived connections (WebSocket, SSE).
+
+    Browsers cannot set headers on those, so the token may also come as a
+    query parameter. The DB session is closed before returning, so an idle
+    stream never holds a pooled connection. Returns the token payload too,
+    for its ``exp``.
+    """
+    token = token or _extract_token(authorization)
+    payload = _decode_payload(token)
+
+    cached = identity_cache.get(token)
+    if cached is not None:
+        return cached, payload
 
-    return TherapistResponse.model_validate(therapist)
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            therapist = await db.scalar(select(Therapist).filter_by(id=payload["sub"]))
+    else:
+        therapist = await run_in_threadpool(_load_therapist, payload["sub"])
+    return _cache_identity(token, payload, therapist), payload
@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from app.schemas.therapist import TherapistResponse
+
+IDENTITY_CACHE_TTL_SECONDS = int(os.getenv("IDENTITY_CACHE_TTL_SECONDS", 60))
+IDENTITY_CACHE_MAX_SIZE = int(os.getenv("IDENTITY_CACHE_MAX_SIZE", 10000))
+
+
+class IdentityCache:
+    """Bounded TTL/LRU cache of verified tokens -> TherapistResponse.
+
+    Entries never outlive the token's own ``exp`` claim. The cache is
+    per-process, so invalidation only reaches the current worker; the TTL
+    bounds how long another worker can serve a stale identity.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, TherapistResponse]]" = (
+            OrderedDict()
+        )
+        self._tokens_by_therapist: dict[uuid.UUID, set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, token: str) -> Optional[TherapistResponse]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, therapist = entry
+            if expires_at <= now:
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return therapist
+
+    def set(
+        self,
+        token: str,
+        therapist: TherapistResponse,
+        token_exp: Optional[float] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        expires_at = now + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, now + (token_exp - time.time()))
+        if expires_at <= now:
+            return
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (expires_at, therapist)
+            self._tokens_by_therapist.setdefault(therapist.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_therapist(self, therapist_id: uuid.UUID) -> None:
+        with self._lock:
+            for token in self._tokens_by_therapist.pop(therapist_id, set()):
+                self._entries.pop(token, None)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_therapist.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        therapist_id = entry[1].id
+        tokens = self._tokens_by_therapist.get(therapist_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_therapist[therapist_id]
+
+
+identity_cache = IdentityCache(
+    max_size=IDENTITY_CACHE_MAX_SIZE, ttl_seconds=IDENTITY_CACHE_TTL_SECONDS
+)
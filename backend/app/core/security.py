@@ -1,4 +1,14 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+
 import bcrypt
+from fastapi import HTTPException, status
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
 
 
 def _truncate_password(password: str) -> bytes:
@@ -9,14 +19,126 @@ def _truncate_password(password: str) -> bytes:
     return password_bytes[:72]
 
 
+def _hash(password_bytes: bytes, rounds: int) -> str:
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password_bytes, salt).decode("utf-8")
+
+
+def _verify(password_bytes: bytes, hashed_bytes: bytes) -> bool:
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded process pool.
+
+    At most ``max_pending`` hashes may be queued or running at once; further
+    calls are rejected immediately with a 503 instead of piling up behind a
+    login burst. With ``workers=0`` hashing runs inline in the caller.
+    """
+
+    def __init__(self, workers: int, max_pending: int, rounds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Executor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def hash(self, password: str) -> str:
+        password_bytes = _truncate_password(password)
+        if self.workers <= 0:
+            return _hash(password_bytes, self.rounds)
+        return self._submit(_hash, password_bytes, self.rounds).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        password_bytes = _truncate_password(plain_password)
+        hashed_bytes = hashed_password.encode("utf-8")
+        if self.workers <= 0:
+            return _verify(password_bytes, hashed_bytes)
+        return self._submit(_verify, password_bytes, hashed_bytes).result()
+
+    async def hash_async(self, password: str) -> str:
+        password_bytes = _truncate_password(password)
+        if self.workers <= 0:
+            return await asyncio.to_thread(_hash, password_bytes, self.rounds)
+        return await asyncio.wrap_future(
+            self._submit(_hash, password_bytes, self.rounds)
+        )
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        password_bytes = _truncate_password(plain_password)
+        hashed_bytes = hashed_password.encode("utf-8")
+        if self.workers <= 0:
+            return await asyncio.to_thread(_verify, password_bytes, hashed_bytes)
+        return await asyncio.wrap_future(
+            self._submit(_verify, password_bytes, hashed_bytes)
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # bcrypt hashes look like $2b$<cost>$<salt+hash>
+        parts = hashed_password.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return True
+        return int(parts[2]) != self.rounds
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(
+    workers=PASSWORD_HASH_WORKERS,
+    max_pending=PASSWORD_HASH_MAX_PENDING,
+    rounds=BCRYPT_ROUNDS,
+)
+
+
 def get_password_hash(password: str) -> str:
-    password_bytes = _truncate_password(password)
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode("utf-8")
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    password_bytes = _truncate_password(plain_password)
-    hashed_bytes = hashed_password.encode("utf-8")
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    return password_hasher.verify(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.hash_async(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify_async(plain_password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return password_hasher.needs_rehash(hashed_password)
@@ -1,9 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.core.compression import check_payload_codec
 from app.api.api_routes import router as api_routes
+from app.core.security import password_hasher
+from app.services.audit_service import AuditContextMiddleware, audit_log
+from app.services.notification_service import status_broker
+from app.services.queue_service import QueueService
+from app.services.summary_cache import close_summary_cache
+from app.worker.runtime import start_embedded_worker, stop_embedded_worker
+
+from app.models import Therapist, Patient, Session, AuditLog, ProcessingError, DataExport, ErasureJob
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_payload_codec()
+    await audit_log.start()
+    await status_broker.start()
+    start_embedded_worker()
+    yield
+    await stop_embedded_worker()
+    await status_broker.stop()
+    await QueueService.close()
+    await close_summary_cache()
+    await audit_log.stop()
+    password_hasher.shutdown()
 
-from app.models import Therapist, Patient, Session, AuditLog, ProcessingError
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(AuditContextMiddleware)
 
 app.include_router(api_routes)
@@ -3,6 +3,9 @@ from app.models.patient import Patient
 from app.models.session import Session
 from app.models.auditLog import AuditLog
 from app.models.processingError import ProcessingError
+from app.models.dataExport import DataExport
+from app.models.erasureJob import ErasureJob
+from app.models.sessionRollup import SessionRollup
 
 __all__ = [
     "Therapist",
@@ -10,4 +13,7 @@ __all__ = [
     "Session",
     "AuditLog",
     "ProcessingError",
+    "DataExport",
+    "ErasureJob",
+    "SessionRollup",
 ]
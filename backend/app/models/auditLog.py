@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from typing import Optional
 from app.core.database import Base
 from sqlalchemy import DateTime, Index, String, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
@@ -8,12 +9,16 @@ import uuid
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # Monthly range partitions (audit_logs_yYYYYmMM), created ahead of time
+    # and archived on expiry by app.worker.audit_retention.
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("therapists.id"), nullable=False
+    # NULL once the actor's account has been erased; the entry itself stays.
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("therapists.id", ondelete="SET NULL"), nullable=True
     )
     user_email: Mapped[str] = mapped_column(String, nullable=False)
     action: Mapped[str] = mapped_column(String, nullable=False)
@@ -26,12 +31,24 @@ class AuditLog(Base):
     user_agent: Mapped[str] = mapped_column(String, nullable=False)
     request_id: Mapped[str] = mapped_column(String, nullable=False)
 
+    # Part of the primary key because it is the partition key.
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
+        primary_key=True,
     )
 
 
-Index("idx_audit_user", AuditLog.user_id)
-Index("idx_audit_action", AuditLog.action)
+# Each filter of the audit query API leads an index that ends in the keyset
+# order (created_at, id), so a page is a bounded range scan.
+Index("idx_audit_user_created", AuditLog.user_id, AuditLog.created_at, AuditLog.id)
+Index(
+    "idx_audit_resource_created",
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    AuditLog.created_at,
+    AuditLog.id,
+)
+Index("idx_audit_action_created", AuditLog.action, AuditLog.created_at, AuditLog.id)
+Index("idx_audit_created", AuditLog.created_at, AuditLog.id)
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from typing import Optional
+from app.core.database import Base
+from sqlalchemy import BigInteger, DateTime, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+import uuid
+
+
+class DataExport(Base):
+    """A background data export (GDPR Art. 15) written to storage."""
+
+    __tablename__ = "data_exports"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    therapist_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("therapists.id"), nullable=False
+    )
+    format: Mapped[str] = mapped_column(String, nullable=False)
+    # pending -> running -> completed | failed; completed -> expired once the
+    # worker has purged the object
+    status: Mapped[str] = mapped_column(String, nullable=False, default="pending")
+
+    # Result
+    storage_key: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    size_bytes: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+Index("idx_data_exports_therapist_created", DataExport.therapist_id, DataExport.created_at)
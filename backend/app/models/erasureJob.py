@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from typing import Optional
+from app.core.database import Base
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+import uuid
+
+
+class ErasureJob(Base):
+    """A therapist account erasure (GDPR Art. 17), run in batches by
+    app.worker.erasure."""
+
+    __tablename__ = "erasure_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    # No foreign key: the job outlives the therapist row it erases.
+    therapist_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    # pending -> running -> completed
+    status: Mapped[str] = mapped_column(String, nullable=False, default="pending")
+    step: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Rows erased so far, per step.
+    progress: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # A running job whose lease ran out is picked up again by any worker.
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+Index("idx_erasure_jobs_therapist", ErasureJob.therapist_id)
+Index(
+    "idx_erasure_jobs_active",
+    ErasureJob.created_at,
+    postgresql_where=ErasureJob.status != "completed",
+)
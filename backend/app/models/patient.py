@@ -1,6 +1,14 @@
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional, List
-from sqlalchemy import String, ForeignKey, UniqueConstraint, DateTime, Boolean
+from sqlalchemy import (
+    String,
+    ForeignKey,
+    UniqueConstraint,
+    DateTime,
+    Boolean,
+    Index,
+    text,
+)
 from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -72,3 +80,23 @@ class Patient(Base):
 
     def __repr__(self) -> str:
         return f"<Patient id={self.id} identifier={self.identifier} therapist_id={self.therapist_id}>"
+
+
+Index(
+    "idx_patients_therapist_created",
+    Patient.therapist_id,
+    Patient.is_deleted,
+    Patient.created_at.desc(),
+    Patient.id.desc(),
+)
+Index(
+    "idx_patients_identifier_trgm",
+    Patient.identifier,
+    postgresql_using="gin",
+    postgresql_ops={"identifier": "gin_trgm_ops"},
+)
+Index(
+    "idx_patients_therapist_identifier_prefix",
+    Patient.therapist_id,
+    text("lower(identifier) text_pattern_ops"),
+)
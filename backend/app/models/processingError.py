@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from app.core.database import Base
-from sqlalchemy import Boolean, DateTime, String, ForeignKey, Integer
+from sqlalchemy import Boolean, DateTime, String, ForeignKey, Index, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 import uuid
@@ -39,3 +39,17 @@ class ProcessingError(Base):
         DateTime(timezone=True), nullable=True
     )
     is_resolved: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+
+# Retry polling only ever looks at unresolved rows; the partial index stays
+# small no matter how much error history accumulates.
+Index(
+    "idx_processing_errors_due",
+    ProcessingError.next_retry_at,
+    postgresql_where=ProcessingError.is_resolved == False,
+)
+Index(
+    "idx_processing_errors_session_unresolved",
+    ProcessingError.session_id,
+    postgresql_where=ProcessingError.is_resolved == False,
+)
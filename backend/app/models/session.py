@@ -1,24 +1,38 @@
 from typing import TYPE_CHECKING, Optional
 from sqlalchemy import (
+    Computed,
     DateTime,
     Integer,
     String,
     Boolean,
     Index,
     ForeignKey,
+    event,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 
 import uuid
 from datetime import datetime, timezone
 
+from app.core.compression import CompressedJSON, worth_packing
 from app.core.database import Base
 
 if TYPE_CHECKING:
     from app.models.patient import Patient
     from app.models.therapist import Therapist
 
+# Bulky keys kept compressed in <column>_packed instead of the JSONB column,
+# once they reach SESSION_PAYLOAD_MIN_BYTES. Only keys nothing reads in SQL
+# belong here: the list projection, the search vector and the rollups all
+# read the JSONB columns directly, which rules out every summary key. The
+# upload state carries one ETag per S3 part and is rewritten on each chunk.
+PACKED_KEYS = {
+    "audio_metadata": frozenset({"upload"}),
+    "summary": frozenset(),
+}
+
 
 class Session(Base):
     __tablename__ = "sessions"
@@ -53,7 +67,29 @@ class Session(Base):
 
     # Metadata
     audio_metadata: Mapped[dict] = mapped_column(JSONB, nullable=False)
-    summary: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # The largest column by far and only read by the detail endpoint, so
+    # loading a Session does not fetch it unless asked (undefer).
+    summary: Mapped[dict] = mapped_column(JSONB, nullable=False, deferred=True)
+    # PACKED_KEYS of the column above; merged back into it on load. Writers
+    # rewrite audio_metadata whole from the loaded value, so a load that may
+    # be written back has to undefer audio_metadata_packed.
+    audio_metadata_packed: Mapped[Optional[dict]] = mapped_column(
+        CompressedJSON, nullable=True, deferred=True
+    )
+    summary_packed: Mapped[Optional[dict]] = mapped_column(
+        CompressedJSON, nullable=True, deferred=True
+    )
+    # Every string in the summary, stemmed in the transcript's language. The
+    # two SQL functions are created by migration 9d3f6b1e4a70.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector(session_search_config(audio_metadata), "
+            "session_summary_text(summary))",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     # Audit
     created_at: Mapped[datetime] = mapped_column(
@@ -87,7 +123,64 @@ class Session(Base):
         return f"<Session id={self.id} therapist={self.therapist_id} patient={self.patient_id}>"
 
 
-Index("idx_sessions_therapist", Session.therapist_id)
+def pack_payload(values: dict) -> dict:
+    """Splits the audio_metadata/summary entries of an insert or update into
+    the JSONB part and the packed part. Both are always written, so a key
+    never lives in both places."""
+    packed_values = dict(values)
+    for column, keys in PACKED_KEYS.items():
+        if column not in values:
+            continue
+        value = values[column] or {}
+        packed = {key: item for key, item in value.items() if key in keys}
+        if not worth_packing(packed):
+            packed = {}
+        packed_values[column] = {
+            key: item for key, item in value.items() if key not in packed
+        }
+        packed_values[f"{column}_packed"] = packed or None
+    return packed_values
+
+
+def unpack_payload(values: dict) -> dict:
+    """The inverse of pack_payload for a row read column by column."""
+    unpacked = dict(values)
+    for column in PACKED_KEYS:
+        packed = unpacked.pop(f"{column}_packed", None)
+        if packed and column in unpacked:
+            unpacked[column] = {**(unpacked[column] or {}), **packed}
+    return unpacked
+
+
+def _unpack(session: Session) -> None:
+    # Only what the query loaded; touching a deferred column here would lazy
+    # load it, which fails in async mode.
+    loaded = session.__dict__
+    for column in PACKED_KEYS:
+        packed = loaded.get(f"{column}_packed")
+        if packed and column in loaded:
+            set_committed_value(session, column, {**loaded[column], **packed})
+
+
+@event.listens_for(Session, "load")
+def _unpack_on_load(session: Session, context) -> None:
+    _unpack(session)
+
+
+@event.listens_for(Session, "refresh")
+def _unpack_on_refresh(session: Session, context, attrs) -> None:
+    _unpack(session)
+
+
+# Serves the session list: filter on therapist, seek on (session_date, id).
+Index(
+    "idx_sessions_therapist_date",
+    Session.therapist_id,
+    Session.is_deleted,
+    Session.session_date.desc(),
+    Session.id.desc(),
+)
+Index("idx_sessions_search", Session.search_vector, postgresql_using="gin")
 Index("idx_sessions_patient", Session.patient_id)
 Index("idx_sessions_date", Session.session_date)
 Index(
@@ -0,0 +1,42 @@
+from datetime import date, datetime, timezone
+from app.core.database import Base
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+import uuid
+
+
+class SessionRollup(Base):
+    """Completed sessions of one patient in one week (Monday, UTC).
+
+    Maintained by app.services.progress_service as sessions complete or are
+    reprocessed; therapist totals are sums over these rows.
+    """
+
+    __tablename__ = "session_rollups"
+
+    therapist_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("therapists.id"), primary_key=True
+    )
+    patient_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("patients.id"), primary_key=True
+    )
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    session_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Histogram of summary.risk_assessment.level
+    risk_low: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    risk_medium: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    risk_high: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    risk_unknown: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+
+# A patient's weeks are served by the primary key.
+Index("idx_session_rollups_therapist_week", SessionRollup.therapist_id, SessionRollup.week_start)
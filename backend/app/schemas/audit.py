@@ -0,0 +1,41 @@
+import datetime
+from typing import List, Optional
+import uuid
+from pydantic import BaseModel, Field
+
+
+class AuditLogResponse(BaseModel):
+    id: uuid.UUID
+    user_id: Optional[uuid.UUID] = None
+    user_email: str
+    action: str
+    resource_type: str
+    resource_id: uuid.UUID
+    # The column is spelled "datails".
+    details: dict = Field(validation_alias="datails")
+    ip_address: str
+    user_agent: str
+    request_id: str
+    created_at: datetime.datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AuditLogFilter(BaseModel):
+    user_id: Optional[uuid.UUID] = Field(None, description="Actor who performed the action")
+    resource_type: Optional[str] = Field(None, description="e.g. patient, session")
+    resource_id: Optional[uuid.UUID] = Field(None, description="Requires resource_type")
+    action: Optional[str] = Field(None, description="e.g. patient.update")
+    created_after: Optional[datetime.datetime] = Field(
+        None, description="Only entries at or after this time"
+    )
+    created_before: Optional[datetime.datetime] = Field(
+        None, description="Only entries before this time"
+    )
+
+
+class PaginatedAuditLogResponse(BaseModel):
+    page_size: int
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page")
+    audit_logs: List[AuditLogResponse]
@@ -0,0 +1,24 @@
+import datetime
+from typing import Literal, Optional
+import uuid
+from pydantic import BaseModel, Field
+
+DataExportFormat = Literal["ndjson", "zip"]
+
+
+class DataExportResponse(BaseModel):
+    id: uuid.UUID
+    format: str
+    status: str
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime.datetime
+    started_at: Optional[datetime.datetime] = None
+    completed_at: Optional[datetime.datetime] = None
+    expires_at: Optional[datetime.datetime] = None
+    download_url: Optional[str] = Field(
+        None, description="Present once the export has completed"
+    )
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,21 @@
+import datetime
+from typing import Optional
+import uuid
+from pydantic import BaseModel, Field
+
+
+class ErasureJobResponse(BaseModel):
+    id: uuid.UUID
+    status: str
+    step: Optional[str] = None
+    progress: dict = Field(default_factory=dict, description="Rows erased so far, per step")
+    error: Optional[str] = None
+    created_at: datetime.datetime
+    started_at: Optional[datetime.datetime] = None
+    completed_at: Optional[datetime.datetime] = None
+    status_url: Optional[str] = Field(
+        None, description="Pollable without a token, which stops working once erased"
+    )
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,5 @@
 import datetime
-from typing import Optional, List
+from typing import Literal, Optional, List
 import uuid
 from pydantic import BaseModel, Field
 
@@ -27,6 +27,11 @@ class PatientFilter(BaseModel):
     identifier: Optional[str] = Field(
         None, description="Search by patient identifier (partial match)"
     )
+    identifier_match: Literal["contains", "prefix", "closest"] = Field(
+        "contains",
+        description="contains: substring match; prefix: starts-with; "
+        "closest: fuzzy trigram match ranked by similarity",
+    )
     consent_given: Optional[bool] = Field(None, description="Filter by consent status")
     created_after: Optional[datetime.datetime] = Field(
         None, description="Filter patients created after this date"
@@ -37,10 +42,14 @@ class PatientFilter(BaseModel):
 
 
 class PaginatedPatientResponse(BaseModel):
-    total: int
-    page: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page (cursor pagination only)"
+    )
     patients: List[PatientResponse]
 
 
@@ -49,3 +58,37 @@ class PatientUpdate(BaseModel):
     date_of_birth: Optional[datetime.datetime] = Field(
         None, description="Update patient date of birth"
     )
+
+
+class PatientImportError(BaseModel):
+    line: int
+    identifier: Optional[str] = None
+    error: str
+
+
+class PatientImportReport(BaseModel):
+    total_rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: List[PatientImportError] = []
+    errors_truncated: bool = False
+
+
+class PatientBatchUpdate(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1, max_length=500)
+    patch: PatientUpdate
+
+
+class PatientBatchDelete(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1, max_length=500)
+
+
+class PatientBatchOutcome(BaseModel):
+    id: uuid.UUID
+    status: Literal["updated", "deleted", "not_found"]
+
+
+class PatientBatchResult(BaseModel):
+    affected: int
+    results: List[PatientBatchOutcome]
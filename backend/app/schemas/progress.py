@@ -0,0 +1,26 @@
+import datetime
+from typing import List, Optional
+import uuid
+from pydantic import BaseModel, Field
+
+
+class RiskHistogram(BaseModel):
+    low: int = 0
+    medium: int = 0
+    high: int = 0
+    unknown: int = 0
+
+
+class WeeklyProgress(BaseModel):
+    week_start: datetime.date = Field(..., description="Monday of the week (UTC)")
+    session_count: int
+    total_minutes: int
+    risk_levels: RiskHistogram
+
+
+class ProgressResponse(BaseModel):
+    patient_id: Optional[uuid.UUID] = Field(
+        None, description="Absent for the therapist-wide view"
+    )
+    since: datetime.date
+    weeks: List[WeeklyProgress]
@@ -0,0 +1,157 @@
+import datetime
+from typing import List, Literal, Optional
+import uuid
+from pydantic import BaseModel, Field, field_validator
+
+
+# Written only by the upload endpoints: the worker reads and deletes the
+# object at storage_key, and sha256 picks the summary cache entry.
+SERVER_AUDIO_KEYS = ("storage_key", "sha256", "upload")
+
+
+class SessionCreate(BaseModel):
+    patient_id: uuid.UUID
+    session_date: datetime.datetime
+    session_duration_minutes: int = Field(..., gt=0)
+    audio_metadata: Optional[dict] = Field(
+        None,
+        description="Client-side audio details; audio itself is attached "
+        "through the upload endpoints",
+    )
+
+    @field_validator("audio_metadata")
+    @classmethod
+    def reject_server_audio_keys(cls, v: Optional[dict]) -> Optional[dict]:
+        reserved = sorted(key for key in SERVER_AUDIO_KEYS if key in (v or {}))
+        if reserved:
+            raise ValueError(
+                f"{', '.join(reserved)} can only be set by uploading the audio"
+            )
+        return v
+
+
+class SessionResponse(BaseModel):
+    id: uuid.UUID
+    patient_id: uuid.UUID
+    session_date: datetime.datetime
+    session_duration_minutes: int
+    processing_status: str
+    job_id: str
+    version: int
+    created_at: datetime.datetime
+    processing_started_at: Optional[datetime.datetime] = None
+    processing_completed_at: Optional[datetime.datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+SessionStatus = Literal["pending", "queued", "processing", "completed", "failed"]
+
+
+class SessionFilter(BaseModel):
+    patient_id: Optional[uuid.UUID] = None
+    processing_status: Optional[SessionStatus] = None
+    session_after: Optional[datetime.datetime] = Field(
+        None, description="Sessions on or after this date"
+    )
+    session_before: Optional[datetime.datetime] = Field(
+        None, description="Sessions before this date"
+    )
+
+
+class SessionListItem(BaseModel):
+    id: uuid.UUID
+    patient_id: uuid.UUID
+    session_date: datetime.datetime
+    session_duration_minutes: int
+    processing_status: str
+    version: int
+    created_at: datetime.datetime
+    processing_completed_at: Optional[datetime.datetime] = None
+    audio_format: Optional[str] = None
+    audio_duration_seconds: Optional[float] = None
+    summary: Optional[dict] = Field(
+        None, description="Only the keys asked for with summary_keys"
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class PaginatedSessionResponse(BaseModel):
+    page_size: int
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page")
+    sessions: List[SessionListItem]
+
+
+class SessionDetailResponse(SessionResponse):
+    audio_metadata: Optional[dict] = None
+    summary: Optional[dict] = None
+
+
+class SessionSearchResult(BaseModel):
+    id: uuid.UUID
+    patient_id: uuid.UUID
+    session_date: datetime.datetime
+    rank: float
+    headline: str = Field(..., description="Matching summary excerpts, terms in <b>")
+
+    class Config:
+        from_attributes = True
+
+
+class SessionSearchResponse(BaseModel):
+    query: str
+    results: List[SessionSearchResult]
+
+
+class SessionStatusResponse(BaseModel):
+    id: uuid.UUID
+    processing_status: str
+    job_id: str
+    version: int
+    processing_started_at: Optional[datetime.datetime] = None
+    processing_completed_at: Optional[datetime.datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SessionEnqueueResponse(BaseModel):
+    session: SessionStatusResponse
+    enqueued: bool = Field(
+        ..., description="False when this job_id was already on the queue"
+    )
+    from_cache: bool = Field(
+        False, description="Completed from the summary cache; nothing was queued"
+    )
+
+
+class SessionUploadInit(BaseModel):
+    size_bytes: int = Field(..., gt=0, description="Total size of the audio file")
+    content_type: Optional[str] = Field(None, description="MIME type reported by the client")
+
+
+class SessionUploadStatus(BaseModel):
+    session_id: uuid.UUID
+    upload_id: str
+    offset: int = Field(..., description="Bytes stored so far; send the next chunk from here")
+    size_bytes: int
+    chunk_size: int = Field(
+        ..., description="Chunk size to send; every chunk but the last must match it"
+    )
+    complete: bool
+
+
+class SessionUploadComplete(BaseModel):
+    sha256: Optional[str] = Field(
+        None, description="Expected hex SHA-256 of the whole file, verified if given"
+    )
+
+
+class SessionUploadResult(BaseModel):
+    session: SessionStatusResponse
+    audio_metadata: dict
+    enqueued: bool
+    from_cache: bool = False
@@ -45,6 +45,7 @@ class TherapistLogin(BaseModel):
 
 class TherapistResponse(TherapistBase):
     id: uuid.UUID
+    role: str = "therapist"
 
     class Config:
         from_attributes = True
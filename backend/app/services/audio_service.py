@@ -0,0 +1,191 @@
+import struct
+from typing import Optional
+
+# Enough for the WAV fmt chunk, an ID3 tag plus the first MP3 frame, or the
+# leading boxes of a faststart MP4.
+AUDIO_PROBE_BYTES = 64 * 1024
+
+_MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG 1
+    2: [22050, 24000, 16000],  # MPEG 2
+    0: [11025, 12000, 8000],  # MPEG 2.5
+}
+
+
+def _probe_wav(head: bytes) -> Optional[dict]:
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return None
+    info = {"format": "wav"}
+    pos = 12
+    while pos + 8 <= len(head):
+        chunk_id, chunk_size = struct.unpack_from("<4sI", head, pos)
+        body = pos + 8
+        if chunk_id == b"fmt " and body + 16 <= len(head):
+            _, channels, sample_rate, byte_rate, block_align, bits = struct.unpack_from(
+                "<HHIIHH", head, body
+            )
+            info.update(
+                channels=channels,
+                sample_rate=sample_rate,
+                byte_rate=byte_rate,
+                block_align=block_align,
+                bits_per_sample=bits,
+            )
+        elif chunk_id == b"data":
+            info["data_offset"] = body
+            # Streaming recorders leave the size at 0 or 0xFFFFFFFF.
+            if chunk_size not in (0, 0xFFFFFFFF):
+                info["data_size"] = chunk_size
+            break
+        pos = body + chunk_size + (chunk_size & 1)
+    return info
+
+
+def _id3_size(head: bytes) -> int:
+    # Version 2.2-2.4 and a syncsafe size (high bit clear in every byte).
+    if (
+        len(head) < 10
+        or head[:3] != b"ID3"
+        or head[3] not in (2, 3, 4)
+        or any(byte & 0x80 for byte in head[6:10])
+    ):
+        return 0
+    size = 0
+    for byte in head[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    footer = 10 if head[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _mp3_frame(head: bytes, pos: int) -> Optional[dict]:
+    b1, b2, b3 = head[pos + 1], head[pos + 2], head[pos + 3]
+    version = (b1 >> 3) & 3
+    layer = (b1 >> 1) & 3
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    mono = (b3 >> 6) == 3
+    return {
+        "bitrate_kbps": _MP3_BITRATES[1 if mpeg1 else 2][bitrate_index],
+        "sample_rate": _MP3_SAMPLE_RATES[version][rate_index],
+        "channels": 1 if mono else 2,
+        "samples_per_frame": 1152 if mpeg1 else 576,
+        "side_info": (17 if mono else 32) if mpeg1 else (9 if mono else 17),
+    }
+
+
+def _probe_mp3(head: bytes) -> Optional[dict]:
+    start = _id3_size(head)
+    if start == 0 and not (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+        return None
+    if start + 4 > len(head):
+        # The tag (cover art, typically) runs past the probe window. An ID3v2
+        # header is mp3 enough; bitrate and duration stay unknown.
+        return {"format": "mp3", "audio_offset": start}
+    for pos in range(start, len(head) - 4):
+        if head[pos] != 0xFF or head[pos + 1] & 0xE0 != 0xE0:
+            continue
+        frame = _mp3_frame(head, pos)
+        if frame is None:
+            continue
+        info = {
+            "format": "mp3",
+            "audio_offset": pos,
+            "bitrate_kbps": frame["bitrate_kbps"],
+            "sample_rate": frame["sample_rate"],
+            "channels": frame["channels"],
+        }
+        # A Xing/Info header in the first frame carries the frame count (VBR).
+        xing = pos + 4 + frame["side_info"]
+        if head[xing : xing + 4] in (b"Xing", b"Info") and len(head) >= xing + 12:
+            flags = struct.unpack_from(">I", head, xing + 4)[0]
+            if flags & 1:
+                frames = struct.unpack_from(">I", head, xing + 8)[0]
+                info["duration_seconds"] = (
+                    frames * frame["samples_per_frame"] / frame["sample_rate"]
+                )
+        return info
+    return None
+
+
+def _mp4_boxes(data: bytes, start: int, end: int):
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, pos)
+        header = 8
+        if size == 1 and pos + 16 <= end:
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        yield box_type, pos + header, pos + size
+        pos += size
+
+
+def _probe_mp4(head: bytes) -> Optional[dict]:
+    if len(head) < 12 or head[4:8] != b"ftyp":
+        return None
+    info = {"format": "m4a", "brand": head[8:12].decode("latin-1").strip()}
+    for box_type, body, box_end in _mp4_boxes(head, 0, len(head)):
+        if box_type != b"moov":
+            continue
+        for child, child_body, _ in _mp4_boxes(head, body, min(box_end, len(head))):
+            if child != b"mvhd" or child_body + 32 > len(head):
+                continue
+            if head[child_body] == 1:
+                timescale, duration = struct.unpack_from(">IQ", head, child_body + 20)
+            else:
+                timescale, duration = struct.unpack_from(">II", head, child_body + 12)
+            if timescale:
+                info["duration_seconds"] = duration / timescale
+    return info
+
+
+_SIGNATURES = [
+    (b"OggS", "ogg"),
+    (b"fLaC", "flac"),
+    (b"\x1aE\xdf\xa3", "webm"),
+]
+
+
+def probe_audio(head: bytes) -> dict:
+    """Format details from the first bytes of an audio file.
+
+    Returns at least ``{"format": ...}`` ("unknown" if unrecognised); fields
+    that depend on the total size are filled in by ``finalize_audio_metadata``.
+    """
+    for probe in (_probe_wav, _probe_mp4, _probe_mp3):
+        info = probe(head)
+        if info is not None:
+            return info
+    for signature, fmt in _SIGNATURES:
+        if head.startswith(signature):
+            return {"format": fmt}
+    return {"format": "unknown"}
+
+
+def finalize_audio_metadata(probe: dict, size_bytes: int) -> dict:
+    info = {
+        key: value
+        for key, value in probe.items()
+        if key not in ("data_offset", "data_size", "audio_offset", "block_align")
+    }
+    if "duration_seconds" not in info:
+        if probe.get("format") == "wav" and probe.get("byte_rate"):
+            data_size = probe.get("data_size") or size_bytes - probe.get("data_offset", 44)
+            info["duration_seconds"] = max(data_size, 0) / probe["byte_rate"]
+        elif probe.get("format") == "mp3" and probe.get("bitrate_kbps"):
+            # Constant bitrate estimate; VBR files carry a Xing frame count.
+            audio_bytes = size_bytes - probe.get("audio_offset", 0)
+            info["duration_seconds"] = audio_bytes * 8 / (probe["bitrate_kbps"] * 1000)
+    if "duration_seconds" in info:
+        info["duration_seconds"] = round(info["duration_seconds"], 3)
+    return info
@@ -0,0 +1,126 @@
+import os
+from typing import AsyncIterator, Iterator, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import async_engine, engine
+from app.core.pagination import decode_datetime_id_cursor, encode_cursor
+from app.models.auditLog import AuditLog
+from app.schemas.audit import (
+    AuditLogFilter,
+    AuditLogResponse,
+    PaginatedAuditLogResponse,
+)
+from app.schemas.therapist import TherapistResponse
+
+# Rows fetched per round trip from the export's server-side cursor.
+AUDIT_EXPORT_BATCH_ROWS = int(os.getenv("AUDIT_EXPORT_BATCH_ROWS", 1000))
+
+_COLUMNS = tuple(AuditLog.__table__.c)
+
+
+def audit_criteria(actor: TherapistResponse, filters: AuditLogFilter) -> list:
+    """WHERE clauses for ``filters``; non-admins only see their own actions."""
+    if actor.role != "admin":
+        if filters.user_id is not None and filters.user_id != actor.id:
+            raise HTTPException(
+                status_code=403, detail="Not allowed to read other users' audit logs"
+            )
+        filters = filters.model_copy(update={"user_id": actor.id})
+    if filters.resource_id is not None and filters.resource_type is None:
+        raise HTTPException(status_code=400, detail="resource_id requires resource_type")
+
+    criteria = []
+    if filters.user_id is not None:
+        criteria.append(AuditLog.user_id == filters.user_id)
+    if filters.resource_type is not None:
+        criteria.append(AuditLog.resource_type == filters.resource_type)
+    if filters.resource_id is not None:
+        criteria.append(AuditLog.resource_id == filters.resource_id)
+    if filters.action is not None:
+        criteria.append(AuditLog.action == filters.action)
+    # Bounds on created_at also prune the monthly partitions.
+    if filters.created_after is not None:
+        criteria.append(AuditLog.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        criteria.append(AuditLog.created_at < filters.created_before)
+    return criteria
+
+
+def _page_statement(criteria: list, page_size: int, cursor: Optional[str]) -> Select:
+    stmt = select(*_COLUMNS).where(*criteria)
+    if cursor:
+        created_at, row_id = decode_datetime_id_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(AuditLog.created_at, AuditLog.id) < tuple_(created_at, row_id)
+        )
+    # One extra row tells us whether a next page exists.
+    return stmt.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(
+        page_size + 1
+    )
+
+
+def _export_statement(criteria: list) -> Select:
+    return (
+        select(*_COLUMNS)
+        .where(*criteria)
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .execution_options(yield_per=AUDIT_EXPORT_BATCH_ROWS)
+    )
+
+
+def _paginated_response(rows: list, page_size: int) -> PaginatedAuditLogResponse:
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return PaginatedAuditLogResponse(
+        page_size=page_size,
+        next_cursor=next_cursor,
+        audit_logs=[AuditLogResponse.model_validate(row) for row in rows],
+    )
+
+
+def _ndjson(rows: List) -> bytes:
+    return b"".join(
+        AuditLogResponse.model_validate(row).model_dump_json().encode() + b"\n"
+        for row in rows
+    )
+
+
+class AuditLogService:
+    @staticmethod
+    def get_audit_logs(
+        criteria: list, db: Session, page_size: int = 50, cursor: Optional[str] = None
+    ) -> PaginatedAuditLogResponse:
+        rows = db.execute(_page_statement(criteria, page_size, cursor)).all()
+        return _paginated_response(rows, page_size)
+
+    @staticmethod
+    def export_audit_logs(criteria: list) -> Iterator[bytes]:
+        """NDJSON, one batch of rows per chunk, read through a server-side
+        cursor. Holds its own connection for as long as the client reads."""
+        with engine.connect() as connection:
+            result = connection.execute(_export_statement(criteria))
+            for rows in result.partitions():
+                yield _ndjson(rows)
+
+
+class AsyncAuditLogService:
+    @staticmethod
+    async def get_audit_logs(
+        criteria: list,
+        db: AsyncSession,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+    ) -> PaginatedAuditLogResponse:
+        rows = (await db.execute(_page_statement(criteria, page_size, cursor))).all()
+        return _paginated_response(rows, page_size)
+
+    @staticmethod
+    async def export_audit_logs(criteria: list) -> AsyncIterator[bytes]:
+        async with async_engine.connect() as connection:
+            result = await connection.stream(_export_statement(criteria))
+            async for rows in result.partitions():
+                yield _ndjson(rows)
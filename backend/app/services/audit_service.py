@@ -0,0 +1,308 @@
+import asyncio
+import ipaddress
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.core.database import engine
+from app.models.auditLog import AuditLog
+from app.schemas.therapist import TherapistResponse
+
+logger = logging.getLogger(__name__)
+
+AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "true").lower() == "true"
+# Upper bound on rows held in memory; past it the oldest rows are dropped
+# (and counted) rather than stalling requests behind the database.
+AUDIT_BUFFER_SIZE = int(os.getenv("AUDIT_BUFFER_SIZE", 10000))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 500))
+AUDIT_FLUSH_SECONDS = float(os.getenv("AUDIT_FLUSH_SECONDS", 1))
+AUDIT_RETRY_SECONDS = float(os.getenv("AUDIT_RETRY_SECONDS", 5))
+# Comma-separated addresses or networks of the reverse proxies in front of
+# the API. X-Forwarded-For is only believed when the peer is one of them.
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(proxy.strip(), strict=False)
+    for proxy in os.getenv("TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+]
+
+
+class AuditContext:
+    __slots__ = ("request_id", "ip_address", "user_agent")
+
+    def __init__(self, request_id: str, ip_address: str, user_agent: str):
+        self.request_id = request_id
+        self.ip_address = ip_address
+        self.user_agent = user_agent
+
+
+_NO_REQUEST = AuditContext("", "", "")
+audit_context: ContextVar[AuditContext] = ContextVar("audit_context", default=_NO_REQUEST)
+
+
+def _header(headers: list, name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(scope, headers: list) -> str:
+    client = scope.get("client")
+    peer = client[0] if client else ""
+    forwarded = _header(headers, b"x-forwarded-for")
+    if not forwarded or not _trusted_proxy(peer):
+        return peer
+    # Walk back from the nearest hop: the first address that is not one of
+    # our proxies is the client. Anything left of it is client-supplied.
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+class AuditContextMiddleware:
+    """Captures request id, client IP and user agent for audit rows.
+
+    Pure ASGI, so the context variable it sets is visible to the endpoint,
+    including sync endpoints run on the threadpool. Echoes the request id
+    back as X-Request-ID.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        headers = scope.get("headers", [])
+        request_id = _header(headers, b"x-request-id") or str(uuid.uuid4())
+        token = audit_context.set(
+            AuditContext(
+                request_id,
+                client_ip(scope, headers),
+                _header(headers, b"user-agent") or "",
+            )
+        )
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [
+                    *message["headers"],
+                    (b"x-request-id", request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            audit_context.reset(token)
+
+
+class AuditWriter:
+    """Buffers audit rows in memory and writes them in batches.
+
+    ``record`` only appends to a deque, so it is cheap and safe from any
+    thread. A background task flushes when ``batch_size`` rows are waiting
+    or every ``flush_seconds``, using one multi-row INSERT per batch.
+    ``stop`` drains whatever is left, so a clean shutdown loses nothing.
+
+    A batch the database refuses for its data (a foreign key, a missing
+    partition) is bisected down to the offending rows, which are logged,
+    counted as rejected and dropped, so one bad row cannot stall the queue.
+    Any other failure is taken as the database being away and the batch
+    is kept for a retry.
+    """
+
+    def __init__(
+        self, buffer_size: int, batch_size: int, flush_seconds: float, enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._wakeup_pending = False
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._flush_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.failed_flushes = 0
+
+    def record(
+        self,
+        actor: TherapistResponse,
+        action: str,
+        resource_type: str,
+        resource_id: uuid.UUID,
+        details: Optional[dict] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        context = audit_context.get()
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(
+            {
+                "id": uuid.uuid4(),
+                "user_id": actor.id,
+                "user_email": actor.email,
+                "action": action,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "datails": details or {},
+                "ip_address": context.ip_address,
+                "user_agent": context.user_agent,
+                "request_id": context.request_id,
+                "created_at": datetime.now(timezone.utc),
+            }
+        )
+        if len(self._buffer) >= self.batch_size:
+            self._request_flush()
+
+    def _request_flush(self) -> None:
+        if self._wakeup_pending or self._loop is None:
+            return
+        self._wakeup_pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            pass
+
+    def _take_batch(self) -> list:
+        rows = []
+        while self._buffer and len(rows) < self.batch_size:
+            rows.append(self._buffer.popleft())
+        return rows
+
+    def _write(self, rows: list) -> None:
+        # SQLAlchemy renders executemany INSERTs as multi-row VALUES
+        # statements (insertmanyvalues), so a batch is a few round trips.
+        with engine.begin() as connection:
+            connection.execute(insert(AuditLog), rows)
+
+    def _put_back(self, rows: list) -> None:
+        # extendleft on a full deque pushes the newest rows off the right.
+        overflow = len(self._buffer) + len(rows) - self._buffer.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self._buffer.extendleft(reversed(rows))
+
+    def _write_batch(self, rows: list) -> None:
+        parts = [rows]
+        while parts:
+            part = parts.pop()
+            try:
+                self._write(part)
+            except (IntegrityError, DataError) as exc:
+                if len(part) > 1:
+                    middle = len(part) // 2
+                    parts += [part[middle:], part[:middle]]
+                    continue
+                row = part[0]
+                self.rejected += 1
+                logger.error(
+                    "Audit row %s (%s at %s) rejected and dropped: %s",
+                    row["id"],
+                    row["action"],
+                    row["created_at"].isoformat(),
+                    type(exc.orig).__name__,
+                )
+                continue
+            except Exception:
+                # Put back everything not yet written, in order, and let the
+                # caller retry.
+                unwritten = [part, *reversed(parts)]
+                self._put_back([row for rows_left in unwritten for row in rows_left])
+                self.failed_flushes += 1
+                raise
+            self.written += len(part)
+
+    def flush(self) -> int:
+        """Write everything buffered; blocking, returns rows written."""
+        with self._flush_lock:
+            written = self.written
+            while self._buffer:
+                self._write_batch(self._take_batch())
+            return self.written - written
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                async with asyncio.timeout(self.flush_seconds):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            self._wakeup_pending = False
+            if not self._buffer:
+                continue
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Audit flush failed, %s rows kept", len(self._buffer))
+                await asyncio.sleep(AUDIT_RETRY_SECONDS)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        if self._buffer:
+            started = time.perf_counter()
+            try:
+                written = await asyncio.to_thread(self.flush)
+                logger.info(
+                    "Drained %s audit rows in %.1f ms",
+                    written,
+                    (time.perf_counter() - started) * 1000,
+                )
+            except Exception:
+                logger.exception("Audit drain failed, %s rows lost", len(self._buffer))
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+audit_log = AuditWriter(
+    AUDIT_BUFFER_SIZE, AUDIT_BATCH_SIZE, AUDIT_FLUSH_SECONDS, enabled=AUDIT_ENABLED
+)
@@ -1,5 +1,7 @@
 import uuid
 from pydantic import EmailStr
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.therapist import Therapist
@@ -8,11 +10,39 @@ from app.schemas.therapist import (
     TherapistLogin,
     TherapistResponse,
 )
-from app.core.security import get_password_hash, verify_password
+from app.core.security import (
+    get_password_hash,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password,
+    verify_password_async,
+)
 from app.core.auth import create_access_token
+from app.core.identity_cache import identity_cache
 from datetime import datetime, timedelta, timezone
 
 
+def _login_response(therapist: Therapist) -> dict:
+    return {
+        "access_token": create_access_token({"sub": str(therapist.id)}),
+        "token_type": "Bearer",
+        "therapist": TherapistResponse.model_validate(therapist),
+    }
+
+
+def _ensure_active(therapist: Therapist) -> None:
+    if not therapist.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is inactive")
+
+
+def _ensure_reset_token_valid(therapist: Therapist) -> None:
+    if (
+        therapist.password_reset_token_expires_at
+        and therapist.password_reset_token_expires_at < datetime.now(timezone.utc)
+    ):
+        raise HTTPException(status_code=400, detail="Token expired")
+
+
 class AuthService:
     @staticmethod
     def authenticate(data: TherapistLogin, db: Session) -> dict:
@@ -24,16 +54,15 @@ class AuthService:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
             )
+        _ensure_active(therapist)
 
+        if password_needs_rehash(therapist.hashed_password):
+            therapist.hashed_password = get_password_hash(password)
         therapist.last_login_at = datetime.now(timezone.utc)
         db.commit()
         db.refresh(therapist)
 
-        return {
-            "access_token": create_access_token({"sub": str(therapist.id)}),
-            "token_type": "Bearer",
-            "therapist": TherapistResponse.model_validate(therapist),
-        }
+        return _login_response(therapist)
 
     @staticmethod
     def logout(therapist_id: uuid.UUID, db: Session):
@@ -78,17 +107,93 @@ class AuthService:
         if not therapist:
             raise HTTPException(status_code=404, detail="Invalid or expired token")
 
-        if (
-            therapist.password_reset_token_expires_at
-            and therapist.password_reset_token_expires_at < datetime.now(timezone.utc)
-        ):
-            raise HTTPException(status_code=400, detail="Token expired")
+        _ensure_reset_token_valid(therapist)
 
         therapist.hashed_password = get_password_hash(data.new_password)
         therapist.password_reset_token = None
         therapist.password_reset_token_expires_at = None
         db.commit()
         db.refresh(therapist)
+        identity_cache.invalidate_therapist(therapist.id)
+        return {
+            "message": "Password reset successfully",
+        }
+
+
+class AsyncAuthService:
+    @staticmethod
+    async def authenticate(data: TherapistLogin, db: AsyncSession) -> dict:
+        email = data.email
+        password = data.password
+        therapist = await db.scalar(select(Therapist).filter_by(email=email))
+        if not therapist or not await verify_password_async(
+            password, therapist.hashed_password
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid email or password",
+            )
+        _ensure_active(therapist)
+
+        if password_needs_rehash(therapist.hashed_password):
+            therapist.hashed_password = await get_password_hash_async(password)
+        therapist.last_login_at = datetime.now(timezone.utc)
+        await db.commit()
+        await db.refresh(therapist)
+
+        return _login_response(therapist)
+
+    @staticmethod
+    async def logout(therapist_id: uuid.UUID, db: AsyncSession):
+        therapist = await db.scalar(select(Therapist).filter_by(id=therapist_id))
+        if not therapist:
+            raise HTTPException(status_code=404, detail="Therapist not found")
+        therapist.last_login_at = datetime.now(timezone.utc)
+        await db.commit()
+        await db.refresh(therapist)
+        return therapist
+
+    @staticmethod
+    async def refresh_token(therapist_id: uuid.UUID, db: AsyncSession):
+        therapist = await db.scalar(select(Therapist).filter_by(id=therapist_id))
+        if not therapist:
+            raise HTTPException(status_code=404, detail="Therapist not found")
+        return {
+            "token_type": "Bearer",
+            "access_token": create_access_token({"sub": str(therapist.id)}),
+        }
+
+    @staticmethod
+    async def forgot_password(email: EmailStr, db: AsyncSession):
+        therapist = await db.scalar(select(Therapist).filter_by(email=email))
+        if not therapist:
+            raise HTTPException(status_code=404, detail="Therapist not found")
+
+        therapist.password_reset_token = str(uuid.uuid4())
+        therapist.password_reset_token_expires_at = datetime.now(
+            timezone.utc
+        ) + timedelta(minutes=15)
+        await db.commit()
+
+        return {
+            "message": "Password reset email sent",
+        }
+
+    @staticmethod
+    async def reset_password(token: str, data: ResetPassword, db: AsyncSession):
+        therapist = await db.scalar(
+            select(Therapist).filter_by(password_reset_token=token)
+        )
+        if not therapist:
+            raise HTTPException(status_code=404, detail="Invalid or expired token")
+
+        _ensure_reset_token_valid(therapist)
+
+        therapist.hashed_password = await get_password_hash_async(data.new_password)
+        therapist.password_reset_token = None
+        therapist.password_reset_token_expires_at = None
+        await db.commit()
+        identity_cache.invalidate_therapist(therapist.id)
         return {
             "message": "Password reset successfully",
         }
@@ -0,0 +1,346 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+import zipfile
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal, async_engine, engine
+from app.models.auditLog import AuditLog
+from app.models.dataExport import DataExport
+from app.models.patient import Patient
+from app.models.session import Session as TherapySession, unpack_payload
+from app.models.therapist import Therapist
+from app.schemas.data_export import DataExportResponse
+from app.services.storage_service import get_storage
+
+logger = logging.getLogger(__name__)
+
+# Rows per fetch from each section's server-side cursor.
+DATA_EXPORT_BATCH_ROWS = int(os.getenv("DATA_EXPORT_BATCH_ROWS", 1000))
+DATA_EXPORT_PREFIX = os.getenv("DATA_EXPORT_PREFIX", "data-exports")
+DATA_EXPORT_TTL_HOURS = float(os.getenv("DATA_EXPORT_TTL_HOURS", 24))
+# Background exports running at once in this process.
+DATA_EXPORT_CONCURRENCY = int(os.getenv("DATA_EXPORT_CONCURRENCY", 2))
+# An unfinished job older than this is assumed lost (e.g. the process
+# restarted) and a new request starts over.
+DATA_EXPORT_STALE_SECONDS = float(os.getenv("DATA_EXPORT_STALE_SECONDS", 3600))
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "zip": "application/zip"}
+SECTIONS = ("therapist", "patients", "sessions", "audit_logs")
+
+# Credentials and reset tokens are not personal data worth returning.
+_THERAPIST_COLUMNS = tuple(
+    column
+    for column in Therapist.__table__.c
+    if column.name not in ("hashed_password", "password_reset_token")
+)
+# Generated columns (the search vector) are derived, not data. The packed
+# columns are read too but merged back by _row_json.
+_SESSION_COLUMNS = tuple(
+    column for column in TherapySession.__table__.c if column.computed is None
+)
+
+_job_slots = asyncio.Semaphore(DATA_EXPORT_CONCURRENCY)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _sections(therapist_id: uuid.UUID) -> List[Tuple[str, Select]]:
+    """Everything held about the therapist, one ordered query per section."""
+    return [
+        ("therapist", select(*_THERAPIST_COLUMNS).where(Therapist.id == therapist_id)),
+        (
+            "patients",
+            select(*Patient.__table__.c)
+            .where(Patient.therapist_id == therapist_id)
+            .order_by(Patient.created_at, Patient.id),
+        ),
+        (
+            "sessions",
+            select(*_SESSION_COLUMNS)
+            .where(TherapySession.therapist_id == therapist_id)
+            .order_by(TherapySession.session_date, TherapySession.id),
+        ),
+        (
+            "audit_logs",
+            select(*AuditLog.__table__.c)
+            .where(AuditLog.user_id == therapist_id)
+            .order_by(AuditLog.created_at, AuditLog.id),
+        ),
+    ]
+
+
+def _row_json(row) -> bytes:
+    return json.dumps(unpack_payload(row._mapping), default=_json_default).encode()
+
+
+class _Buffer:
+    """Write-only sink for ZipFile; handing it a non-seekable file makes
+    zipfile stream entries with data descriptors."""
+
+    def __init__(self):
+        self._data = bytearray()
+
+    def write(self, data) -> int:
+        self._data += data
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = bytes(self._data)
+        self._data.clear()
+        return data
+
+
+class _ExportEncoder:
+    """Turns (section, rows) batches into output bytes.
+
+    ndjson: one ``{"type": section, "data": row}`` line per row. zip: one
+    ``<section>.ndjson`` entry per section. Both end with a manifest of row
+    counts, so a reader can tell a complete export from a cut-off one.
+    """
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.counts = dict.fromkeys(SECTIONS, 0)
+        self._buffer = _Buffer()
+        self._zip = (
+            zipfile.ZipFile(self._buffer, "w", zipfile.ZIP_DEFLATED) if fmt == "zip" else None
+        )
+        self._entry = None
+        self._section: Optional[str] = None
+
+    def add(self, section: str, rows) -> bytes:
+        self.counts[section] += len(rows)
+        if self._zip is None:
+            prefix = b'{"type":"' + section.encode() + b'","data":'
+            return b"".join(prefix + _row_json(row) + b"}\n" for row in rows)
+        if section != self._section:
+            if self._entry is not None:
+                self._entry.close()
+            self._entry = self._zip.open(f"{section}.ndjson", "w", force_zip64=True)
+            self._section = section
+        self._entry.write(b"".join(_row_json(row) + b"\n" for row in rows))
+        return self._buffer.take()
+
+    def finish(self) -> bytes:
+        manifest = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "counts": self.counts,
+        }
+        if self._zip is None:
+            return json.dumps({"type": "manifest", "data": manifest}).encode() + b"\n"
+        if self._entry is not None:
+            self._entry.close()
+        self._zip.writestr("manifest.json", json.dumps(manifest))
+        self._zip.close()
+        return self._buffer.take()
+
+
+def _snapshot_options(dialect_name: str) -> dict:
+    # Every section reads the same snapshot; READ COMMITTED would take a new
+    # one per statement.
+    if dialect_name != "postgresql":
+        return {}
+    return {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+
+
+def export_chunks(therapist_id: uuid.UUID, fmt: str) -> Iterator[bytes]:
+    """The export as a byte stream, read batch by batch through server-side
+    cursors on one connection (one consistent transaction)."""
+    encoder = _ExportEncoder(fmt)
+    with engine.connect() as connection:
+        connection.execution_options(**_snapshot_options(engine.dialect.name))
+        for section, stmt in _sections(therapist_id):
+            result = connection.execute(
+                stmt.execution_options(yield_per=DATA_EXPORT_BATCH_ROWS)
+            )
+            for rows in result.partitions():
+                chunk = encoder.add(section, rows)
+                if chunk:
+                    yield chunk
+    yield encoder.finish()
+
+
+async def export_chunks_async(therapist_id: uuid.UUID, fmt: str) -> AsyncIterator[bytes]:
+    encoder = _ExportEncoder(fmt)
+    async with async_engine.connect() as connection:
+        await connection.execution_options(**_snapshot_options(async_engine.dialect.name))
+        for section, stmt in _sections(therapist_id):
+            result = await connection.stream(
+                stmt.execution_options(yield_per=DATA_EXPORT_BATCH_ROWS)
+            )
+            async for rows in result.partitions():
+                chunk = encoder.add(section, rows)
+                if chunk:
+                    yield chunk
+    yield encoder.finish()
+
+
+def export_filename(fmt: str) -> str:
+    return f"theramind-export-{datetime.now(timezone.utc):%Y%m%d}.{fmt}"
+
+
+def _response(export: DataExport) -> DataExportResponse:
+    response = DataExportResponse.model_validate(export)
+    if export.status == "completed":
+        response.download_url = f"/api/v1/me/data-export/jobs/{export.id}/download"
+    return response
+
+
+def _active_job_statement(therapist_id: uuid.UUID) -> Select:
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=DATA_EXPORT_STALE_SECONDS)
+    return (
+        select(DataExport)
+        .where(
+            DataExport.therapist_id == therapist_id,
+            DataExport.status.in_(("pending", "running")),
+            DataExport.created_at > stale_before,
+        )
+        .order_by(DataExport.created_at.desc())
+        .limit(1)
+    )
+
+
+def _downloadable(export: Optional[DataExport]) -> DataExport:
+    if export is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if export.status == "expired":
+        raise HTTPException(status_code=410, detail="Export has expired")
+    if export.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Export is {export.status}")
+    if export.expires_at is not None and export.expires_at <= datetime.now(timezone.utc):
+        raise HTTPException(status_code=410, detail="Export has expired")
+    return export
+
+
+def _set_status(export_id: uuid.UUID, **values) -> DataExport:
+    with SessionLocal() as db:
+        export = db.get(DataExport, export_id)
+        for name, value in values.items():
+            setattr(export, name, value)
+        db.commit()
+        db.refresh(export)
+        return export
+
+
+async def run_export_job(export_id: uuid.UUID) -> None:
+    """Write the export to storage; the job row tracks progress.
+
+    Runs after the request that created it. Reads use the sync engine on
+    worker threads so the job runs the same in both database modes.
+    """
+    async with _job_slots:
+        export = await asyncio.to_thread(
+            _set_status, export_id, status="running", started_at=datetime.now(timezone.utc)
+        )
+        key = f"{DATA_EXPORT_PREFIX}/{export.therapist_id}/{export.id}.{export.format}"
+        chunks = export_chunks(export.therapist_id, export.format)
+
+        async def produce():
+            while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                yield chunk
+
+        try:
+            size = await get_storage().write_stream(key, produce())
+        except Exception as exc:
+            logger.exception("Data export %s failed", export_id)
+            await asyncio.to_thread(chunks.close)
+            await asyncio.to_thread(
+                _set_status,
+                export_id,
+                status="failed",
+                error=type(exc).__name__,
+                completed_at=datetime.now(timezone.utc),
+            )
+            return
+        completed_at = datetime.now(timezone.utc)
+        await asyncio.to_thread(
+            _set_status,
+            export_id,
+            status="completed",
+            storage_key=key,
+            size_bytes=size,
+            completed_at=completed_at,
+            expires_at=completed_at + timedelta(hours=DATA_EXPORT_TTL_HOURS),
+        )
+
+
+class DataExportService:
+    @staticmethod
+    def create_job(therapist_id: uuid.UUID, fmt: str, db: Session) -> Tuple[DataExportResponse, bool]:
+        """Returns the job and whether it is new; an export already in
+        progress is returned instead of starting another."""
+        active = db.scalar(_active_job_statement(therapist_id))
+        if active is not None:
+            return _response(active), False
+        export = DataExport(therapist_id=therapist_id, format=fmt, status="pending")
+        db.add(export)
+        db.commit()
+        db.refresh(export)
+        return _response(export), True
+
+    @staticmethod
+    def get_job(therapist_id: uuid.UUID, export_id: uuid.UUID, db: Session) -> DataExportResponse:
+        export = db.scalar(
+            select(DataExport).filter_by(id=export_id, therapist_id=therapist_id)
+        )
+        if export is None:
+            raise HTTPException(status_code=404, detail="Export not found")
+        return _response(export)
+
+    @staticmethod
+    def get_download(therapist_id: uuid.UUID, export_id: uuid.UUID, db: Session) -> DataExport:
+        return _downloadable(
+            db.scalar(select(DataExport).filter_by(id=export_id, therapist_id=therapist_id))
+        )
+
+
+class AsyncDataExportService:
+    @staticmethod
+    async def create_job(
+        therapist_id: uuid.UUID, fmt: str, db: AsyncSession
+    ) -> Tuple[DataExportResponse, bool]:
+        active = await db.scalar(_active_job_statement(therapist_id))
+        if active is not None:
+            return _response(active), False
+        export = DataExport(therapist_id=therapist_id, format=fmt, status="pending")
+        db.add(export)
+        await db.commit()
+        await db.refresh(export)
+        return _response(export), True
+
+    @staticmethod
+    async def get_job(
+        therapist_id: uuid.UUID, export_id: uuid.UUID, db: AsyncSession
+    ) -> DataExportResponse:
+        export = await db.scalar(
+            select(DataExport).filter_by(id=export_id, therapist_id=therapist_id)
+        )
+        if export is None:
+            raise HTTPException(status_code=404, detail="Export not found")
+        return _response(export)
+
+    @staticmethod
+    async def get_download(
+        therapist_id: uuid.UUID, export_id: uuid.UUID, db: AsyncSession
+    ) -> DataExport:
+        return _downloadable(
+            await db.scalar(
+                select(DataExport).filter_by(id=export_id, therapist_id=therapist_id)
+            )
+        )
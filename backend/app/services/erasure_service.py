@@ -0,0 +1,76 @@
+import uuid
+from typing import Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.identity_cache import identity_cache
+from app.models.erasureJob import ErasureJob
+from app.models.therapist import Therapist
+from app.schemas.erasure import ErasureJobResponse
+
+
+def _response(job: ErasureJob) -> ErasureJobResponse:
+    response = ErasureJobResponse.model_validate(job)
+    response.status_url = f"/api/v1/erasure-jobs/{job.id}"
+    return response
+
+
+def _active_job_statement(therapist_id: uuid.UUID) -> Select:
+    return select(ErasureJob).where(
+        ErasureJob.therapist_id == therapist_id, ErasureJob.status != "completed"
+    )
+
+
+def _start(therapist: Optional[Therapist]) -> ErasureJob:
+    if not therapist:
+        raise HTTPException(status_code=404, detail="Therapist not found")
+    # Locks the account right away; the rows go in the background.
+    therapist.is_active = False
+    return ErasureJob(therapist_id=therapist.id, status="pending", progress={})
+
+
+def _not_found(job: Optional[ErasureJob]) -> ErasureJob:
+    if job is None:
+        raise HTTPException(status_code=404, detail="Erasure job not found")
+    return job
+
+
+class ErasureService:
+    @staticmethod
+    def start_erasure(therapist_id: uuid.UUID, db: Session) -> Tuple[ErasureJobResponse, bool]:
+        """Returns the job and whether it is new; asking twice returns the
+        erasure already under way."""
+        active = db.scalar(_active_job_statement(therapist_id))
+        if active is not None:
+            return _response(active), False
+        job = _start(db.query(Therapist).filter_by(id=therapist_id).first())
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        identity_cache.invalidate_therapist(therapist_id)
+        return _response(job), True
+
+    @staticmethod
+    def get_job(job_id: uuid.UUID, db: Session) -> ErasureJobResponse:
+        return _response(_not_found(db.get(ErasureJob, job_id)))
+
+
+class AsyncErasureService:
+    @staticmethod
+    async def start_erasure(
+        therapist_id: uuid.UUID, db: AsyncSession
+    ) -> Tuple[ErasureJobResponse, bool]:
+        active = await db.scalar(_active_job_statement(therapist_id))
+        if active is not None:
+            return _response(active), False
+        job = _start(await db.scalar(select(Therapist).filter_by(id=therapist_id)))
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        identity_cache.invalidate_therapist(therapist_id)
+        return _response(job), True
+
+    @staticmethod
+    async def get_job(job_id: uuid.UUID, db: AsyncSession) -> ErasureJobResponse:
+        return _response(_not_found(await db.get(ErasureJob, job_id)))
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import asyncpg
+from sqlalchemy import func, select
+
+logger = logging.getLogger(__name__)
+
+# inprocess: events reach subscribers of the process that made the change.
+# postgres: changes NOTIFY on commit and every API process LISTENs, so
+# standalone workers and multiple API nodes all reach every subscriber.
+NOTIFY_BACKEND = os.getenv("NOTIFY_BACKEND", "inprocess")
+NOTIFY_CHANNEL = os.getenv("NOTIFY_CHANNEL", "session_status")
+# LISTEN needs a session-mode connection; point this past PgBouncer when
+# DATABASE_URL uses transaction pooling.
+NOTIFY_DATABASE_URL = os.getenv("NOTIFY_DATABASE_URL") or os.getenv("DATABASE_URL", "")
+NOTIFY_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("NOTIFY_SUBSCRIBER_QUEUE_SIZE", 100))
+NOTIFY_RECONNECT_SECONDS = float(os.getenv("NOTIFY_RECONNECT_SECONDS", 5))
+# Keeps idle streams alive through proxies that close silent connections.
+NOTIFY_HEARTBEAT_SECONDS = float(os.getenv("NOTIFY_HEARTBEAT_SECONDS", 25))
+
+
+def status_event(
+    session_id: uuid.UUID, therapist_id: uuid.UUID, processing_status: str, version: int
+) -> dict:
+    return {
+        "session_id": str(session_id),
+        "therapist_id": str(therapist_id),
+        "processing_status": processing_status,
+        "version": version,
+    }
+
+
+def _listen_dsn(url: str) -> str:
+    # asyncpg takes a plain libpq URL, without the SQLAlchemy driver suffix.
+    scheme, sep, rest = url.partition("://")
+    return scheme.split("+", 1)[0] + sep + rest
+
+
+class StatusBroker:
+    """Fans session status events out to the owning therapist's subscribers.
+
+    Subscribers are bounded asyncio queues on the event loop, so an idle
+    connection costs one queue and no thread. A subscriber that falls
+    behind loses its oldest events rather than slowing anyone else down.
+    """
+
+    def __init__(self, backend: str, queue_size: int):
+        if backend not in ("inprocess", "postgres"):
+            raise ValueError(f"Unknown NOTIFY_BACKEND: {backend}")
+        self.uses_database = backend == "postgres"
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+        self.delivered = 0
+        self.dropped = 0
+
+    def notify_statement(self, event: dict):
+        """pg_notify for ``event``; Postgres delivers it only if the caller's
+        transaction commits."""
+        return select(func.pg_notify(NOTIFY_CHANNEL, json.dumps(event)))
+
+    def publish_local(self, event: dict) -> None:
+        """Deliver ``event`` after commit when there is no database channel.
+
+        Safe to call from worker threads and the threadpool.
+        """
+        if self.uses_database or self._loop is None or not self._subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._dispatch(event)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._dispatch, event)
+        except RuntimeError:
+            # Loop already closed during shutdown.
+            pass
+
+    def _dispatch(self, event: dict) -> None:
+        for queue in self._subscribers.get(event["therapist_id"], ()):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+            self.delivered += 1
+
+    @asynccontextmanager
+    async def subscribe(self, therapist_id: uuid.UUID):
+        self._loop = asyncio.get_running_loop()
+        key = str(therapist_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(key, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(key)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[key]
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self.uses_database and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed %s notification", channel)
+            return
+        self._dispatch(event)
+
+    async def _listen(self) -> None:
+        # One dedicated connection per process, outside the pool, held for
+        # the life of the app; reconnects after a drop.
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(_listen_dsn(NOTIFY_DATABASE_URL))
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(NOTIFY_CHANNEL, self._on_notification)
+                logger.info("Listening for session status on %s", NOTIFY_CHANNEL)
+                await closed.wait()
+                logger.warning("Status listener connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Status listener failed, reconnecting")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(NOTIFY_RECONNECT_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "postgres" if self.uses_database else "inprocess",
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "therapists": len(self._subscribers),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+status_broker = StatusBroker(NOTIFY_BACKEND, NOTIFY_SUBSCRIBER_QUEUE_SIZE)
@@ -0,0 +1,227 @@
+import codecs
+import csv
+import json
+import os
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.schemas.patient import PatientCreate, PatientImportError, PatientImportReport
+
+IMPORT_BATCH_SIZE = int(os.getenv("PATIENT_IMPORT_BATCH_SIZE", 500))
+IMPORT_MAX_LINE_BYTES = int(os.getenv("PATIENT_IMPORT_MAX_LINE_BYTES", 65536))
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("PATIENT_IMPORT_MAX_REPORTED_ERRORS", 1000))
+
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+}
+
+# Receives one validated batch and returns the identifiers that were inserted.
+BatchWriter = Callable[[List[PatientCreate]], Awaitable[set]]
+
+
+def resolve_import_format(content_type: Optional[str], fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CSV_CONTENT_TYPES:
+        return "csv"
+    if media_type in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    raise HTTPException(
+        status_code=415,
+        detail="Unsupported content type; send text/csv or application/x-ndjson",
+    )
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line.rstrip("\r")
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Line {line_number + 1} exceeds {IMPORT_MAX_LINE_BYTES} bytes",
+            )
+    buffer += decoder.decode(b"", final=True)
+    if buffer.strip():
+        yield line_number + 1, buffer.rstrip("\r")
+
+
+class _LineFeed:
+    """Input of the import's csv.reader. Only whole records are queued, so
+    the reader never runs dry inside a quoted field and can be resumed
+    once more lines arrive."""
+
+    def __init__(self):
+        self.lines: deque[str] = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def _iter_csv_rows(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[Tuple[int, Union[List[str], csv.Error]]]:
+    """CSV records with the line they end on. A quoted field may span lines
+    (RFC 4180); a record is complete once its quotes are balanced."""
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    pending: List[str] = []
+    pending_size = 0
+    quotes = 0
+    async for line_number, line in _iter_lines(chunks):
+        pending.append(line + "\n")
+        pending_size += len(line) + 1
+        quotes += line.count('"')
+        if quotes % 2:
+            if pending_size > IMPORT_MAX_LINE_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=(
+                        f"Record at line {line_number} exceeds "
+                        f"{IMPORT_MAX_LINE_BYTES} bytes"
+                    ),
+                )
+            continue
+        feed.lines.extend(pending)
+        pending.clear()
+        pending_size = quotes = 0
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as exc:
+                # The reader starts over on the next line.
+                yield reader.line_num, exc
+                continue
+            yield reader.line_num, row
+    # An unterminated quote runs to the end of the file.
+    feed.lines.extend(pending)
+    try:
+        for row in reader:
+            yield reader.line_num, row
+    except csv.Error as exc:
+        yield reader.line_num, exc
+
+
+class PatientImportService:
+    @staticmethod
+    async def import_stream(
+        chunks: AsyncIterator[bytes], fmt: str, write_batch: BatchWriter
+    ) -> PatientImportReport:
+        report = PatientImportReport()
+        batch: List[PatientCreate] = []
+        batch_lines: List[int] = []
+        header: Optional[List[str]] = None
+
+        def add_error(line: int, identifier: Optional[str], error: str) -> None:
+            if len(report.errors) < IMPORT_MAX_REPORTED_ERRORS:
+                report.errors.append(
+                    PatientImportError(line=line, identifier=identifier, error=error)
+                )
+            else:
+                report.errors_truncated = True
+
+        async def flush() -> None:
+            # Rows repeated inside the batch would only be skipped silently by
+            # ON CONFLICT, so report them here against their own line.
+            unique: dict[str, int] = {}
+            rows: List[PatientCreate] = []
+            for row, line in zip(batch, batch_lines):
+                if row.identifier in unique:
+                    report.duplicates += 1
+                    add_error(line, row.identifier, "Duplicate identifier in file")
+                    continue
+                unique[row.identifier] = line
+                rows.append(row)
+            inserted = await write_batch(rows) if rows else set()
+            report.inserted += len(inserted)
+            for identifier, line in unique.items():
+                if identifier not in inserted:
+                    report.duplicates += 1
+                    add_error(
+                        line, identifier, "Patient with this identifier already exists"
+                    )
+            batch.clear()
+            batch_lines.clear()
+
+        records = _iter_csv_rows(chunks) if fmt == "csv" else _iter_lines(chunks)
+        async for line_number, line in records:
+            if fmt == "csv":
+                if isinstance(line, list) and not any(value.strip() for value in line):
+                    continue
+            elif not line.strip():
+                continue
+
+            if fmt == "csv" and header is None:
+                if isinstance(line, csv.Error):
+                    raise HTTPException(
+                        status_code=400, detail=f"Unreadable CSV header: {line}"
+                    )
+                header = [column.strip() for column in line]
+                if "identifier" not in header:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="CSV header must include an 'identifier' column",
+                    )
+                continue
+
+            report.total_rows += 1
+            data = None
+            try:
+                if fmt == "csv":
+                    if isinstance(line, csv.Error):
+                        raise line
+                    values = line
+                    data = {
+                        column: (value or None)
+                        for column, value in zip(header, values)
+                    }
+                else:
+                    data = json.loads(line)
+                    if not isinstance(data, dict):
+                        raise ValueError("Each line must be a JSON object")
+                data.setdefault("date_of_birth", None)
+                row = PatientCreate.model_validate(data)
+            except (ValidationError, ValueError, csv.Error) as exc:
+                report.invalid += 1
+                identifier = data.get("identifier") if isinstance(data, dict) else None
+                add_error(line_number, identifier, _error_message(exc))
+                continue
+
+            batch.append(row)
+            batch_lines.append(line_number)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush()
+
+        if batch:
+            await flush()
+        return report
+
+
+def _error_message(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        )
+    return str(exc)
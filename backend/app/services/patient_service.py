@@ -1,11 +1,16 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import Select, Update, and_, func, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 import uuid
 import math
 from app.schemas.patient import (
+    PatientBatchOutcome,
+    PatientBatchResult,
     PatientCreate,
     PatientResponse,
     PatientFilter,
@@ -13,6 +18,222 @@ from app.schemas.patient import (
     PatientUpdate,
 )
 from app.models.patient import Patient
+from app.core.pagination import decode_datetime_id_cursor, encode_cursor
+from app.core.counting import (
+    DEFAULT_COUNT_STRATEGY,
+    CountKey,
+    CountResult,
+    CountStrategy,
+    count_cache,
+    count_rows,
+    count_rows_async,
+    filter_key,
+)
+
+PATIENT_COUNT_SCOPE = "patients"
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _identifier_criterion(filters: PatientFilter):
+    # All three modes are index-backed: substring and fuzzy matches use the
+    # pg_trgm GIN index, prefix matches the lower(identifier) btree.
+    term = filters.identifier
+    if filters.identifier_match == "prefix":
+        return func.lower(Patient.identifier).like(
+            f"{_escape_like(term.lower())}%", escape="\\"
+        )
+    if filters.identifier_match == "closest":
+        return Patient.identifier.op("%")(term)
+    return Patient.identifier.ilike(f"%{_escape_like(term)}%", escape="\\")
+
+
+def _list_criteria(therapist_id: uuid.UUID, filters: Optional[PatientFilter]) -> list:
+    criteria = [Patient.therapist_id == therapist_id, Patient.is_deleted == False]
+
+    if filters:
+        if filters.identifier:
+            criteria.append(_identifier_criterion(filters))
+
+        if filters.consent_given is not None:
+            criteria.append(Patient.consent_given == filters.consent_given)
+
+        if filters.created_after:
+            criteria.append(Patient.created_at >= filters.created_after)
+
+        if filters.created_before:
+            criteria.append(Patient.created_at <= filters.created_before)
+
+    return criteria
+
+
+def _apply_update(existing: Patient, data: PatientUpdate) -> None:
+    if data.identifier:
+        existing.identifier = data.identifier
+    if data.date_of_birth:
+        existing.date_of_birth = data.date_of_birth
+
+
+def _page_statement(
+    criteria: list,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    keyset: bool,
+    filters: Optional[PatientFilter] = None,
+) -> Select:
+    stmt = select(Patient).where(*criteria)
+    order_by = [Patient.created_at.desc(), Patient.id.desc()]
+    if filters and filters.identifier and filters.identifier_match == "closest":
+        if keyset:
+            raise HTTPException(
+                status_code=400,
+                detail="Closest-match search does not support cursor pagination",
+            )
+        order_by.insert(
+            0, func.similarity(Patient.identifier, filters.identifier).desc()
+        )
+    if keyset:
+        # Seek past the last row of the previous page; served by
+        # idx_patients_therapist_created so deep pages cost the same as page 1.
+        if cursor:
+            created_at, patient_id = decode_datetime_id_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(Patient.created_at, Patient.id) < tuple_(created_at, patient_id)
+            )
+        # One extra row tells us whether a next page exists.
+        limit = page_size + 1
+    else:
+        stmt = stmt.offset((page - 1) * page_size)
+        limit = page_size
+    return stmt.order_by(*order_by).limit(limit)
+
+
+def _count_key(therapist_id: uuid.UUID, filters: Optional[PatientFilter]) -> CountKey:
+    active = filters.model_dump(exclude_none=True) if filters else {}
+    if "identifier" not in active:
+        active.pop("identifier_match", None)
+    return CountKey(PATIENT_COUNT_SCOPE, therapist_id, filter_key(active))
+
+
+def _import_statement(therapist_id: uuid.UUID, rows: List[PatientCreate]):
+    now = datetime.now(timezone.utc)
+    values = [
+        {
+            "id": uuid.uuid4(),
+            "therapist_id": therapist_id,
+            "identifier": row.identifier,
+            "date_of_birth": row.date_of_birth,
+            "consent_given": False,
+            "is_deleted": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for row in rows
+    ]
+    stmt = (
+        pg_insert(Patient)
+        .values(values)
+        .on_conflict_do_nothing(constraint="unique_patient_per_therapist")
+        .returning(Patient.identifier)
+    )
+    return stmt
+
+
+def _unique_ids(ids: List[uuid.UUID]) -> List[uuid.UUID]:
+    return list(dict.fromkeys(ids))
+
+
+def _batch_update_statement(
+    therapist_id: uuid.UUID, ids: List[uuid.UUID], data: PatientUpdate
+) -> Update:
+    # Mirrors update_patient: only truthy fields are applied, deleted rows
+    # are not excluded, and updated_at moves forward.
+    values = {}
+    if data.identifier:
+        if len(ids) > 1:
+            raise HTTPException(
+                status_code=400,
+                detail="identifier can only be changed for a single patient",
+            )
+        values["identifier"] = data.identifier
+    if data.date_of_birth:
+        values["date_of_birth"] = data.date_of_birth
+    if not values:
+        raise HTTPException(status_code=400, detail="Patch has no fields to update")
+    values["updated_at"] = datetime.now(timezone.utc)
+    return (
+        update(Patient)
+        .where(Patient.therapist_id == therapist_id, Patient.id.in_(ids))
+        .values(**values)
+        .returning(Patient.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _batch_delete_statement(therapist_id: uuid.UUID, ids: List[uuid.UUID]) -> Update:
+    # Mirrors delete_patient: already-deleted rows count as not found.
+    now = datetime.now(timezone.utc)
+    return (
+        update(Patient)
+        .where(
+            Patient.therapist_id == therapist_id,
+            Patient.id.in_(ids),
+            Patient.is_deleted == False,
+        )
+        .values(is_deleted=True, deleted_at=now, updated_at=now)
+        .returning(Patient.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _batch_result(
+    ids: List[uuid.UUID], affected: set, status: str
+) -> PatientBatchResult:
+    return PatientBatchResult(
+        affected=len(affected),
+        results=[
+            PatientBatchOutcome(
+                id=patient_id, status=status if patient_id in affected else "not_found"
+            )
+            for patient_id in ids
+        ],
+    )
+
+
+def _identifier_conflict() -> HTTPException:
+    return HTTPException(
+        status_code=400, detail="Patient with this identifier already exists"
+    )
+
+
+def _paginated_response(
+    total: Optional[CountResult],
+    page: int,
+    page_size: int,
+    patients: List[Patient],
+    keyset: bool = False,
+) -> PaginatedPatientResponse:
+    next_cursor = None
+    if keyset and len(patients) > page_size:
+        patients = patients[:page_size]
+        last = patients[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    total_pages = None
+    if total is not None:
+        total_pages = math.ceil(total.total / page_size) if total.total > 0 else 0
+    return PaginatedPatientResponse(
+        total=total.total if total is not None else None,
+        total_is_estimate=total.estimated if total is not None else False,
+        page=None if keyset else page,
+        page_size=page_size,
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        patients=[PatientResponse.model_validate(patient) for patient in patients],
+    )
 
 
 class PatientService:
@@ -23,45 +244,29 @@ class PatientService:
         page: int = 1,
         page_size: int = 10,
         filters: Optional[PatientFilter] = None,
+        cursor: Optional[str] = None,
+        keyset: bool = False,
+        include_total: Optional[bool] = None,
+        count_strategy: CountStrategy = DEFAULT_COUNT_STRATEGY,
     ) -> PaginatedPatientResponse:
-        query = db.query(Patient).filter(
-            Patient.therapist_id == therapist_id, Patient.is_deleted == False
-        )
-
-        if filters:
-            if filters.identifier:
-                query = query.filter(
-                    Patient.identifier.ilike(f"%{filters.identifier}%")
-                )
+        keyset = keyset or cursor is not None
+        if include_total is None:
+            include_total = not keyset
+        criteria = _list_criteria(therapist_id, filters)
 
-            if filters.consent_given is not None:
-                query = query.filter(Patient.consent_given == filters.consent_given)
-
-            if filters.created_after:
-                query = query.filter(Patient.created_at >= filters.created_after)
-
-            if filters.created_before:
-                query = query.filter(Patient.created_at <= filters.created_before)
-
-        total = query.count()
-
-        total_pages = math.ceil(total / page_size) if total > 0 else 0
-        offset = (page - 1) * page_size
+        total = None
+        if include_total:
+            total = count_rows(
+                db,
+                select(Patient).where(*criteria),
+                count_strategy,
+                _count_key(therapist_id, filters),
+            )
 
-        patients = (
-            query.order_by(Patient.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
-            .all()
-        )
+        stmt = _page_statement(criteria, page, page_size, cursor, keyset, filters)
+        patients = list(db.scalars(stmt))
 
-        return PaginatedPatientResponse(
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages,
-            patients=[PatientResponse.model_validate(patient) for patient in patients],
-        )
+        return _paginated_response(total, page, page_size, patients, keyset)
 
     @staticmethod
     def create_patient(
@@ -84,8 +289,18 @@ class PatientService:
         db.add(new_patient)
         db.commit()
         db.refresh(new_patient)
+        count_cache.adjust(PATIENT_COUNT_SCOPE, therapist_id, +1)
         return PatientResponse.model_validate(new_patient)
 
+    @staticmethod
+    def import_batch(
+        therapist_id: uuid.UUID, rows: List[PatientCreate], db: Session
+    ) -> set:
+        inserted = set(db.scalars(_import_statement(therapist_id, rows)))
+        db.commit()
+        count_cache.adjust(PATIENT_COUNT_SCOPE, therapist_id, len(inserted))
+        return inserted
+
     @staticmethod
     def update_patient(
         therapist_id: uuid.UUID, patient_id: uuid.UUID, data: PatientUpdate, db: Session
@@ -97,11 +312,9 @@ class PatientService:
         )
         if not existing:
             raise HTTPException(status_code=404, detail="Patient not found")
-        if data.identifier:
-            existing.identifier = data.identifier
-        if data.date_of_birth:
-            existing.date_of_birth = data.date_of_birth
+        _apply_update(existing, data)
         db.commit()
+        count_cache.invalidate(PATIENT_COUNT_SCOPE, therapist_id, filtered_only=True)
         db.refresh(existing)
         return PatientResponse.model_validate(existing)
 
@@ -121,4 +334,166 @@ class PatientService:
         existing.deleted_at = datetime.now(timezone.utc)
         db.commit()
         db.refresh(existing)
+        count_cache.adjust(PATIENT_COUNT_SCOPE, therapist_id, -1)
+        return {"message": "Patient deleted successfully"}
+
+    @staticmethod
+    def batch_update_patients(
+        therapist_id: uuid.UUID,
+        ids: List[uuid.UUID],
+        data: PatientUpdate,
+        db: Session,
+    ) -> PatientBatchResult:
+        ids = _unique_ids(ids)
+        try:
+            updated = set(
+                db.scalars(_batch_update_statement(therapist_id, ids, data))
+            )
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise _identifier_conflict()
+        # Filtered totals may no longer match; the unfiltered one is unchanged.
+        count_cache.invalidate(PATIENT_COUNT_SCOPE, therapist_id, filtered_only=True)
+        return _batch_result(ids, updated, "updated")
+
+    @staticmethod
+    def batch_delete_patients(
+        therapist_id: uuid.UUID, ids: List[uuid.UUID], db: Session
+    ) -> PatientBatchResult:
+        ids = _unique_ids(ids)
+        deleted = set(db.scalars(_batch_delete_statement(therapist_id, ids)))
+        db.commit()
+        count_cache.adjust(PATIENT_COUNT_SCOPE, therapist_id, -len(deleted))
+        return _batch_result(ids, deleted, "deleted")
+
+
+class AsyncPatientService:
+    @staticmethod
+    async def get_patients(
+        therapist_id: uuid.UUID,
+        db: AsyncSession,
+        page: int = 1,
+        page_size: int = 10,
+        filters: Optional[PatientFilter] = None,
+        cursor: Optional[str] = None,
+        keyset: bool = False,
+        include_total: Optional[bool] = None,
+        count_strategy: CountStrategy = DEFAULT_COUNT_STRATEGY,
+    ) -> PaginatedPatientResponse:
+        keyset = keyset or cursor is not None
+        if include_total is None:
+            include_total = not keyset
+        criteria = _list_criteria(therapist_id, filters)
+
+        total = None
+        if include_total:
+            total = await count_rows_async(
+                db,
+                select(Patient).where(*criteria),
+                count_strategy,
+                _count_key(therapist_id, filters),
+            )
+
+        stmt = _page_statement(criteria, page, page_size, cursor, keyset, filters)
+        patients = list(await db.scalars(stmt))
+
+        return _paginated_response(total, page, page_size, patients, keyset)
+
+    @staticmethod
+    async def create_patient(
+        therapist_id: uuid.UUID, patient: PatientCreate, db: AsyncSession
+    ) -> PatientResponse:
+        existing = await db.scalar(
+            select(Patient).filter_by(
+                identifier=patient.identifier, therapist_id=therapist_id
+            )
+        )
+        if existing:
+            raise HTTPException(
+                status_code=400, detail="Patient with this identifier already exists"
+            )
+        new_patient = Patient(
+            identifier=patient.identifier,
+            date_of_birth=patient.date_of_birth,
+            therapist_id=therapist_id,
+        )
+        db.add(new_patient)
+        await db.commit()
+        await db.refresh(new_patient)
+        count_cache.adjust(PATIENT_COUNT_SCOPE, therapist_id, +1)
+        return PatientResponse.model_validate(new_patient)
+
+    @staticmethod
+    async def import_batch(
+        therapist_id: uuid.UUID, rows: List[PatientCreate], db: AsyncSession
+    ) -> set:
+        inserted = set(await db.scalars(_import_statement(therapist_id, rows)))
+        await db.commit()
+        count_cache.adjust(PATIENT_COUNT_SCOPE, therapist_id, len(inserted))
+        return inserted
+
+    @staticmethod
+    async def update_patient(
+        therapist_id: uuid.UUID,
+        patient_id: uuid.UUID,
+        data: PatientUpdate,
+        db: AsyncSession,
+    ) -> PatientResponse:
+        existing = await db.scalar(
+            select(Patient).filter_by(id=patient_id, therapist_id=therapist_id)
+        )
+        if not existing:
+            raise HTTPException(status_code=404, detail="Patient not found")
+        _apply_update(existing, data)
+        await db.commit()
+        count_cache.invalidate(PATIENT_COUNT_SCOPE, therapist_id, filtered_only=True)
+        await db.refresh(existing)
+        return PatientResponse.model_validate(existing)
+
+    @staticmethod
+    async def delete_patient(
+        therapist_id: uuid.UUID, patient_id: uuid.UUID, db: AsyncSession
+    ) -> dict:
+        existing = await db.scalar(
+            select(Patient).filter_by(
+                id=patient_id, therapist_id=therapist_id, is_deleted=False
+            )
+        )
+        if not existing:
+            raise HTTPException(status_code=404, detail="Patient not found")
+
+        existing.is_deleted = True
+        existing.deleted_at = datetime.now(timezone.utc)
+        await db.commit()
+        count_cache.adjust(PATIENT_COUNT_SCOPE, therapist_id, -1)
         return {"message": "Patient deleted successfully"}
+
+    @staticmethod
+    async def batch_update_patients(
+        therapist_id: uuid.UUID,
+        ids: List[uuid.UUID],
+        data: PatientUpdate,
+        db: AsyncSession,
+    ) -> PatientBatchResult:
+        ids = _unique_ids(ids)
+        try:
+            updated = set(
+                await db.scalars(_batch_update_statement(therapist_id, ids, data))
+            )
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise _identifier_conflict()
+        count_cache.invalidate(PATIENT_COUNT_SCOPE, therapist_id, filtered_only=True)
+        return _batch_result(ids, updated, "updated")
+
+    @staticmethod
+    async def batch_delete_patients(
+        therapist_id: uuid.UUID, ids: List[uuid.UUID], db: AsyncSession
+    ) -> PatientBatchResult:
+        ids = _unique_ids(ids)
+        deleted = set(await db.scalars(_batch_delete_statement(therapist_id, ids)))
+        await db.commit()
+        count_cache.adjust(PATIENT_COUNT_SCOPE, therapist_id, -len(deleted))
+        return _batch_result(ids, deleted, "deleted")
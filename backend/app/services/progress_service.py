@@ -0,0 +1,169 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import Select, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.patient import Patient
+from app.models.sessionRollup import SessionRollup
+from app.schemas.progress import ProgressResponse, RiskHistogram, WeeklyProgress
+
+# summary.risk_assessment.level as written by the summarizer, in either
+# language. Migration 6a1c8e3f2b95 repeats this mapping for the backfill.
+RISK_LEVELS = {
+    "low": ("low", "baixo", "baixa"),
+    "medium": ("medium", "moderate", "medio", "médio", "moderado", "moderada", "média"),
+    "high": ("high", "critical", "severe", "alto", "alta", "crítico", "grave"),
+}
+_RISK_BUCKETS = {
+    level: bucket for bucket, levels in RISK_LEVELS.items() for level in levels
+}
+_COUNTERS = (
+    "session_count",
+    "total_minutes",
+    "risk_low",
+    "risk_medium",
+    "risk_high",
+    "risk_unknown",
+)
+
+
+def risk_bucket(level: Optional[str]) -> str:
+    return _RISK_BUCKETS.get((level or "").strip().lower(), "unknown")
+
+
+def week_start(moment: datetime) -> date:
+    """Monday of the UTC week, matching date_trunc('week', ...) in SQL."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    day = moment.date()
+    return day - timedelta(days=day.weekday())
+
+
+def rollup_statement(row, sign: int):
+    """Adds (sign=1) or takes back (sign=-1) one completed session.
+
+    ``row`` carries therapist_id, patient_id, session_date,
+    session_duration_minutes and risk_level. Runs in the transaction of the
+    status change, so the rollups move exactly when the status does.
+    """
+    values = dict.fromkeys(_COUNTERS, 0)
+    values["session_count"] = sign
+    values["total_minutes"] = sign * row.session_duration_minutes
+    values[f"risk_{risk_bucket(row.risk_level)}"] = sign
+    stmt = pg_insert(SessionRollup).values(
+        therapist_id=row.therapist_id,
+        patient_id=row.patient_id,
+        week_start=week_start(row.session_date),
+        updated_at=datetime.now(timezone.utc),
+        **values,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            SessionRollup.therapist_id,
+            SessionRollup.patient_id,
+            SessionRollup.week_start,
+        ],
+        set_={
+            **{
+                name: getattr(SessionRollup, name) + getattr(stmt.excluded, name)
+                for name in _COUNTERS
+            },
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+
+
+def _since(weeks: int) -> date:
+    return week_start(datetime.now(timezone.utc)) - timedelta(weeks=weeks - 1)
+
+
+def _owned_patient_statement(therapist_id: uuid.UUID, patient_id: uuid.UUID) -> Select:
+    return select(Patient.id).where(
+        Patient.id == patient_id,
+        Patient.therapist_id == therapist_id,
+        Patient.is_deleted == False,
+    )
+
+
+def _progress_statement(
+    therapist_id: uuid.UUID, patient_id: Optional[uuid.UUID], since: date
+) -> Select:
+    criteria = [SessionRollup.therapist_id == therapist_id, SessionRollup.week_start >= since]
+    if patient_id is not None:
+        criteria.append(SessionRollup.patient_id == patient_id)
+    # One row per patient-week; a patient's view has a single row per week.
+    return (
+        select(
+            SessionRollup.week_start,
+            *(func.sum(getattr(SessionRollup, name)).label(name) for name in _COUNTERS),
+        )
+        .where(*criteria)
+        .group_by(SessionRollup.week_start)
+        .having(func.sum(SessionRollup.session_count) > 0)
+        .order_by(SessionRollup.week_start)
+    )
+
+
+def _progress_response(
+    rows: list, patient_id: Optional[uuid.UUID], since: date
+) -> ProgressResponse:
+    return ProgressResponse(
+        patient_id=patient_id,
+        since=since,
+        weeks=[
+            WeeklyProgress(
+                week_start=row.week_start,
+                session_count=row.session_count,
+                total_minutes=row.total_minutes,
+                risk_levels=RiskHistogram(
+                    low=row.risk_low,
+                    medium=row.risk_medium,
+                    high=row.risk_high,
+                    unknown=row.risk_unknown,
+                ),
+            )
+            for row in rows
+        ],
+    )
+
+
+class ProgressService:
+    @staticmethod
+    def get_progress(
+        therapist_id: uuid.UUID,
+        db: Session,
+        patient_id: Optional[uuid.UUID] = None,
+        weeks: int = 26,
+    ) -> ProgressResponse:
+        if (
+            patient_id is not None
+            and db.scalar(_owned_patient_statement(therapist_id, patient_id)) is None
+        ):
+            raise HTTPException(status_code=404, detail="Patient not found")
+        since = _since(weeks)
+        rows = db.execute(_progress_statement(therapist_id, patient_id, since)).all()
+        return _progress_response(rows, patient_id, since)
+
+
+class AsyncProgressService:
+    @staticmethod
+    async def get_progress(
+        therapist_id: uuid.UUID,
+        db: AsyncSession,
+        patient_id: Optional[uuid.UUID] = None,
+        weeks: int = 26,
+    ) -> ProgressResponse:
+        if (
+            patient_id is not None
+            and await db.scalar(_owned_patient_statement(therapist_id, patient_id))
+            is None
+        ):
+            raise HTTPException(status_code=404, detail="Patient not found")
+        since = _since(weeks)
+        rows = (
+            await db.execute(_progress_statement(therapist_id, patient_id, since))
+        ).all()
+        return _progress_response(rows, patient_id, since)
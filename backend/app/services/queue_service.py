@@ -0,0 +1,292 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+import anyio.from_thread
+
+logger = logging.getLogger(__name__)
+
+QUEUE_BACKEND = os.getenv("QUEUE_BACKEND", "inprocess")
+QUEUE_NAME = os.getenv("QUEUE_NAME", "theramind:processing")
+QUEUE_MAX_SIZE = int(os.getenv("QUEUE_MAX_SIZE", 10000))
+QUEUE_DEDUP_TTL_SECONDS = int(os.getenv("QUEUE_DEDUP_TTL_SECONDS", 86400))
+# A Redis consumer that has not polled for this long is presumed dead and
+# its in-flight jobs go back on the queue.
+QUEUE_CONSUMER_TTL_SECONDS = int(os.getenv("QUEUE_CONSUMER_TTL_SECONDS", 60))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class QueueFullError(Exception):
+    pass
+
+
+@dataclass
+class ProcessingJob:
+    job_id: str
+    session_id: uuid.UUID
+    therapist_id: uuid.UUID
+    attempt: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["session_id"] = str(self.session_id)
+        data["therapist_id"] = str(self.therapist_id)
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "ProcessingJob":
+        data = json.loads(raw)
+        data["session_id"] = uuid.UUID(data["session_id"])
+        data["therapist_id"] = uuid.UUID(data["therapist_id"])
+        return cls(**data)
+
+
+class QueueBackend(ABC):
+    @abstractmethod
+    async def enqueue(self, job: ProcessingJob) -> bool:
+        """Queue ``job``; returns False if its job_id was already enqueued."""
+
+    @abstractmethod
+    async def dequeue(self, timeout: Optional[float] = None) -> Optional[ProcessingJob]:
+        """Next job, waiting up to ``timeout`` seconds (forever when None,
+        not at all when 0)."""
+
+    @abstractmethod
+    async def ack(self, job: ProcessingJob) -> None:
+        """Mark ``job`` done; its job_id can be enqueued again afterwards."""
+
+    async def close(self) -> None:
+        pass
+
+    async def depth(self) -> int:
+        return 0
+
+
+class InProcessQueueBackend(QueueBackend):
+    """asyncio queue for single-process deployments and tests.
+
+    Jobs only survive as long as the process; the worker must run on the
+    same event loop (see app.worker).
+    """
+
+    def __init__(self, max_size: int, dedup_ttl_seconds: int):
+        self._queue: "asyncio.Queue[ProcessingJob] | None" = None
+        self._max_size = max_size
+        self._dedup_ttl_seconds = dedup_ttl_seconds
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+
+    @property
+    def queue(self) -> "asyncio.Queue[ProcessingJob]":
+        # Created lazily so it binds to the running loop, not the import-time one.
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_size)
+        return self._queue
+
+    def _expire_seen(self, now: float) -> None:
+        while self._seen:
+            job_id, expires_at = next(iter(self._seen.items()))
+            if expires_at > now and len(self._seen) <= self._max_size * 10:
+                break
+            self._seen.popitem(last=False)
+
+    async def enqueue(self, job: ProcessingJob) -> bool:
+        now = time.monotonic()
+        self._expire_seen(now)
+        if job.job_id in self._seen:
+            return False
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("Processing queue is full")
+        self._seen[job.job_id] = now + self._dedup_ttl_seconds
+        return True
+
+    async def dequeue(self, timeout: Optional[float] = None) -> Optional[ProcessingJob]:
+        if timeout is not None and timeout <= 0:
+            try:
+                return self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def ack(self, job: ProcessingJob) -> None:
+        self._seen.pop(job.job_id, None)
+        self.queue.task_done()
+
+    async def depth(self) -> int:
+        return self.queue.qsize()
+
+
+class RedisQueueBackend(QueueBackend):
+    """Reliable list queue on Redis (or any Redis-protocol server).
+
+    Enqueue is one round trip: a Lua script SETs the job_id guard with NX and
+    only LPUSHes when the guard was newly set. Dequeued jobs are moved with
+    BLMOVE to this consumer's own processing list, and ack removes them and
+    the guard. Each consumer keeps a heartbeat key alive while it polls. The
+    processing list of a consumer whose heartbeat ran out goes back on the
+    queue. A job recovered while still running is dropped by the worker's
+    claim.
+    """
+
+    _ENQUEUE_SCRIPT = """
+    if redis.call('SET', KEYS[1], '1', 'NX', 'EX', ARGV[2]) then
+        redis.call('LPUSH', KEYS[2], ARGV[1])
+        return 1
+    end
+    return 0
+    """
+    _RECOVER_SCRIPT = """
+    if redis.call('EXISTS', KEYS[2]) == 1 then
+        return 0
+    end
+    local moved = 0
+    while redis.call('LMOVE', KEYS[1], KEYS[3], 'RIGHT', 'RIGHT') do
+        moved = moved + 1
+    end
+    return moved
+    """
+
+    def __init__(
+        self,
+        url: str,
+        name: str,
+        dedup_ttl_seconds: int,
+        consumer_ttl_seconds: int = QUEUE_CONSUMER_TTL_SECONDS,
+    ):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "QUEUE_BACKEND=redis requires the 'redis' package"
+            ) from exc
+        self._redis = redis.from_url(url)
+        self._name = name
+        self._consumer = uuid.uuid4().hex
+        self._processing = f"{name}:processing:{self._consumer}"
+        self._dedup_ttl_seconds = dedup_ttl_seconds
+        self._consumer_ttl_seconds = consumer_ttl_seconds
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._enqueue_script = self._redis.register_script(self._ENQUEUE_SCRIPT)
+        self._recover_script = self._redis.register_script(self._RECOVER_SCRIPT)
+
+    def _heartbeat_key(self, processing: str) -> str:
+        # Lists from before per-consumer lists ("{name}:processing") map to
+        # a heartbeat nobody sets, so they are always recovered.
+        consumer = processing[len(f"{self._name}:processing:"):]
+        return f"{self._name}:consumer:{consumer}"
+
+    async def _beat(self) -> None:
+        await self._redis.set(
+            self._heartbeat_key(self._processing), "1", ex=self._consumer_ttl_seconds
+        )
+
+    async def _heartbeat(self) -> None:
+        # Runs from the first dequeue on, so a consumer whose slots are all
+        # busy on long jobs still counts as alive.
+        while True:
+            try:
+                await self._beat()
+                await self.recover()
+            except Exception:
+                logger.exception("Queue heartbeat failed")
+            await asyncio.sleep(self._consumer_ttl_seconds / 3)
+
+    async def recover(self) -> int:
+        """Requeue the in-flight jobs of consumers whose heartbeat ran out."""
+        recovered = 0
+        async for key in self._redis.scan_iter(match=f"{self._name}:processing*"):
+            processing = key.decode() if isinstance(key, bytes) else key
+            recovered += await self._recover_script(
+                keys=[processing, self._heartbeat_key(processing), self._name]
+            )
+        return recovered
+
+    async def enqueue(self, job: ProcessingJob) -> bool:
+        created = await self._enqueue_script(
+            keys=[f"{self._name}:job:{job.job_id}", self._name],
+            args=[job.to_json(), self._dedup_ttl_seconds],
+        )
+        return bool(created)
+
+    async def dequeue(self, timeout: Optional[float] = None) -> Optional[ProcessingJob]:
+        if self._heartbeat_task is None:
+            # Alive before the first job lands in the processing list.
+            await self._beat()
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        if timeout is not None and timeout <= 0:
+            # BLMOVE reads a timeout of 0 as "block forever".
+            raw = await self._redis.lmove(self._name, self._processing, "RIGHT", "LEFT")
+        else:
+            raw = await self._redis.blmove(
+                self._name, self._processing, timeout or 0, "RIGHT", "LEFT"
+            )
+        if raw is None:
+            return None
+        job = ProcessingJob.from_json(raw)
+        job._raw = raw  # type: ignore[attr-defined]
+        return job
+
+    async def ack(self, job: ProcessingJob) -> None:
+        raw = getattr(job, "_raw", None) or job.to_json()
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self._processing, 1, raw)
+            pipe.delete(f"{self._name}:job:{job.job_id}")
+            await pipe.execute()
+
+    async def depth(self) -> int:
+        return await self._redis.llen(self._name)
+
+    async def close(self) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+        await self._redis.aclose()
+
+
+def _build_queue() -> QueueBackend:
+    if QUEUE_BACKEND == "inprocess":
+        return InProcessQueueBackend(QUEUE_MAX_SIZE, QUEUE_DEDUP_TTL_SECONDS)
+    if QUEUE_BACKEND == "redis":
+        return RedisQueueBackend(REDIS_URL, QUEUE_NAME, QUEUE_DEDUP_TTL_SECONDS)
+    raise ValueError(f"Unknown QUEUE_BACKEND: {QUEUE_BACKEND}")
+
+
+_queue: Optional[QueueBackend] = None
+
+
+def get_queue() -> QueueBackend:
+    global _queue
+    if _queue is None:
+        _queue = _build_queue()
+    return _queue
+
+
+class QueueService:
+    @staticmethod
+    async def enqueue(job: ProcessingJob) -> bool:
+        return await get_queue().enqueue(job)
+
+    @staticmethod
+    def enqueue_from_thread(job: ProcessingJob) -> bool:
+        # Sync routes run on anyio worker threads; hop back to the event loop
+        # that owns the queue instead of blocking on a second loop.
+        return anyio.from_thread.run(QueueService.enqueue, job)
+
+    @staticmethod
+    async def close() -> None:
+        global _queue
+        if _queue is not None:
+            await _queue.close()
+            _queue = None
@@ -0,0 +1,746 @@
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+import anyio.from_thread
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
+from sqlalchemy import Select, Update, cast, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
+import uuid
+from app.core.pagination import decode_datetime_id_cursor, encode_cursor
+from app.models.patient import Patient
+from app.models.session import Session as SessionModel, pack_payload
+from app.schemas.session import (
+    PaginatedSessionResponse,
+    SessionCreate,
+    SessionDetailResponse,
+    SessionEnqueueResponse,
+    SessionFilter,
+    SessionListItem,
+    SessionResponse,
+    SessionSearchResponse,
+    SessionSearchResult,
+    SessionStatusResponse,
+)
+from app.services.notification_service import status_broker, status_event
+from app.services.progress_service import rollup_statement
+from app.services.queue_service import ProcessingJob, QueueFullError, QueueService
+from app.services.storage_service import get_storage
+from app.services.summary_cache import CachedResult, get_summary_cache
+from app.worker.anonymizer import anonymize
+
+logger = logging.getLogger(__name__)
+
+# Allowed processing_status moves; anything else is rejected by the UPDATE's
+# WHERE clause. completed/failed -> queued is a reprocess; queued ->
+# completed is a summary cache hit.
+PROCESSING_TRANSITIONS = {
+    "pending": {"queued"},
+    "queued": {"processing", "failed", "completed"},
+    "processing": {"completed", "failed"},
+    "failed": {"queued"},
+    "completed": {"queued"},
+}
+
+
+# Columns the session list reads; summary and the full audio_metadata stay
+# in the heap (and TOAST) unless a caller asks for them.
+_LIST_COLUMNS = (
+    SessionModel.id,
+    SessionModel.patient_id,
+    SessionModel.session_date,
+    SessionModel.session_duration_minutes,
+    SessionModel.processing_status,
+    SessionModel.version,
+    SessionModel.created_at,
+    SessionModel.processing_completed_at,
+    SessionModel.audio_metadata["format"].as_string().label("audio_format"),
+    SessionModel.audio_metadata["duration_seconds"]
+    .as_float()
+    .label("audio_duration_seconds"),
+)
+MAX_SUMMARY_KEYS = 10
+# Summaries are indexed in the transcript's language (Portuguese unless it
+# was English), so the query is stemmed both ways and either may match.
+SEARCH_CONFIGS = ("portuguese", "english")
+HEADLINE_OPTIONS = "MaxFragments=2, MinWords=5, MaxWords=20, FragmentDelimiter=\" ... \""
+
+
+class SessionVersionConflict(HTTPException):
+    def __init__(self, detail: str = "Session was modified concurrently, reload and retry"):
+        super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+def _owned_session_statement(therapist_id: uuid.UUID, session_id: uuid.UUID) -> Select:
+    # The callers write audio_metadata back, packed keys included.
+    return (
+        select(SessionModel)
+        .options(undefer(SessionModel.audio_metadata_packed))
+        .where(
+            SessionModel.id == session_id,
+            SessionModel.therapist_id == therapist_id,
+            SessionModel.is_deleted == False,
+        )
+    )
+
+
+def _list_statement(
+    therapist_id: uuid.UUID,
+    filters: SessionFilter,
+    summary_keys: List[str],
+    page_size: int,
+    cursor: Optional[str],
+) -> Select:
+    if len(summary_keys) > MAX_SUMMARY_KEYS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_SUMMARY_KEYS} summary_keys"
+        )
+    # Only the requested keys are pulled out of summary, server side.
+    projected = [
+        SessionModel.summary[key].label(f"summary_{index}")
+        for index, key in enumerate(summary_keys)
+    ]
+    stmt = select(*_LIST_COLUMNS, *projected).where(
+        SessionModel.therapist_id == therapist_id,
+        SessionModel.is_deleted == False,
+    )
+    if filters.patient_id is not None:
+        stmt = stmt.where(SessionModel.patient_id == filters.patient_id)
+    if filters.processing_status is not None:
+        stmt = stmt.where(SessionModel.processing_status == filters.processing_status)
+    if filters.session_after is not None:
+        stmt = stmt.where(SessionModel.session_date >= filters.session_after)
+    if filters.session_before is not None:
+        stmt = stmt.where(SessionModel.session_date < filters.session_before)
+    if cursor:
+        session_date, row_id = decode_datetime_id_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(SessionModel.session_date, SessionModel.id)
+            < tuple_(session_date, row_id)
+        )
+    return stmt.order_by(
+        SessionModel.session_date.desc(), SessionModel.id.desc()
+    ).limit(page_size + 1)
+
+
+def _paginated_response(
+    rows: list, summary_keys: List[str], page_size: int
+) -> PaginatedSessionResponse:
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1].session_date, rows[-1].id)
+    sessions = []
+    for row in rows:
+        item = SessionListItem.model_validate(row)
+        if summary_keys:
+            item.summary = {
+                key: getattr(row, f"summary_{index}")
+                for index, key in enumerate(summary_keys)
+            }
+        sessions.append(item)
+    return PaginatedSessionResponse(
+        page_size=page_size, next_cursor=next_cursor, sessions=sessions
+    )
+
+
+def _detail_statement(
+    therapist_id: uuid.UUID, session_id: uuid.UUID, include: List[str]
+) -> Select:
+    stmt = _owned_session_statement(therapist_id, session_id)
+    if "summary" in include:
+        stmt = stmt.options(
+            undefer(SessionModel.summary), undefer(SessionModel.summary_packed)
+        )
+    return stmt
+
+
+def _detail_response(session: SessionModel, include: List[str]) -> SessionDetailResponse:
+    # Never touches summary unless it was undeferred: in async mode a lazy
+    # load here would fail.
+    return SessionDetailResponse(
+        **SessionResponse.model_validate(session).model_dump(),
+        audio_metadata=session.audio_metadata if "audio_metadata" in include else None,
+        summary=session.summary if "summary" in include else None,
+    )
+
+
+def _search_statement(
+    therapist_id: uuid.UUID, query: str, patient_id: Optional[uuid.UUID], limit: int
+) -> Select:
+    tsquery = func.websearch_to_tsquery(cast(literal(SEARCH_CONFIGS[0]), REGCONFIG), query)
+    for config in SEARCH_CONFIGS[1:]:
+        tsquery = tsquery.op("||")(
+            func.websearch_to_tsquery(cast(literal(config), REGCONFIG), query)
+        )
+    rank = func.ts_rank_cd(SessionModel.search_vector, tsquery)
+    top = (
+        select(SessionModel.id, rank.label("rank"))
+        .where(
+            SessionModel.therapist_id == therapist_id,
+            SessionModel.is_deleted == False,
+            SessionModel.search_vector.op("@@")(tsquery),
+        )
+        .order_by(rank.desc(), SessionModel.session_date.desc())
+        .limit(limit)
+    )
+    if patient_id is not None:
+        top = top.where(SessionModel.patient_id == patient_id)
+    top = top.subquery()
+    # ts_headline re-parses the document, so it only runs on the top rows.
+    headline = func.ts_headline(
+        func.session_search_config(SessionModel.audio_metadata),
+        func.session_summary_text(SessionModel.summary),
+        tsquery,
+        HEADLINE_OPTIONS,
+    )
+    return (
+        select(
+            SessionModel.id,
+            SessionModel.patient_id,
+            SessionModel.session_date,
+            top.c.rank,
+            headline.label("headline"),
+        )
+        .join(top, top.c.id == SessionModel.id)
+        .order_by(top.c.rank.desc(), SessionModel.session_date.desc())
+    )
+
+
+def _owned_patient_statement(therapist_id: uuid.UUID, patient_id: uuid.UUID) -> Select:
+    return select(Patient.id).where(
+        Patient.id == patient_id,
+        Patient.therapist_id == therapist_id,
+        Patient.is_deleted == False,
+    )
+
+
+def _new_session(therapist_id: uuid.UUID, data: SessionCreate) -> SessionModel:
+    # Pending until an upload completes; SessionCreate already rejected
+    # the keys only the server may set.
+    audio_metadata = dict(data.audio_metadata or {})
+    return SessionModel(
+        therapist_id=therapist_id,
+        patient_id=data.patient_id,
+        session_date=data.session_date,
+        session_duration_minutes=data.session_duration_minutes,
+        processing_status="pending",
+        job_id=str(uuid.uuid4()),
+        **pack_payload({"audio_metadata": audio_metadata, "summary": {}}),
+    )
+
+
+def processing_job(session: SessionModel) -> ProcessingJob:
+    return ProcessingJob(
+        job_id=session.job_id,
+        session_id=session.id,
+        therapist_id=session.therapist_id,
+    )
+
+
+def _rollup_sign(new_status: str, from_status: Optional[str]) -> int:
+    # A completion counts in the progress rollups; a reprocess takes it back.
+    if new_status == "completed":
+        return 1
+    if from_status == "completed":
+        return -1
+    return 0
+
+
+def _transition_statement(
+    session_id: uuid.UUID,
+    expected_version: int,
+    new_status: str,
+    values: dict,
+    from_status: Optional[str] = None,
+) -> Update:
+    sources = [
+        source
+        for source, targets in PROCESSING_TRANSITIONS.items()
+        if new_status in targets
+        # Leaving completed must be named, so the rollups are taken back.
+        and (
+            from_status == source
+            or (from_status is None and source != "completed")
+        )
+    ]
+    if not sources:
+        raise ValueError(f"Unknown processing status: {new_status}")
+    now = datetime.now(timezone.utc)
+    if new_status == "queued":
+        values.setdefault("processing_started_at", None)
+        values.setdefault("processing_completed_at", None)
+    elif new_status == "processing":
+        values.setdefault("processing_started_at", now)
+    else:
+        values.setdefault("processing_completed_at", now)
+    returning = [SessionModel.version, SessionModel.therapist_id]
+    if _rollup_sign(new_status, from_status):
+        returning += [
+            SessionModel.patient_id,
+            SessionModel.session_date,
+            SessionModel.session_duration_minutes,
+            SessionModel.summary[("risk_assessment", "level")]
+            .as_string()
+            .label("risk_level"),
+        ]
+    return (
+        update(SessionModel)
+        .where(
+            SessionModel.id == session_id,
+            SessionModel.version == expected_version,
+            SessionModel.processing_status.in_(sources),
+        )
+        .values(
+            processing_status=new_status,
+            version=SessionModel.version + 1,
+            updated_at=now,
+            **pack_payload(values),
+        )
+        .returning(*returning)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _metadata_statement(
+    session_id: uuid.UUID, expected_version: int, audio_metadata: dict
+) -> Update:
+    return (
+        update(SessionModel)
+        .where(SessionModel.id == session_id, SessionModel.version == expected_version)
+        .values(
+            **pack_payload({"audio_metadata": audio_metadata}),
+            version=SessionModel.version + 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(SessionModel.version)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _session_or_404(session: Optional[SessionModel]) -> SessionModel:
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
+def _requeue_values(session: SessionModel) -> dict:
+    # A reprocess gets a fresh job_id, otherwise queue dedup would drop it.
+    if session.processing_status in ("failed", "completed"):
+        return {"job_id": str(uuid.uuid4())}
+    return {}
+
+
+def _ensure_enqueueable(session: Optional[SessionModel]) -> SessionModel:
+    session = _session_or_404(session)
+    if session.processing_status == "processing":
+        raise HTTPException(status_code=409, detail="Session is already processing")
+    if not (session.audio_metadata or {}).get("storage_key"):
+        raise HTTPException(status_code=409, detail="Session has no uploaded audio")
+    return session
+
+
+def _patient_identifier_statement(patient_id: uuid.UUID) -> Select:
+    return select(Patient.identifier).where(Patient.id == patient_id)
+
+
+def _cache_hit_values(
+    cached: CachedResult, patient_identifier: Optional[str], audio_metadata: dict
+) -> dict:
+    return {
+        "summary": anonymize(cached.summary, [patient_identifier]),
+        "audio_metadata": {
+            **audio_metadata,
+            "transcript_language": cached.language,
+            "summary_cache": "hit",
+        },
+    }
+
+
+async def discard_audio(audio_metadata: dict) -> None:
+    """Drop the audio of a session served from the cache, as the worker
+    does once it has a summary."""
+    storage_key = audio_metadata.get("storage_key")
+    if not storage_key:
+        return
+    try:
+        await get_storage().delete(storage_key)
+    except Exception as exc:
+        logger.error("Could not delete audio %s: %r", storage_key, exc)
+
+
+def _queue_full(session_id: uuid.UUID) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Processing queue is full; session {session_id} is saved as queued, "
+        "retry its enqueue",
+        headers={"Retry-After": "5"},
+    )
+
+
+class SessionService:
+    @staticmethod
+    def create_session(
+        therapist_id: uuid.UUID, data: SessionCreate, db: Session
+    ) -> SessionResponse:
+        if db.scalar(_owned_patient_statement(therapist_id, data.patient_id)) is None:
+            raise HTTPException(status_code=404, detail="Patient not found")
+
+        session = _new_session(therapist_id, data)
+        db.add(session)
+        db.commit()
+        db.refresh(session)
+        return SessionResponse.model_validate(session)
+
+    @staticmethod
+    def transition_status(
+        db: Session,
+        session_id: uuid.UUID,
+        expected_version: int,
+        new_status: str,
+        from_status: Optional[str] = None,
+        **values,
+    ) -> int:
+        row = db.execute(
+            _transition_statement(
+                session_id, expected_version, new_status, values, from_status
+            )
+        ).first()
+        if row is None:
+            db.rollback()
+            raise SessionVersionConflict()
+        sign = _rollup_sign(new_status, from_status)
+        if sign:
+            db.execute(rollup_statement(row, sign))
+        event = status_event(session_id, row.therapist_id, new_status, row.version)
+        if status_broker.uses_database:
+            db.execute(status_broker.notify_statement(event))
+        db.commit()
+        status_broker.publish_local(event)
+        return row.version
+
+    @staticmethod
+    def complete_from_cache(
+        db: Session,
+        session_id: uuid.UUID,
+        expected_version: int,
+        patient_id: uuid.UUID,
+        audio_metadata: dict,
+        cached: CachedResult,
+    ) -> int:
+        identifier = db.scalar(_patient_identifier_statement(patient_id))
+        return SessionService.transition_status(
+            db,
+            session_id,
+            expected_version,
+            "completed",
+            **_cache_hit_values(cached, identifier, audio_metadata),
+        )
+
+    @staticmethod
+    def serve_from_cache(
+        therapist_id: uuid.UUID, session: SessionModel, db: Session
+    ) -> bool:
+        """Completes a queued session from the summary cache instead of
+        queueing it; False on a miss."""
+        audio_metadata = dict(session.audio_metadata or {})
+        cached = get_summary_cache().get_from_thread(
+            therapist_id, audio_metadata.get("sha256")
+        )
+        if cached is None:
+            return False
+        SessionService.complete_from_cache(
+            db, session.id, session.version, session.patient_id, audio_metadata, cached
+        )
+        anyio.from_thread.run(discard_audio, audio_metadata)
+        db.refresh(session)
+        return True
+
+    @staticmethod
+    def get_owned_session(
+        therapist_id: uuid.UUID, session_id: uuid.UUID, db: Session
+    ) -> SessionModel:
+        return _session_or_404(
+            db.scalar(_owned_session_statement(therapist_id, session_id))
+        )
+
+    @staticmethod
+    def update_audio_metadata(
+        db: Session, session_id: uuid.UUID, expected_version: int, audio_metadata: dict
+    ) -> int:
+        new_version = db.scalar(
+            _metadata_statement(session_id, expected_version, audio_metadata)
+        )
+        if new_version is None:
+            db.rollback()
+            raise SessionVersionConflict()
+        db.commit()
+        return new_version
+
+    @staticmethod
+    def enqueue_session(
+        therapist_id: uuid.UUID, session_id: uuid.UUID, db: Session
+    ) -> SessionEnqueueResponse:
+        session = _ensure_enqueueable(
+            db.scalar(_owned_session_statement(therapist_id, session_id))
+        )
+        if session.processing_status != "queued":
+            SessionService.transition_status(
+                db,
+                session.id,
+                session.version,
+                "queued",
+                from_status=session.processing_status,
+                **_requeue_values(session),
+            )
+            db.refresh(session)
+
+        if SessionService.serve_from_cache(therapist_id, session, db):
+            return SessionEnqueueResponse(
+                session=SessionStatusResponse.model_validate(session),
+                enqueued=False,
+                from_cache=True,
+            )
+        try:
+            enqueued = QueueService.enqueue_from_thread(processing_job(session))
+        except QueueFullError:
+            raise _queue_full(session.id)
+        return SessionEnqueueResponse(
+            session=SessionStatusResponse.model_validate(session), enqueued=enqueued
+        )
+
+    @staticmethod
+    def get_status(
+        therapist_id: uuid.UUID, session_id: uuid.UUID, db: Session
+    ) -> SessionStatusResponse:
+        session = SessionService.get_owned_session(therapist_id, session_id, db)
+        return SessionStatusResponse.model_validate(session)
+
+    @staticmethod
+    def list_sessions(
+        therapist_id: uuid.UUID,
+        filters: SessionFilter,
+        db: Session,
+        summary_keys: Optional[List[str]] = None,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+    ) -> PaginatedSessionResponse:
+        summary_keys = summary_keys or []
+        rows = db.execute(
+            _list_statement(therapist_id, filters, summary_keys, page_size, cursor)
+        ).all()
+        return _paginated_response(rows, summary_keys, page_size)
+
+    @staticmethod
+    def get_session(
+        therapist_id: uuid.UUID, session_id: uuid.UUID, include: List[str], db: Session
+    ) -> SessionDetailResponse:
+        session = _session_or_404(
+            db.scalar(_detail_statement(therapist_id, session_id, include))
+        )
+        return _detail_response(session, include)
+
+    @staticmethod
+    def search_sessions(
+        therapist_id: uuid.UUID,
+        query: str,
+        db: Session,
+        patient_id: Optional[uuid.UUID] = None,
+        limit: int = 20,
+    ) -> SessionSearchResponse:
+        rows = db.execute(_search_statement(therapist_id, query, patient_id, limit)).all()
+        return SessionSearchResponse(
+            query=query,
+            results=[SessionSearchResult.model_validate(row) for row in rows],
+        )
+
+
+class AsyncSessionService:
+    @staticmethod
+    async def create_session(
+        therapist_id: uuid.UUID, data: SessionCreate, db: AsyncSession
+    ) -> SessionResponse:
+        if (
+            await db.scalar(_owned_patient_statement(therapist_id, data.patient_id))
+            is None
+        ):
+            raise HTTPException(status_code=404, detail="Patient not found")
+
+        session = _new_session(therapist_id, data)
+        db.add(session)
+        await db.commit()
+        await db.refresh(session)
+        return SessionResponse.model_validate(session)
+
+    @staticmethod
+    async def transition_status(
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        expected_version: int,
+        new_status: str,
+        from_status: Optional[str] = None,
+        **values,
+    ) -> int:
+        row = (
+            await db.execute(
+                _transition_statement(
+                    session_id, expected_version, new_status, values, from_status
+                )
+            )
+        ).first()
+        if row is None:
+            await db.rollback()
+            raise SessionVersionConflict()
+        sign = _rollup_sign(new_status, from_status)
+        if sign:
+            await db.execute(rollup_statement(row, sign))
+        event = status_event(session_id, row.therapist_id, new_status, row.version)
+        if status_broker.uses_database:
+            await db.execute(status_broker.notify_statement(event))
+        await db.commit()
+        status_broker.publish_local(event)
+        return row.version
+
+    @staticmethod
+    async def complete_from_cache(
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        expected_version: int,
+        patient_id: uuid.UUID,
+        audio_metadata: dict,
+        cached: CachedResult,
+    ) -> int:
+        identifier = await db.scalar(_patient_identifier_statement(patient_id))
+        return await AsyncSessionService.transition_status(
+            db,
+            session_id,
+            expected_version,
+            "completed",
+            **_cache_hit_values(cached, identifier, audio_metadata),
+        )
+
+    @staticmethod
+    async def serve_from_cache(
+        therapist_id: uuid.UUID, session: SessionModel, db: AsyncSession
+    ) -> bool:
+        audio_metadata = dict(session.audio_metadata or {})
+        cached = await get_summary_cache().get(therapist_id, audio_metadata.get("sha256"))
+        if cached is None:
+            return False
+        await AsyncSessionService.complete_from_cache(
+            db, session.id, session.version, session.patient_id, audio_metadata, cached
+        )
+        await discard_audio(audio_metadata)
+        await db.refresh(session)
+        return True
+
+    @staticmethod
+    async def get_owned_session(
+        therapist_id: uuid.UUID, session_id: uuid.UUID, db: AsyncSession
+    ) -> SessionModel:
+        return _session_or_404(
+            await db.scalar(_owned_session_statement(therapist_id, session_id))
+        )
+
+    @staticmethod
+    async def update_audio_metadata(
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        expected_version: int,
+        audio_metadata: dict,
+    ) -> int:
+        new_version = await db.scalar(
+            _metadata_statement(session_id, expected_version, audio_metadata)
+        )
+        if new_version is None:
+            await db.rollback()
+            raise SessionVersionConflict()
+        await db.commit()
+        return new_version
+
+    @staticmethod
+    async def enqueue_session(
+        therapist_id: uuid.UUID, session_id: uuid.UUID, db: AsyncSession
+    ) -> SessionEnqueueResponse:
+        session = _ensure_enqueueable(
+            await db.scalar(_owned_session_statement(therapist_id, session_id))
+        )
+        if session.processing_status != "queued":
+            await AsyncSessionService.transition_status(
+                db,
+                session.id,
+                session.version,
+                "queued",
+                from_status=session.processing_status,
+                **_requeue_values(session),
+            )
+            await db.refresh(session)
+
+        if await AsyncSessionService.serve_from_cache(therapist_id, session, db):
+            return SessionEnqueueResponse(
+                session=SessionStatusResponse.model_validate(session),
+                enqueued=False,
+                from_cache=True,
+            )
+        try:
+            enqueued = await QueueService.enqueue(processing_job(session))
+        except QueueFullError:
+            raise _queue_full(session.id)
+        return SessionEnqueueResponse(
+            session=SessionStatusResponse.model_validate(session), enqueued=enqueued
+        )
+
+    @staticmethod
+    async def get_status(
+        therapist_id: uuid.UUID, session_id: uuid.UUID, db: AsyncSession
+    ) -> SessionStatusResponse:
+        session = await AsyncSessionService.get_owned_session(
+            therapist_id, session_id, db
+        )
+        return SessionStatusResponse.model_validate(session)
+
+    @staticmethod
+    async def list_sessions(
+        therapist_id: uuid.UUID,
+        filters: SessionFilter,
+        db: AsyncSession,
+        summary_keys: Optional[List[str]] = None,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+    ) -> PaginatedSessionResponse:
+        summary_keys = summary_keys or []
+        rows = (
+            await db.execute(
+                _list_statement(therapist_id, filters, summary_keys, page_size, cursor)
+            )
+        ).all()
+        return _paginated_response(rows, summary_keys, page_size)
+
+    @staticmethod
+    async def get_session(
+        therapist_id: uuid.UUID,
+        session_id: uuid.UUID,
+        include: List[str],
+        db: AsyncSession,
+    ) -> SessionDetailResponse:
+        session = _session_or_404(
+            await db.scalar(_detail_statement(therapist_id, session_id, include))
+        )
+        return _detail_response(session, include)
+
+    @staticmethod
+    async def search_sessions(
+        therapist_id: uuid.UUID,
+        query: str,
+        db: AsyncSession,
+        patient_id: Optional[uuid.UUID] = None,
+        limit: int = 20,
+    ) -> SessionSearchResponse:
+        rows = (
+            await db.execute(_search_statement(therapist_id, query, patient_id, limit))
+        ).all()
+        return SessionSearchResponse(
+            query=query,
+            results=[SessionSearchResult.model_validate(row) for row in rows],
+        )
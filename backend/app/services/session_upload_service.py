@@ -0,0 +1,480 @@
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.requests import ClientDisconnect
+
+from app.models.session import Session as SessionModel
+from app.schemas.session import (
+    SessionStatusResponse,
+    SessionUploadComplete,
+    SessionUploadInit,
+    SessionUploadResult,
+    SessionUploadStatus,
+)
+from app.services.audio_service import (
+    AUDIO_PROBE_BYTES,
+    finalize_audio_metadata,
+    probe_audio,
+)
+from app.services.queue_service import QueueFullError, QueueService
+from app.services.session_service import (
+    AsyncSessionService,
+    SessionService,
+    _queue_full,
+    discard_audio,
+    processing_job,
+)
+from app.services.storage_service import PartialWrite, get_storage
+from app.services.summary_cache import CachedResult, get_summary_cache
+
+MAX_AUDIO_SIZE_MB = int(os.getenv("MAX_AUDIO_SIZE_MB", 100))
+MAX_AUDIO_DURATION_MINUTES = int(os.getenv("MAX_AUDIO_DURATION_MINUTES", 60))
+ENABLE_AUDIO_VALIDATION = os.getenv("ENABLE_AUDIO_VALIDATION", "true").lower() == "true"
+# S3 multipart parts must be at least 5 MB (except the last one).
+UPLOAD_CHUNK_SIZE_BYTES = max(
+    int(os.getenv("UPLOAD_CHUNK_SIZE_BYTES", 8 * 1024 * 1024)), 5 * 1024 * 1024
+)
+ACCEPTED_AUDIO_FORMATS = {"wav", "mp3", "m4a", "ogg", "webm", "flac"}
+_HASHER_CACHE_SIZE = 1000
+
+
+class _HasherCache:
+    """Running SHA-256 per upload, so chunks are hashed as they stream in.
+
+    Keyed by upload_id and offset: a resume that lands on another process (or
+    after eviction) misses and the caller rehashes what is already stored.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[int, object]]" = OrderedDict()
+
+    def get(self, upload_id: str, offset: int):
+        entry = self._entries.get(upload_id)
+        if entry is None or entry[0] != offset:
+            return None
+        return entry[1].copy()
+
+    def set(self, upload_id: str, offset: int, hasher) -> None:
+        self._entries[upload_id] = (offset, hasher)
+        self._entries.move_to_end(upload_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, upload_id: str) -> None:
+        self._entries.pop(upload_id, None)
+
+
+_hashers = _HasherCache(_HASHER_CACHE_SIZE)
+
+
+class SyncSessionStore:
+    """Runs the sync session queries on the threadpool for the async upload flow."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def get(self, therapist_id: uuid.UUID, session_id: uuid.UUID) -> SessionModel:
+        return await run_in_threadpool(
+            SessionService.get_owned_session, therapist_id, session_id, self.db
+        )
+
+    async def save_metadata(
+        self, session_id: uuid.UUID, version: int, audio_metadata: dict
+    ) -> int:
+        return await run_in_threadpool(
+            SessionService.update_audio_metadata,
+            self.db,
+            session_id,
+            version,
+            audio_metadata,
+        )
+
+    async def mark_queued(
+        self, session_id: uuid.UUID, version: int, audio_metadata: dict
+    ) -> int:
+        return await run_in_threadpool(
+            SessionService.transition_status,
+            self.db,
+            session_id,
+            version,
+            "queued",
+            audio_metadata=audio_metadata,
+        )
+
+    async def complete_from_cache(
+        self,
+        session_id: uuid.UUID,
+        version: int,
+        patient_id: uuid.UUID,
+        audio_metadata: dict,
+        cached: CachedResult,
+    ) -> int:
+        return await run_in_threadpool(
+            SessionService.complete_from_cache,
+            self.db,
+            session_id,
+            version,
+            patient_id,
+            audio_metadata,
+            cached,
+        )
+
+
+class AsyncSessionStore:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, therapist_id: uuid.UUID, session_id: uuid.UUID) -> SessionModel:
+        return await AsyncSessionService.get_owned_session(
+            therapist_id, session_id, self.db
+        )
+
+    async def save_metadata(
+        self, session_id: uuid.UUID, version: int, audio_metadata: dict
+    ) -> int:
+        return await AsyncSessionService.update_audio_metadata(
+            self.db, session_id, version, audio_metadata
+        )
+
+    async def mark_queued(
+        self, session_id: uuid.UUID, version: int, audio_metadata: dict
+    ) -> int:
+        return await AsyncSessionService.transition_status(
+            self.db, session_id, version, "queued", audio_metadata=audio_metadata
+        )
+
+    async def complete_from_cache(
+        self,
+        session_id: uuid.UUID,
+        version: int,
+        patient_id: uuid.UUID,
+        audio_metadata: dict,
+        cached: CachedResult,
+    ) -> int:
+        return await AsyncSessionService.complete_from_cache(
+            self.db, session_id, version, patient_id, audio_metadata, cached
+        )
+
+
+def _max_size_bytes() -> int:
+    return MAX_AUDIO_SIZE_MB * 1024 * 1024
+
+
+def _ensure_pending(session: SessionModel) -> None:
+    if session.processing_status != "pending":
+        raise HTTPException(
+            status_code=409, detail="Audio can only be uploaded to a pending session"
+        )
+
+
+def _current_upload(session: SessionModel) -> dict:
+    upload = (session.audio_metadata or {}).get("upload")
+    if not upload:
+        raise HTTPException(status_code=404, detail="No upload in progress")
+    return upload
+
+
+def _status(session_id: uuid.UUID, upload: dict) -> SessionUploadStatus:
+    return SessionUploadStatus(
+        session_id=session_id,
+        upload_id=upload["upload_id"],
+        offset=upload["offset"],
+        size_bytes=upload["size_bytes"],
+        chunk_size=upload["chunk_size"],
+        complete=upload["offset"] == upload["size_bytes"],
+    )
+
+
+def _without_upload(audio_metadata: dict) -> dict:
+    return {key: value for key, value in audio_metadata.items() if key != "upload"}
+
+
+async def _hash_stored(key: str, limit: Optional[int] = None):
+    hasher = hashlib.sha256()
+    async for block in get_storage().iter_bytes(key, limit):
+        hasher.update(block)
+    return hasher
+
+
+async def _read_head(key: str) -> bytes:
+    head = bytearray()
+    async for block in get_storage().iter_bytes(key, AUDIO_PROBE_BYTES):
+        head += block
+    return bytes(head)
+
+
+async def _tee(
+    chunks: AsyncIterator[bytes], limit: int, hasher, head: Optional[bytearray]
+):
+    received = 0
+    async for piece in chunks:
+        received += len(piece)
+        if received > limit:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Chunk runs past the declared upload size",
+            )
+        if hasher is not None:
+            hasher.update(piece)
+        if head is not None and len(head) < AUDIO_PROBE_BYTES:
+            head += piece[: AUDIO_PROBE_BYTES - len(head)]
+        yield piece
+
+
+async def _discard_upload(
+    store,
+    session_id: uuid.UUID,
+    version: int,
+    audio_metadata: dict,
+    upload: dict,
+    completed: bool,
+) -> None:
+    storage = get_storage()
+    if completed:
+        await storage.delete(upload["storage_key"])
+    else:
+        await storage.abort_upload(upload["storage_key"], upload["backend"])
+    _hashers.discard(upload["upload_id"])
+    await store.save_metadata(session_id, version, _without_upload(audio_metadata))
+
+
+class SessionUploadService:
+    @staticmethod
+    async def start(
+        therapist_id: uuid.UUID, session_id: uuid.UUID, data: SessionUploadInit, store
+    ) -> SessionUploadStatus:
+        session = await store.get(therapist_id, session_id)
+        _ensure_pending(session)
+        if data.size_bytes > _max_size_bytes():
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Audio exceeds {MAX_AUDIO_SIZE_MB} MB",
+            )
+
+        audio_metadata = dict(session.audio_metadata or {})
+        existing = audio_metadata.get("upload")
+        if existing and existing["size_bytes"] == data.size_bytes:
+            # Same file again after a dropped connection: resume, don't restart.
+            return _status(session_id, existing)
+
+        storage = get_storage()
+        if existing:
+            await storage.abort_upload(existing["storage_key"], existing["backend"])
+            _hashers.discard(existing["upload_id"])
+
+        upload_id = uuid.uuid4().hex
+        storage_key = f"sessions/{session.id}/{upload_id}"
+        upload = {
+            "upload_id": upload_id,
+            "storage_key": storage_key,
+            "size_bytes": data.size_bytes,
+            "offset": 0,
+            "chunk_size": UPLOAD_CHUNK_SIZE_BYTES,
+            "content_type": data.content_type,
+            "backend": await storage.start_upload(storage_key),
+            "probe": None,
+        }
+        audio_metadata["upload"] = upload
+        await store.save_metadata(session.id, session.version, audio_metadata)
+        _hashers.set(upload_id, 0, hashlib.sha256())
+        return _status(session_id, upload)
+
+    @staticmethod
+    async def get_status(
+        therapist_id: uuid.UUID, session_id: uuid.UUID, store
+    ) -> SessionUploadStatus:
+        session = await store.get(therapist_id, session_id)
+        return _status(session_id, _current_upload(session))
+
+    @staticmethod
+    async def write_chunk(
+        therapist_id: uuid.UUID,
+        session_id: uuid.UUID,
+        offset: int,
+        content_length: Optional[int],
+        chunks: AsyncIterator[bytes],
+        store,
+    ) -> SessionUploadStatus:
+        session = await store.get(therapist_id, session_id)
+        _ensure_pending(session)
+        upload = dict(_current_upload(session))
+        if offset != upload["offset"]:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload is at offset {upload['offset']}, resume from there",
+                headers={"Upload-Offset": str(upload["offset"])},
+            )
+        remaining = upload["size_bytes"] - offset
+        if remaining == 0:
+            raise HTTPException(status_code=409, detail="Upload is already complete")
+
+        storage = get_storage()
+        if storage.aligned_chunks:
+            expected = min(upload["chunk_size"], remaining)
+            if content_length != expected:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Chunk at offset {offset} must be exactly {expected} bytes",
+                )
+
+        hasher = _hashers.get(upload["upload_id"], offset)
+        if hasher is None and not storage.aligned_chunks:
+            # Incomplete multipart uploads cannot be read back; S3 uploads
+            # that miss the cache are hashed once on completion instead.
+            hasher = await _hash_stored(upload["storage_key"], offset)
+        head = bytearray() if offset == 0 else None
+
+        interrupted = None
+        try:
+            written = await storage.write_chunk(
+                upload["storage_key"],
+                upload["backend"],
+                offset,
+                _tee(chunks, remaining, hasher, head),
+            )
+        except PartialWrite as exc:
+            written, interrupted = exc.written, exc.cause
+        if written == 0 and interrupted is not None:
+            if isinstance(interrupted, ClientDisconnect):
+                return _status(session_id, upload)
+            raise interrupted
+
+        upload["offset"] = offset + written
+        if head:
+            upload["probe"] = probe_audio(bytes(head))
+        audio_metadata = {**(session.audio_metadata or {}), "upload": upload}
+        version = await store.save_metadata(session.id, session.version, audio_metadata)
+        if hasher is not None:
+            _hashers.set(upload["upload_id"], upload["offset"], hasher)
+
+        probe = upload["probe"]
+        if (
+            ENABLE_AUDIO_VALIDATION
+            and probe
+            and probe["format"] not in ACCEPTED_AUDIO_FORMATS
+        ):
+            await _discard_upload(
+                store, session_id, version, audio_metadata, upload, completed=False
+            )
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Unsupported audio format",
+            )
+        if interrupted is not None and not isinstance(interrupted, ClientDisconnect):
+            raise interrupted
+        return _status(session_id, upload)
+
+    @staticmethod
+    async def abort(therapist_id: uuid.UUID, session_id: uuid.UUID, store) -> dict:
+        session = await store.get(therapist_id, session_id)
+        _ensure_pending(session)
+        await _discard_upload(
+            store,
+            session.id,
+            session.version,
+            session.audio_metadata,
+            _current_upload(session),
+            completed=False,
+        )
+        return {"message": "Upload aborted"}
+
+    @staticmethod
+    async def complete(
+        therapist_id: uuid.UUID,
+        session_id: uuid.UUID,
+        data: SessionUploadComplete,
+        store,
+    ) -> SessionUploadResult:
+        session = await store.get(therapist_id, session_id)
+        _ensure_pending(session)
+        upload = _current_upload(session)
+        size = upload["size_bytes"]
+        if upload["offset"] != size:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload incomplete: {upload['offset']} of {size} bytes stored",
+                headers={"Upload-Offset": str(upload["offset"])},
+            )
+
+        storage_key = upload["storage_key"]
+        await get_storage().complete_upload(storage_key, upload["backend"])
+        hasher = _hashers.get(upload["upload_id"], size) or await _hash_stored(storage_key)
+        sha256 = hasher.hexdigest()
+        probe = upload["probe"] or probe_audio(await _read_head(storage_key))
+        info = finalize_audio_metadata(probe, size)
+
+        if data.sha256 and data.sha256.lower() != sha256:
+            await _discard_upload(
+                store, session.id, session.version, session.audio_metadata, upload, True
+            )
+            raise HTTPException(status_code=400, detail="Checksum mismatch, upload again")
+        duration = info.get("duration_seconds")
+        if (
+            ENABLE_AUDIO_VALIDATION
+            and duration
+            and duration > MAX_AUDIO_DURATION_MINUTES * 60
+        ):
+            await _discard_upload(
+                store, session.id, session.version, session.audio_metadata, upload, True
+            )
+            raise HTTPException(
+                status_code=422,
+                detail=f"Audio is longer than {MAX_AUDIO_DURATION_MINUTES} minutes",
+            )
+
+        audio_metadata = {
+            **_without_upload(session.audio_metadata or {}),
+            **info,
+            "storage_key": storage_key,
+            "size_bytes": size,
+            "size_mb": round(size / (1024 * 1024), 2),
+            "sha256": sha256,
+            "content_type": upload["content_type"],
+            "uploaded_at": datetime.now(timezone.utc).isoformat(),
+        }
+        # Built before the commit below expires the loaded session.
+        job = processing_job(session)
+        patient_id = session.patient_id
+        version = await store.mark_queued(session.id, session.version, audio_metadata)
+        _hashers.discard(upload["upload_id"])
+
+        cached = await get_summary_cache().get(therapist_id, sha256)
+        if cached is not None:
+            version = await store.complete_from_cache(
+                session_id, version, patient_id, audio_metadata, cached
+            )
+            await discard_audio(audio_metadata)
+            return SessionUploadResult(
+                session=SessionStatusResponse(
+                    id=session_id,
+                    processing_status="completed",
+                    job_id=job.job_id,
+                    version=version,
+                ),
+                audio_metadata=audio_metadata,
+                enqueued=False,
+                from_cache=True,
+            )
+        try:
+            enqueued = await QueueService.enqueue(job)
+        except QueueFullError:
+            raise _queue_full(session.id)
+        return SessionUploadResult(
+            session=SessionStatusResponse(
+                id=session_id,
+                processing_status="queued",
+                job_id=job.job_id,
+                version=version,
+            ),
+            audio_metadata=audio_metadata,
+            enqueued=enqueued,
+        )
@@ -0,0 +1,269 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")
+STORAGE_LOCAL_DIR = os.getenv("STORAGE_LOCAL_DIR", "./storage")
+S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "")
+S3_BUCKET_REGION = os.getenv("S3_BUCKET_REGION") or os.getenv("AWS_REGION")
+# S3-compatible endpoint (MinIO, LocalStack) for local runs.
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+STORAGE_READ_BLOCK_BYTES = 1024 * 1024
+# Parts of server-generated objects; S3 needs at least 5 MB for all but the last.
+STORAGE_WRITE_PART_BYTES = 8 * 1024 * 1024
+
+
+class PartialWrite(Exception):
+    """The chunk stream broke off; ``written`` bytes are durably stored."""
+
+    def __init__(self, written: int, cause: BaseException):
+        super().__init__(f"Chunk interrupted after {written} bytes")
+        self.written = written
+        self.cause = cause
+
+
+async def _single(data: bytes):
+    yield data
+
+
+class StorageBackend(ABC):
+    # Backends that store uploads as fixed-size parts (S3 multipart) need
+    # every chunk but the last to be exactly the negotiated chunk size.
+    aligned_chunks = False
+
+    @abstractmethod
+    async def read(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def iter_bytes(self, key: str, limit: Optional[int] = None) -> AsyncIterator[bytes]:
+        ...
+
+    @abstractmethod
+    async def start_upload(self, key: str) -> dict:
+        """Begin a resumable upload; the returned state is persisted by the caller."""
+
+    @abstractmethod
+    async def write_chunk(
+        self, key: str, state: dict, offset: int, chunks: AsyncIterator[bytes]
+    ) -> int:
+        """Store ``chunks`` at ``offset``; returns the number of bytes written
+        and may update ``state`` in place."""
+
+    @abstractmethod
+    async def complete_upload(self, key: str, state: dict) -> None:
+        ...
+
+    @abstractmethod
+    async def abort_upload(self, key: str, state: dict) -> None:
+        ...
+
+    async def write_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        """Store a generated object of unknown length; returns its size.
+
+        The upload is aborted if ``chunks`` raises, so a failed producer
+        never leaves a partial object behind.
+        """
+        state = await self.start_upload(key)
+        pending = bytearray()
+        offset = 0
+        try:
+            async for chunk in chunks:
+                pending += chunk
+                if len(pending) >= STORAGE_WRITE_PART_BYTES:
+                    offset += await self.write_chunk(key, state, offset, _single(bytes(pending)))
+                    pending.clear()
+            offset += await self.write_chunk(key, state, offset, _single(bytes(pending)))
+            await self.complete_upload(key, state)
+        except BaseException:
+            await self.abort_upload(key, state)
+            raise
+        return offset
+
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    def path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"Storage key escapes the storage root: {key}")
+        return path
+
+    async def read(self, key: str) -> bytes:
+        return await asyncio.to_thread(self.path(key).read_bytes)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.path(key).unlink, missing_ok=True)
+
+    async def iter_bytes(self, key: str, limit: Optional[int] = None):
+        with open(self.path(key), "rb") as file:
+            remaining = limit
+            while remaining is None or remaining > 0:
+                size = STORAGE_READ_BLOCK_BYTES
+                if remaining is not None:
+                    size = min(size, remaining)
+                block = await asyncio.to_thread(file.read, size)
+                if not block:
+                    return
+                if remaining is not None:
+                    remaining -= len(block)
+                yield block
+
+    async def start_upload(self, key: str) -> dict:
+        path = self.path(key)
+
+        def _create():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+
+        await asyncio.to_thread(_create)
+        return {}
+
+    async def write_chunk(
+        self, key: str, state: dict, offset: int, chunks: AsyncIterator[bytes]
+    ) -> int:
+        file = await asyncio.to_thread(open, self.path(key), "r+b")
+        written = 0
+        pending = bytearray()
+        try:
+            # Drop bytes past the committed offset left by an interrupted chunk.
+            await asyncio.to_thread(file.truncate, offset)
+            file.seek(offset)
+            try:
+                async for piece in chunks:
+                    pending += piece
+                    if len(pending) >= STORAGE_READ_BLOCK_BYTES:
+                        await asyncio.to_thread(file.write, pending)
+                        written += len(pending)
+                        pending = bytearray()
+            except Exception as exc:
+                # Keep what arrived so the client resumes from there.
+                await asyncio.to_thread(file.write, pending)
+                await asyncio.to_thread(file.flush)
+                raise PartialWrite(written + len(pending), exc) from exc
+            await asyncio.to_thread(file.write, pending)
+            written += len(pending)
+        finally:
+            await asyncio.to_thread(file.close)
+        return written
+
+    async def complete_upload(self, key: str, state: dict) -> None:
+        pass
+
+    async def abort_upload(self, key: str, state: dict) -> None:
+        await self.delete(key)
+
+
+class S3StorageBackend(StorageBackend):
+    """Uploads map to S3 multipart uploads, one part per chunk.
+
+    A chunk is held in memory only until its part is sent, so memory use is
+    bounded by the chunk size, not the file size.
+    """
+
+    aligned_chunks = True
+
+    def __init__(self, bucket: str, region: Optional[str], endpoint_url: Optional[str]):
+        try:
+            import boto3
+        except ImportError as exc:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires the 'boto3' package") from exc
+        self.bucket = bucket
+        self.client = boto3.client("s3", region_name=region, endpoint_url=endpoint_url)
+
+    async def read(self, key: str) -> bytes:
+        def _read() -> bytes:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+            return response["Body"].read()
+
+        return await asyncio.to_thread(_read)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def iter_bytes(self, key: str, limit: Optional[int] = None):
+        options = {"Bucket": self.bucket, "Key": key}
+        if limit is not None:
+            options["Range"] = f"bytes=0-{limit - 1}"
+        response = await asyncio.to_thread(self.client.get_object, **options)
+        body = response["Body"]
+        try:
+            while True:
+                block = await asyncio.to_thread(body.read, STORAGE_READ_BLOCK_BYTES)
+                if not block:
+                    return
+                yield block
+        finally:
+            body.close()
+
+    async def start_upload(self, key: str) -> dict:
+        response = await asyncio.to_thread(
+            self.client.create_multipart_upload, Bucket=self.bucket, Key=key
+        )
+        return {"upload_id": response["UploadId"], "parts": []}
+
+    async def write_chunk(
+        self, key: str, state: dict, offset: int, chunks: AsyncIterator[bytes]
+    ) -> int:
+        # The caller enforces chunk alignment, so the part number follows
+        # from the offset and a retried chunk simply replaces its part.
+        part_number = len([p for p in state["parts"] if p["Offset"] < offset]) + 1
+        body = bytearray()
+        async for piece in chunks:
+            body += piece
+        response = await asyncio.to_thread(
+            self.client.upload_part,
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=state["upload_id"],
+            PartNumber=part_number,
+            Body=bytes(body),
+        )
+        state["parts"] = [p for p in state["parts"] if p["Offset"] < offset] + [
+            {"PartNumber": part_number, "ETag": response["ETag"], "Offset": offset}
+        ]
+        return len(body)
+
+    async def complete_upload(self, key: str, state: dict) -> None:
+        parts = [
+            {"PartNumber": part["PartNumber"], "ETag": part["ETag"]}
+            for part in state["parts"]
+        ]
+        await asyncio.to_thread(
+            self.client.complete_multipart_upload,
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=state["upload_id"],
+            MultipartUpload={"Parts": parts},
+        )
+
+    async def abort_upload(self, key: str, state: dict) -> None:
+        await asyncio.to_thread(
+            self.client.abort_multipart_upload,
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=state["upload_id"],
+        )
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND == "local":
+            _storage = LocalStorageBackend(STORAGE_LOCAL_DIR)
+        elif STORAGE_BACKEND == "s3":
+            _storage = S3StorageBackend(S3_BUCKET_NAME, S3_BUCKET_REGION, S3_ENDPOINT_URL)
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+    return _storage
@@ -0,0 +1,326 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+import anyio.from_thread
+
+from app.services.queue_service import REDIS_URL
+from app.worker.backends import pipeline_version
+
+logger = logging.getLogger(__name__)
+
+# memory | disk | redis | off. The memory backend only helps when the worker
+# runs in the API process (embedded); split deployments want disk or redis.
+SUMMARY_CACHE_BACKEND = os.getenv("SUMMARY_CACHE_BACKEND", "memory")
+SUMMARY_CACHE_TTL_SECONDS = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS", 30 * 86400))
+# Byte budget of the memory and disk backends; Redis evicts by its own
+# maxmemory policy.
+SUMMARY_CACHE_MAX_BYTES = int(os.getenv("SUMMARY_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+SUMMARY_CACHE_DIR = os.getenv("SUMMARY_CACHE_DIR", "./cache/summaries")
+SUMMARY_CACHE_REDIS_URL = os.getenv("SUMMARY_CACHE_REDIS_URL") or REDIS_URL
+SUMMARY_CACHE_PREFIX = os.getenv("SUMMARY_CACHE_PREFIX", "theramind:summary")
+# Comma-separated Fernet keys, newest first (older ones still decrypt).
+# Required for disk and redis; the memory backend makes a throwaway key.
+SUMMARY_CACHE_KEY = os.getenv("SUMMARY_CACHE_KEY", "")
+
+
+@dataclass
+class CachedResult:
+    transcript: str
+    language: str
+    # As the summarizer returned it. Anonymization depends on the patient,
+    # so it is redone on every hit.
+    summary: dict
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class NullCacheBackend(CacheBackend):
+    async def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        pass
+
+    async def delete(self, key: str) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU bounded by the total size of the stored values."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self._remove(key)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+
+class DiskCacheBackend(CacheBackend):
+    """One file per entry. A read bumps the file's mtime, so eviction past
+    the byte budget drops the least recently used files; files untouched for
+    longer than the TTL are expired on the way."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _read(self, path: Path) -> Optional[bytes]:
+        try:
+            value = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return value
+
+    def _write(self, path: Path, value: bytes, ttl_seconds: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written aside and renamed, so a reader never sees half a file.
+        partial = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        partial.write_bytes(value)
+        os.replace(partial, path)
+        self._evict(ttl_seconds)
+
+    def _evict(self, ttl_seconds: int) -> None:
+        expired_before = time.time() - ttl_seconds
+        files = []
+        for path in self.directory.glob("*/*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime < expired_before:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, self._path(key))
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        await asyncio.to_thread(self._write, self._path(key), value, ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Entries expire with SET EX. On a server shared with the queue use a
+    volatile-* maxmemory policy, so eviction never touches the queue lists."""
+
+    def __init__(self, url: str, prefix: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "SUMMARY_CACHE_BACKEND=redis requires the 'redis' package"
+            ) from exc
+        self._redis = redis.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis.get(f"{self._prefix}:{key}")
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        await self._redis.set(f"{self._prefix}:{key}", value, ex=ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(f"{self._prefix}:{key}")
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def _fernet(keys: str, required: bool):
+    try:
+        from cryptography.fernet import Fernet, MultiFernet
+    except ImportError as exc:
+        raise RuntimeError("The summary cache requires the 'cryptography' package") from exc
+    keys = [key.strip() for key in keys.split(",") if key.strip()]
+    if not keys:
+        if required:
+            raise ValueError(
+                "SUMMARY_CACHE_KEY is required for "
+                f"SUMMARY_CACHE_BACKEND={SUMMARY_CACHE_BACKEND}"
+            )
+        keys = [Fernet.generate_key()]
+    return MultiFernet([Fernet(key) for key in keys])
+
+
+class SummaryCache:
+    """Transcript and summary by audio content, encrypted at rest.
+
+    Keyed by therapist, the audio's SHA-256 and the pipeline version, so a
+    duplicate upload or a reprocess with the same backends skips
+    transcription and summarization. Entries are Fernet tokens, whose
+    timestamp also enforces the TTL. A failing backend is a miss, never an
+    error.
+    """
+
+    def __init__(self, backend: CacheBackend, fernet, ttl_seconds: int, version: str):
+        self.backend = backend
+        self.fernet = fernet
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, therapist_id: uuid.UUID, audio_sha256: str) -> str:
+        raw = f"{therapist_id}:{audio_sha256.lower()}:{self.version}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(
+        self, therapist_id: uuid.UUID, audio_sha256: Optional[str]
+    ) -> Optional[CachedResult]:
+        if not audio_sha256:
+            return None
+        from cryptography.fernet import InvalidToken
+
+        key = self.key(therapist_id, audio_sha256)
+        try:
+            token = await self.backend.get(key)
+            if token is None:
+                self.misses += 1
+                return None
+            result = CachedResult(**json.loads(self.fernet.decrypt(token, self.ttl_seconds)))
+        except InvalidToken:
+            # Expired, or written under a key that has since been retired.
+            self.misses += 1
+            await self._forget(key)
+            return None
+        except Exception:
+            logger.exception("Summary cache lookup failed")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    async def put(
+        self, therapist_id: uuid.UUID, audio_sha256: Optional[str], result: CachedResult
+    ) -> None:
+        if not audio_sha256:
+            return
+        try:
+            token = self.fernet.encrypt(json.dumps(asdict(result)).encode())
+            await self.backend.set(
+                self.key(therapist_id, audio_sha256), token, self.ttl_seconds
+            )
+        except Exception:
+            logger.exception("Summary cache write failed")
+
+    async def delete(self, therapist_id: uuid.UUID, audio_sha256: Optional[str]) -> None:
+        """Drops the entry under the current pipeline version; entries under
+        older versions are unreachable and run out with their TTL. Unlike a
+        lookup, a failing backend raises, so erasure retries."""
+        if audio_sha256:
+            await self.backend.delete(self.key(therapist_id, audio_sha256))
+
+    async def _forget(self, key: str) -> None:
+        try:
+            await self.backend.delete(key)
+        except Exception:
+            logger.exception("Summary cache delete failed")
+
+    def get_from_thread(
+        self, therapist_id: uuid.UUID, audio_sha256: Optional[str]
+    ) -> Optional[CachedResult]:
+        # Same hop as QueueService.enqueue_from_thread: the backend belongs
+        # to the event loop.
+        return anyio.from_thread.run(self.get, therapist_id, audio_sha256)
+
+    def stats(self) -> dict:
+        return {"backend": SUMMARY_CACHE_BACKEND, "hits": self.hits, "misses": self.misses}
+
+
+def _build_cache() -> SummaryCache:
+    if SUMMARY_CACHE_BACKEND == "off":
+        backend = NullCacheBackend()
+    elif SUMMARY_CACHE_BACKEND == "memory":
+        backend = MemoryCacheBackend(SUMMARY_CACHE_MAX_BYTES)
+    elif SUMMARY_CACHE_BACKEND == "disk":
+        backend = DiskCacheBackend(SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_BYTES)
+    elif SUMMARY_CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend(SUMMARY_CACHE_REDIS_URL, SUMMARY_CACHE_PREFIX)
+    else:
+        raise ValueError(f"Unknown SUMMARY_CACHE_BACKEND: {SUMMARY_CACHE_BACKEND}")
+    fernet = _fernet(SUMMARY_CACHE_KEY, SUMMARY_CACHE_BACKEND in ("disk", "redis"))
+    return SummaryCache(backend, fernet, SUMMARY_CACHE_TTL_SECONDS, pipeline_version())
+
+
+_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> SummaryCache:
+    global _cache
+    if _cache is None:
+        _cache = _build_cache()
+    return _cache
+
+
+async def close_summary_cache() -> None:
+    global _cache
+    if _cache is not None:
+        await _cache.backend.close()
+        _cache = None
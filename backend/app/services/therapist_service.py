@@ -1,4 +1,6 @@
 import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.therapist import Therapist
@@ -7,7 +9,17 @@ from app.schemas.therapist import (
     TherapistResponse,
     TherapistBase,
 )
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, get_password_hash_async
+from app.core.identity_cache import identity_cache
+
+
+def _apply_update(therapist: Therapist, data: TherapistBase) -> None:
+    if data.full_name:
+        therapist.full_name = data.full_name
+    if data.professional_license:
+        therapist.professional_license = data.professional_license
+    if data.email:
+        therapist.email = data.email
 
 
 class TherapistService:
@@ -46,20 +58,51 @@ class TherapistService:
         therapist = db.query(Therapist).filter_by(id=therapist_id).first()
         if not therapist:
             raise HTTPException(status_code=404, detail="Therapist not found")
-        if data.full_name:
-            therapist.full_name = data.full_name
-        if data.professional_license:
-            therapist.professional_license = data.professional_license
-        if data.email:
-            therapist.email = data.email
+        _apply_update(therapist, data)
         db.commit()
         db.refresh(therapist)
+        identity_cache.invalidate_therapist(therapist.id)
         return TherapistResponse.model_validate(therapist)
 
+
+class AsyncTherapistService:
     @staticmethod
-    def delete_therapist(therapist_id: uuid.UUID, db: Session) -> None:
-        therapist = db.query(Therapist).filter_by(id=therapist_id).first()
+    async def create_therapist(data: TherapistCreate, db: AsyncSession) -> Therapist:
+        existing = await db.scalar(select(Therapist).filter_by(email=data.email))
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered",
+            )
+
+        hashed_pw = await get_password_hash_async(data.password)
+        new_therapist = Therapist(
+            full_name=data.full_name,
+            email=data.email,
+            professional_license=data.professional_license,
+            hashed_password=hashed_pw,
+        )
+        db.add(new_therapist)
+        await db.commit()
+        await db.refresh(new_therapist)
+        return new_therapist
+
+    @staticmethod
+    async def get_by_id(therapist_id: uuid.UUID, db: AsyncSession) -> TherapistResponse:
+        therapist = await db.scalar(select(Therapist).filter_by(id=therapist_id))
         if not therapist:
             raise HTTPException(status_code=404, detail="Therapist not found")
-        db.delete(therapist)
-        db.commit()
+        return TherapistResponse.model_validate(therapist)
+
+    @staticmethod
+    async def update_therapist(
+        therapist_id: uuid.UUID, data: TherapistBase, db: AsyncSession
+    ) -> TherapistResponse:
+        therapist = await db.scalar(select(Therapist).filter_by(id=therapist_id))
+        if not therapist:
+            raise HTTPException(status_code=404, detail="Therapist not found")
+        _apply_update(therapist, data)
+        await db.commit()
+        await db.refresh(therapist)
+        identity_cache.invalidate_therapist(therapist.id)
+        return TherapistResponse.model_validate(therapist)
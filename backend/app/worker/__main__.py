@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import signal
+
+from app.core.compression import check_payload_codec
+from app.services.queue_service import QUEUE_BACKEND, QueueService
+from app.services.summary_cache import close_summary_cache
+from app.worker.runtime import (
+    build_audit_retention,
+    build_erasure_runner,
+    build_export_purge,
+    build_reaper,
+    build_retry_scheduler,
+    build_worker,
+)
+
+logger = logging.getLogger("app.worker")
+
+
+async def main() -> None:
+    check_payload_codec()
+    if QUEUE_BACKEND == "inprocess":
+        logger.warning(
+            "QUEUE_BACKEND=inprocess: a standalone worker only sees its own "
+            "queue; use a shared backend such as redis"
+        )
+    worker = build_worker()
+    services = [
+        service
+        for service in (
+            worker,
+            build_retry_scheduler(),
+            build_audit_retention(),
+            build_erasure_runner(),
+            build_export_purge(),
+            build_reaper(),
+        )
+        if service is not None
+    ]
+
+    def stop() -> None:
+        for service in services:
+            service.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop)
+    try:
+        await asyncio.gather(*(service.run() for service in services))
+    finally:
+        await QueueService.close()
+        await close_summary_cache()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+import re
+from typing import Iterable
+
+_PATTERNS = [
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "[EMAIL]"),
+    (re.compile(r"\b\d{3}\.?\d{3}\.?\d{3}-?\d{2}\b"), "[CPF]"),
+    (re.compile(r"(?:\+?55\s?)?(?:\(?\d{2}\)?\s?)?9?\d{4}[-\s]?\d{4}\b"), "[TELEFONE]"),
+]
+
+
+def _scrub(text: str, identifiers: Iterable[str]) -> str:
+    for pattern, replacement in _PATTERNS:
+        text = pattern.sub(replacement, text)
+    for identifier in identifiers:
+        text = re.sub(re.escape(identifier), "[PACIENTE]", text, flags=re.IGNORECASE)
+    return text
+
+
+def anonymize(value, identifiers: Iterable[str] = ()):
+    """Redact emails, CPFs, phone numbers and the given identifiers from every
+    string in a JSON-like value."""
+    identifiers = [identifier for identifier in identifiers if identifier]
+    if isinstance(value, str):
+        return _scrub(value, identifiers)
+    if isinstance(value, dict):
+        return {key: anonymize(item, identifiers) for key, item in value.items()}
+    if isinstance(value, list):
+        return [anonymize(item, identifiers) for item in value]
+    return value
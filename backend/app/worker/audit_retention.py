@@ -0,0 +1,240 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import uuid
+import zlib
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.services.storage_service import get_storage
+
+logger = logging.getLogger(__name__)
+
+AUDIT_RETENTION_ENABLED = os.getenv("AUDIT_RETENTION_ENABLED", "true").lower() == "true"
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", 24))
+AUDIT_PARTITIONS_AHEAD = int(os.getenv("AUDIT_PARTITIONS_AHEAD", 3))
+AUDIT_ARCHIVE_PREFIX = os.getenv("AUDIT_ARCHIVE_PREFIX", "audit-archive")
+AUDIT_MAINTENANCE_SECONDS = float(os.getenv("AUDIT_MAINTENANCE_SECONDS", 6 * 3600))
+_FETCH_ROWS = 2000
+# A plain DETACH briefly locks audit_logs exclusively (CONCURRENTLY is not
+# allowed next to a DEFAULT partition); give up rather than queue writers
+# behind it, and try again next run.
+_DETACH_LOCK_TIMEOUT = "5s"
+# Session-level advisory lock, so one node at a time runs maintenance.
+_LOCK_KEY = 0x61756469
+_PARTITION_NAME = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+_COLUMNS = (
+    "id, user_id, user_email, action, resource_type, resource_id, datails, "
+    "ip_address, user_agent, request_id, created_at"
+)
+
+
+def retention_cutoff(today: date, months: int) -> date:
+    """First day of the oldest month that is still retained."""
+    index = today.year * 12 + today.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_end(name: str) -> Optional[date]:
+    """Exclusive upper bound of a monthly partition, from its name."""
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    year, month = int(match.group(1)), int(match.group(2))
+    return date(year + month // 12, month % 12 + 1, 1)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _try_lock(connection) -> bool:
+    return connection.execute(
+        text("SELECT pg_try_advisory_lock(:key)"), {"key": _LOCK_KEY}
+    ).scalar()
+
+
+def _unlock(connection) -> None:
+    try:
+        connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+    except Exception:
+        # A pooled connection must never go back still holding the lock;
+        # discarding it ends the database session and the lock with it.
+        logger.exception("Could not release the audit maintenance lock")
+        connection.invalidate()
+
+
+def _detach(connection, name: str) -> None:
+    connection.execute(text(f"SET lock_timeout = '{_DETACH_LOCK_TIMEOUT}'"))
+    try:
+        connection.execute(text(f'ALTER TABLE audit_logs DETACH PARTITION "{name}"'))
+    finally:
+        connection.execute(text("RESET lock_timeout"))
+
+
+def _maintain(connection, today: date, cutoff: date) -> List[str]:
+    """Create upcoming partitions and detach expired ones, under the
+    maintenance lock.
+
+    Returns the detached partitions waiting to be archived, including ones
+    left over by an interrupted run.
+    """
+    # Starts at the oldest month in audit_logs_default, so rows that landed
+    # there while no partition existed move into their own month.
+    connection.execute(
+        text(
+            "SELECT audit_logs_ensure_partitions(LEAST(CAST(:today AS date), ("
+            "SELECT min(created_at AT TIME ZONE 'UTC')::date FROM audit_logs_default"
+            ")), :ahead)"
+        ),
+        {"today": today, "ahead": AUDIT_PARTITIONS_AHEAD},
+    )
+    attached = connection.execute(
+        text(
+            "SELECT c.relname, i.inhdetachpending FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'audit_logs'::regclass"
+        )
+    ).all()
+    for name, detach_pending in attached:
+        if detach_pending:
+            # A DETACH ... CONCURRENTLY interrupted before the default
+            # partition existed; it cannot be started again, only finished.
+            connection.execute(
+                text(f'ALTER TABLE audit_logs DETACH PARTITION "{name}" FINALIZE')
+            )
+            logger.info("Finished detaching audit partition %s", name)
+            continue
+        end = partition_end(name)
+        if end is not None and end <= cutoff:
+            # Detaching is a catalog change; the rows never pass through a
+            # DELETE, so the hot table gets no dead tuples or vacuum debt.
+            _detach(connection, name)
+            logger.info("Detached audit partition %s", name)
+    return sorted(
+        connection.scalars(
+            text(
+                "SELECT relname FROM pg_class "
+                "WHERE relname ~ '^audit_logs_y[0-9]{4}m[0-9]{2}$' "
+                "AND relkind = 'r' AND NOT relispartition"
+            )
+        ).all()
+    )
+
+
+class AuditRetention:
+    """Keeps audit_logs partitions ahead of time and archives expired ones.
+
+    An expired month is detached from audit_logs, streamed through a
+    server-side cursor into a gzipped NDJSON object in audio storage under
+    ``AUDIT_ARCHIVE_PREFIX``, checked against its row count and only then
+    dropped. Each step is safe to repeat after a crash.
+    """
+
+    def __init__(
+        self,
+        retention_months: int = AUDIT_RETENTION_MONTHS,
+        interval_seconds: float = AUDIT_MAINTENANCE_SECONDS,
+    ):
+        self.retention_months = retention_months
+        self.interval_seconds = interval_seconds
+        self._stopping: Optional[asyncio.Event] = None
+        self.archived = 0
+
+    async def archive_partition(self, name: str) -> str:
+        key = f"{AUDIT_ARCHIVE_PREFIX}/{name}.ndjson.gz"
+        rows = 0
+
+        async def archive():
+            nonlocal rows
+            compressor = zlib.compressobj(wbits=31)
+            connection = await asyncio.to_thread(engine.connect)
+            try:
+                expected = await asyncio.to_thread(
+                    lambda: connection.execute(text(f'SELECT count(*) FROM "{name}"')).scalar()
+                )
+                result = await asyncio.to_thread(
+                    connection.execution_options(yield_per=_FETCH_ROWS).execute,
+                    text(f'SELECT {_COLUMNS} FROM "{name}" ORDER BY created_at, id'),
+                )
+                while batch := await asyncio.to_thread(result.fetchmany, _FETCH_ROWS):
+                    yield compressor.compress(
+                        b"".join(
+                            json.dumps(dict(row._mapping), default=_json_default).encode()
+                            + b"\n"
+                            for row in batch
+                        )
+                    )
+                    rows += len(batch)
+                yield compressor.flush()
+                # Raising here aborts the upload, keeping the table.
+                if rows != expected:
+                    raise RuntimeError(f"Archived {rows} of {expected} rows from {name}")
+            finally:
+                await asyncio.to_thread(connection.close)
+
+        await get_storage().write_stream(key, archive())
+
+        def _drop():
+            with engine.begin() as drop_connection:
+                drop_connection.execute(text(f'DROP TABLE "{name}"'))
+
+        await asyncio.to_thread(_drop)
+        logger.info("Archived %s audit rows from %s to %s", rows, name, key)
+        self.archived += 1
+        return key
+
+    async def run_once(self) -> List[str]:
+        today = datetime.now(timezone.utc).date()
+        cutoff = retention_cutoff(today, self.retention_months)
+        connection = await asyncio.to_thread(
+            lambda: engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        )
+        try:
+            if not await asyncio.to_thread(_try_lock, connection):
+                return []
+            try:
+                detached = await asyncio.to_thread(_maintain, connection, today, cutoff)
+                return [await self.archive_partition(name) for name in detached]
+            finally:
+                await asyncio.to_thread(_unlock, connection)
+        finally:
+            await asyncio.to_thread(connection.close)
+
+    async def run(self) -> None:
+        self._stopping = asyncio.Event()
+        if engine.dialect.name != "postgresql":
+            logger.info("Audit retention needs PostgreSQL partitions; not running")
+            return
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Audit retention run failed")
+            try:
+                async with asyncio.timeout(self.interval_seconds):
+                    await self._stopping.wait()
+            except TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def stats(self) -> dict:
+        return {"archived_partitions": self.archived}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    archived = asyncio.run(AuditRetention().run_once())
+    print("\n".join(archived) or "Nothing to archive")
@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+TRANSCRIBER_BACKEND = os.getenv("TRANSCRIBER_BACKEND", "fake")
+SUMMARIZER_BACKEND = os.getenv("SUMMARIZER_BACKEND", "fake")
+OPENAI_TRANSCRIBE_MODEL = os.getenv("OPENAI_TRANSCRIBE_MODEL", "whisper-1")
+OPENAI_SUMMARY_MODEL = os.getenv("OPENAI_SUMMARY_MODEL", "gpt-4o-mini")
+TRANSCRIPT_LANGUAGE = os.getenv("TRANSCRIPT_LANGUAGE", "pt")
+# Simulated latency for the fakes, so local load tests exercise the pipeline.
+FAKE_BACKEND_DELAY_SECONDS = float(os.getenv("FAKE_BACKEND_DELAY_SECONDS", 0))
+
+
+@dataclass
+class Transcript:
+    text: str
+    language: str
+
+
+class Transcriber(ABC):
+    @abstractmethod
+    async def transcribe(self, audio: bytes, audio_metadata: dict) -> Transcript:
+        ...
+
+
+class Summarizer(ABC):
+    @abstractmethod
+    async def summarize(self, transcript: Transcript) -> dict:
+        ...
+
+
+_FAKE_WORDS = (
+    "paciente relatou ansiedade trabalho prazos sono familia limites respiracao "
+    "semana conversa gatilho estrategia enfrentamento progresso diario rotina "
+    "emocao alivio tristeza objetivo tarefa sessao apoio reflexao"
+).split()
+
+
+class FakeTranscriber(Transcriber):
+    """Deterministic transcript derived from the audio bytes."""
+
+    def __init__(self, delay_seconds: float = 0):
+        self.delay_seconds = delay_seconds
+
+    async def transcribe(self, audio: bytes, audio_metadata: dict) -> Transcript:
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        rng = random.Random(hashlib.sha256(audio).digest())
+        sentences = [
+            " ".join(rng.choice(_FAKE_WORDS) for _ in range(12)).capitalize() + "."
+            for _ in range(8)
+        ]
+        return Transcript(text=" ".join(sentences), language=TRANSCRIPT_LANGUAGE)
+
+
+class FakeSummarizer(Summarizer):
+    """Deterministic summary in the shape of the production summary JSON."""
+
+    def __init__(self, delay_seconds: float = 0):
+        self.delay_seconds = delay_seconds
+
+    async def summarize(self, transcript: Transcript) -> dict:
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        sentences = [s.strip() for s in transcript.text.split(".") if s.strip()]
+        words = transcript.text.split()
+        return {
+            "main_points": sentences[:3],
+            "emotions_observed": [],
+            "behavioral_patterns": [],
+            "action_items": [],
+            "risk_assessment": {"level": "baixo", "notes": ""},
+            "next_session_focus": sentences[3:5],
+            "therapist_notes": "",
+            "ai_confidence_score": 1.0,
+            "tokens_used": {"input": len(words), "output": 0},
+        }
+
+
+_SUMMARY_PROMPT = (
+    "You summarize psychotherapy session transcripts for the treating therapist. "
+    "Reply with a JSON object with the keys main_points, emotions_observed, "
+    "behavioral_patterns, action_items, risk_assessment, next_session_focus, "
+    "therapist_notes and ai_confidence_score. Write in the transcript's language "
+    "and do not include names or other personal identifiers."
+)
+
+
+def _openai_client():
+    try:
+        from openai import AsyncOpenAI
+    except ImportError as exc:
+        raise RuntimeError("The openai backends require the 'openai' package") from exc
+    return AsyncOpenAI()
+
+
+class OpenAITranscriber(Transcriber):
+    def __init__(self, model: str):
+        self.model = model
+        self.client = _openai_client()
+
+    async def transcribe(self, audio: bytes, audio_metadata: dict) -> Transcript:
+        filename = "audio." + audio_metadata.get("format", "mp3")
+        response = await self.client.audio.transcriptions.create(
+            model=self.model, file=(filename, audio), language=TRANSCRIPT_LANGUAGE
+        )
+        return Transcript(text=response.text, language=TRANSCRIPT_LANGUAGE)
+
+
+class OpenAISummarizer(Summarizer):
+    def __init__(self, model: str):
+        self.model = model
+        self.client = _openai_client()
+
+    async def summarize(self, transcript: Transcript) -> dict:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": _SUMMARY_PROMPT},
+                {"role": "user", "content": transcript.text},
+            ],
+        )
+        summary = json.loads(response.choices[0].message.content)
+        summary["tokens_used"] = {
+            "input": response.usage.prompt_tokens,
+            "output": response.usage.completion_tokens,
+        }
+        return summary
+
+
+def pipeline_version() -> str:
+    """Identifies what turns audio into a summary; part of the summary cache
+    key, so changing a backend, model, language or the prompt misses."""
+    prompt = hashlib.sha256(_SUMMARY_PROMPT.encode()).hexdigest()[:12]
+    transcriber = TRANSCRIBER_BACKEND
+    if transcriber == "openai":
+        transcriber += f":{OPENAI_TRANSCRIBE_MODEL}"
+    summarizer = SUMMARIZER_BACKEND
+    if summarizer == "openai":
+        summarizer += f":{OPENAI_SUMMARY_MODEL}:{prompt}"
+    return f"{transcriber}/{TRANSCRIPT_LANGUAGE}/{summarizer}"
+
+
+def get_transcriber(backend: Optional[str] = None) -> Transcriber:
+    backend = backend or TRANSCRIBER_BACKEND
+    if backend == "fake":
+        return FakeTranscriber(FAKE_BACKEND_DELAY_SECONDS)
+    if backend == "openai":
+        return OpenAITranscriber(OPENAI_TRANSCRIBE_MODEL)
+    raise ValueError(f"Unknown TRANSCRIBER_BACKEND: {backend}")
+
+
+def get_summarizer(backend: Optional[str] = None) -> Summarizer:
+    backend = backend or SUMMARIZER_BACKEND
+    if backend == "fake":
+        return FakeSummarizer(FAKE_BACKEND_DELAY_SECONDS)
+    if backend == "openai":
+        return OpenAISummarizer(OPENAI_SUMMARY_MODEL)
+    raise ValueError(f"Unknown SUMMARIZER_BACKEND: {backend}")
@@ -0,0 +1,320 @@
+import asyncio
+import logging
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.identity_cache import IDENTITY_CACHE_TTL_SECONDS
+from app.models.auditLog import AuditLog
+from app.models.dataExport import DataExport
+from app.models.erasureJob import ErasureJob
+from app.models.patient import Patient
+from app.models.processingError import ProcessingError
+from app.models.session import Session as SessionModel
+from app.models.sessionRollup import SessionRollup
+from app.models.therapist import Therapist
+from app.services.audit_service import AUDIT_FLUSH_SECONDS
+from app.services.storage_service import get_storage
+from app.services.summary_cache import get_summary_cache
+
+logger = logging.getLogger(__name__)
+
+ERASURE_ENABLED = os.getenv("ERASURE_ENABLED", "true").lower() == "true"
+ERASURE_POLL_SECONDS = float(os.getenv("ERASURE_POLL_SECONDS", 5))
+# Rows per transaction; each batch commits on its own, so locks are held
+# for one batch, never for the whole account.
+ERASURE_BATCH_SIZE = int(os.getenv("ERASURE_BATCH_SIZE", 500))
+ERASURE_LEASE_SECONDS = int(os.getenv("ERASURE_LEASE_SECONDS", 120))
+# A job waits this long after the account was locked. By then no node still
+# serves the therapist from its identity cache, and audit rows they caused
+# have been flushed.
+ERASURE_SETTLE_SECONDS = float(
+    os.getenv(
+        "ERASURE_SETTLE_SECONDS", IDENTITY_CACHE_TTL_SECONDS + AUDIT_FLUSH_SECONDS + 30
+    )
+)
+
+# Children before parents, so no batch ever trips a foreign key. Every step
+# only looks at rows that are still there, which makes a rerun after a
+# crash pick up where the last committed batch left off.
+ERASURE_STEPS = (
+    "data_exports",
+    "sessions",
+    "session_rollups",
+    "patients",
+    "audit_logs",
+    "therapist",
+)
+# Steps whose rows own storage objects, deleted before the rows are. Session
+# rows also own their summary cache entry.
+_STORAGE_STEPS = ("data_exports", "sessions")
+
+
+@dataclass
+class LeasedErasure:
+    id: uuid.UUID
+    therapist_id: uuid.UUID
+    progress: dict = field(default_factory=dict)
+
+
+def _lease_next(now: datetime) -> Optional[LeasedErasure]:
+    with SessionLocal() as db:
+        job = db.scalar(
+            select(ErasureJob)
+            .where(
+                ErasureJob.status != "completed",
+                ErasureJob.created_at <= now - timedelta(seconds=ERASURE_SETTLE_SECONDS),
+                or_(ErasureJob.lease_expires_at == None, ErasureJob.lease_expires_at < now),
+            )
+            .order_by(ErasureJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if job is None:
+            return None
+        job.status = "running"
+        job.started_at = job.started_at or now
+        job.lease_expires_at = now + timedelta(seconds=ERASURE_LEASE_SECONDS)
+        db.commit()
+        return LeasedErasure(job.id, job.therapist_id, dict(job.progress or {}))
+
+
+def _record(db: Session, erasure: LeasedErasure, step: str, erased: int) -> None:
+    """Progress is written in the batch's own transaction, so it always
+    matches what was committed. Also renews the lease."""
+    erasure.progress[step] = erasure.progress.get(step, 0) + erased
+    db.execute(
+        update(ErasureJob)
+        .where(ErasureJob.id == erasure.id)
+        .values(
+            step=step,
+            progress=dict(erasure.progress),
+            error=None,
+            lease_expires_at=datetime.now(timezone.utc)
+            + timedelta(seconds=ERASURE_LEASE_SECONDS),
+        )
+    )
+
+
+def _owned_objects(
+    step: str, therapist_id: uuid.UUID, limit: int
+) -> List[Tuple[uuid.UUID, Optional[str], Optional[str]]]:
+    """(row id, storage key, audio SHA-256) for the next batch."""
+    with SessionLocal() as db:
+        if step == "data_exports":
+            rows = db.execute(
+                select(DataExport.id, DataExport.storage_key)
+                .where(DataExport.therapist_id == therapist_id)
+                .limit(limit)
+            ).all()
+            return [(row.id, row.storage_key, None) for row in rows]
+        rows = db.execute(
+            select(SessionModel.id, SessionModel.audio_metadata)
+            .where(SessionModel.therapist_id == therapist_id)
+            .limit(limit)
+        ).all()
+        return [
+            (
+                row.id,
+                (row.audio_metadata or {}).get("storage_key"),
+                (row.audio_metadata or {}).get("sha256"),
+            )
+            for row in rows
+        ]
+
+
+def _delete_owned(erasure: LeasedErasure, step: str, ids: List[uuid.UUID]) -> int:
+    with SessionLocal() as db:
+        if step == "data_exports":
+            erased = db.execute(delete(DataExport).where(DataExport.id.in_(ids))).rowcount
+        else:
+            db.execute(delete(ProcessingError).where(ProcessingError.session_id.in_(ids)))
+            erased = db.execute(delete(SessionModel).where(SessionModel.id.in_(ids))).rowcount
+        _record(db, erasure, step, erased)
+        db.commit()
+        return erased
+
+
+def _erase_statement(step: str, therapist_id: uuid.UUID, limit: int):
+    if step == "session_rollups":
+        batch = (
+            select(SessionRollup.patient_id, SessionRollup.week_start)
+            .where(SessionRollup.therapist_id == therapist_id)
+            .limit(limit)
+        )
+        return delete(SessionRollup).where(
+            SessionRollup.therapist_id == therapist_id,
+            tuple_(SessionRollup.patient_id, SessionRollup.week_start).in_(batch),
+        )
+    if step == "patients":
+        batch = select(Patient.id).where(Patient.therapist_id == therapist_id).limit(limit)
+        return delete(Patient).where(Patient.id.in_(batch.scalar_subquery()))
+    if step == "audit_logs":
+        batch = (
+            select(AuditLog.id, AuditLog.created_at)
+            .where(AuditLog.user_id == therapist_id)
+            .limit(limit)
+        )
+        return _anonymise(tuple_(AuditLog.id, AuditLog.created_at).in_(batch))
+    return delete(Therapist).where(Therapist.id == therapist_id)
+
+
+def _anonymise(condition):
+    # Entries are kept as a record of what happened, minus who did it.
+    return (
+        update(AuditLog)
+        .where(condition)
+        .values(user_id=None, user_email="", ip_address="", user_agent="")
+    )
+
+
+def _erase_therapist(erasure: LeasedErasure) -> int:
+    """Anonymises audit rows written since the audit step and deletes the
+    therapist in one transaction. The row lock makes audit inserts that
+    reference the therapist wait, after which they fail the foreign key,
+    so none can land in between."""
+    with SessionLocal() as db:
+        db.execute(
+            select(Therapist.id).where(Therapist.id == erasure.therapist_id).with_for_update()
+        )
+        late = db.execute(
+            _anonymise(AuditLog.user_id == erasure.therapist_id),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        _record(db, erasure, "audit_logs", late)
+        erased = db.execute(
+            _erase_statement("therapist", erasure.therapist_id, 1),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        _record(db, erasure, "therapist", erased)
+        db.commit()
+        return erased
+
+
+def _erase_rows(erasure: LeasedErasure, step: str, limit: int) -> int:
+    if step == "therapist":
+        return _erase_therapist(erasure)
+    with SessionLocal() as db:
+        erased = db.execute(
+            _erase_statement(step, erasure.therapist_id, limit),
+            execution_options={"synchronize_session": False},
+        ).rowcount
+        _record(db, erasure, step, erased)
+        db.commit()
+        return erased
+
+
+def _finish(erasure: LeasedErasure) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(ErasureJob)
+            .where(ErasureJob.id == erasure.id)
+            .values(
+                status="completed",
+                step=None,
+                lease_expires_at=None,
+                completed_at=datetime.now(timezone.utc),
+            )
+        )
+        db.commit()
+
+
+def _record_failure(erasure_id: uuid.UUID, error: str) -> None:
+    # The lease is left to run out; the job is then retried from where it
+    # stopped.
+    with SessionLocal() as db:
+        db.execute(update(ErasureJob).where(ErasureJob.id == erasure_id).values(error=error))
+        db.commit()
+
+
+class ErasureRunner:
+    """Runs erasure jobs step by step in bounded, committed batches.
+
+    Safe to run on every worker node: a job is claimed under a SKIP LOCKED
+    lease, renewed with every batch, and a job whose lease runs out (its
+    node died) resumes elsewhere from its last committed batch.
+    """
+
+    def __init__(
+        self,
+        poll_seconds: float = ERASURE_POLL_SECONDS,
+        batch_size: int = ERASURE_BATCH_SIZE,
+    ):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self._stopping: Optional[asyncio.Event] = None
+        self.completed = 0
+        self.failed_runs = 0
+
+    async def _run_step(self, erasure: LeasedErasure, step: str) -> None:
+        storage = get_storage()
+        cache = get_summary_cache()
+        while True:
+            if step in _STORAGE_STEPS:
+                owned = await asyncio.to_thread(
+                    _owned_objects, step, erasure.therapist_id, self.batch_size
+                )
+                if not owned:
+                    return
+                await asyncio.gather(
+                    *(storage.delete(key) for _, key, _ in owned if key),
+                    *(
+                        cache.delete(erasure.therapist_id, sha256)
+                        for _, _, sha256 in owned
+                        if sha256
+                    ),
+                )
+                await asyncio.to_thread(
+                    _delete_owned, erasure, step, [row_id for row_id, _, _ in owned]
+                )
+                batch = len(owned)
+            else:
+                batch = await asyncio.to_thread(_erase_rows, erasure, step, self.batch_size)
+            if batch < self.batch_size or step == "therapist":
+                return
+
+    async def run_once(self) -> bool:
+        erasure = await asyncio.to_thread(_lease_next, datetime.now(timezone.utc))
+        if erasure is None:
+            return False
+        try:
+            for step in ERASURE_STEPS:
+                await self._run_step(erasure, step)
+        except Exception as exc:
+            logger.exception("Erasure %s failed", erasure.id)
+            self.failed_runs += 1
+            await asyncio.to_thread(_record_failure, erasure.id, type(exc).__name__)
+            return True
+        await asyncio.to_thread(_finish, erasure)
+        logger.info("Erasure %s completed: %s", erasure.id, erasure.progress)
+        self.completed += 1
+        return True
+
+    async def run(self) -> None:
+        self._stopping = asyncio.Event()
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Erasure poll failed")
+                claimed = False
+            if claimed:
+                continue
+            try:
+                async with asyncio.timeout(self.poll_seconds):
+                    await self._stopping.wait()
+            except TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def stats(self) -> dict:
+        return {"completed": self.completed, "failed_runs": self.failed_runs}
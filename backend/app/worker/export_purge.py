@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, update
+
+from app.core.database import SessionLocal
+from app.models.dataExport import DataExport
+from app.services.storage_service import get_storage
+
+logger = logging.getLogger(__name__)
+
+EXPORT_PURGE_ENABLED = os.getenv("EXPORT_PURGE_ENABLED", "true").lower() == "true"
+EXPORT_PURGE_SECONDS = float(os.getenv("EXPORT_PURGE_SECONDS", 600))
+EXPORT_PURGE_BATCH_SIZE = int(os.getenv("EXPORT_PURGE_BATCH_SIZE", 100))
+
+
+def _expired_exports(now: datetime, limit: int) -> List[Tuple[uuid.UUID, Optional[str]]]:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(DataExport.id, DataExport.storage_key)
+            .where(DataExport.status == "completed", DataExport.expires_at <= now)
+            .order_by(DataExport.expires_at)
+            .limit(limit)
+        ).all()
+        return [(row.id, row.storage_key) for row in rows]
+
+
+def _mark_expired(export_ids: List[uuid.UUID]) -> int:
+    with SessionLocal() as db:
+        expired = db.execute(
+            update(DataExport)
+            .where(DataExport.id.in_(export_ids), DataExport.status == "completed")
+            .values(status="expired", storage_key=None, size_bytes=None)
+        ).rowcount
+        db.commit()
+        return expired
+
+
+class ExportPurge:
+    """Deletes data exports once their download window has closed.
+
+    The storage object goes first and the row is then marked expired, so a
+    crash in between only repeats an idempotent delete. Safe on every worker
+    node for the same reason.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = EXPORT_PURGE_SECONDS,
+        batch_size: int = EXPORT_PURGE_BATCH_SIZE,
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._stopping: Optional[asyncio.Event] = None
+        self.purged = 0
+
+    async def run_once(self) -> int:
+        storage = get_storage()
+        purged = 0
+        while True:
+            expired = await asyncio.to_thread(
+                _expired_exports, datetime.now(timezone.utc), self.batch_size
+            )
+            if not expired:
+                break
+            await asyncio.gather(*(storage.delete(key) for _, key in expired if key))
+            purged += await asyncio.to_thread(
+                _mark_expired, [export_id for export_id, _ in expired]
+            )
+            if len(expired) < self.batch_size:
+                break
+        if purged:
+            logger.info("Purged %s expired data exports", purged)
+        self.purged += purged
+        return purged
+
+    async def run(self) -> None:
+        self._stopping = asyncio.Event()
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Data export purge failed")
+            try:
+                async with asyncio.timeout(self.interval_seconds):
+                    await self._stopping.wait()
+            except TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def stats(self) -> dict:
+        return {"purged": self.purged}
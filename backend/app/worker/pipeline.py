@@ -0,0 +1,323 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import traceback
+import uuid
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+
+from app.core.database import SessionLocal
+from app.models.patient import Patient
+from app.models.processingError import ProcessingError
+from app.models.session import Session as SessionModel
+from app.services.queue_service import ProcessingJob
+from app.services.session_service import SessionService, SessionVersionConflict
+from app.services.storage_service import StorageBackend
+from app.services.summary_cache import CachedResult, SummaryCache
+from app.worker.anonymizer import anonymize
+from app.worker.backends import Summarizer, Transcriber
+from app.worker.retry_scheduler import (
+    WORKER_MAX_RETRIES,
+    next_retry_at,
+    resolve_session_errors,
+)
+from app.worker.transcription import SegmentedTranscription
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("download", "transcribe", "summarize", "anonymize", "save", "delete")
+
+WORKER_STAGE_TIMEOUT_SECONDS = float(os.getenv("WORKER_STAGE_TIMEOUT_SECONDS", 600))
+WORKER_MIN_TRANSCRIPT_CHARS = int(os.getenv("WORKER_MIN_TRANSCRIPT_CHARS", 100))
+_MAX_ERROR_MESSAGE = 1000
+_MAX_ERROR_STACK = 8000
+
+
+def stage_limits_from_env() -> dict:
+    # Network-bound stages get wide limits; save is capped well below the
+    # DB pool so workers never starve API requests of connections.
+    defaults = {
+        "download": 16,
+        "transcribe": 8,
+        "summarize": 8,
+        "anonymize": 4,
+        "save": 4,
+        "delete": 16,
+    }
+    return {
+        stage: int(os.getenv(f"WORKER_{stage.upper()}_CONCURRENCY", default))
+        for stage, default in defaults.items()
+    }
+
+
+class StageError(Exception):
+    def __init__(self, stage: str, cause: BaseException):
+        super().__init__(f"{stage} failed: {cause!r}")
+        self.stage = stage
+        self.cause = cause
+
+    @property
+    def error_type(self) -> str:
+        if isinstance(self.cause, TimeoutError):
+            return f"{self.stage}_timeout"
+        return f"{self.stage}_error"
+
+
+@dataclass
+class ClaimedSession:
+    id: uuid.UUID
+    therapist_id: uuid.UUID
+    version: int
+    storage_key: Optional[str]
+    audio_metadata: dict
+    patient_identifier: Optional[str]
+
+
+class StageStats:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "count": self.count,
+            "avg_ms": self.total_seconds / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max_seconds * 1000,
+        }
+
+
+def _claim(job: ProcessingJob) -> Optional[ClaimedSession]:
+    with SessionLocal() as db:
+        session = db.get(
+            SessionModel,
+            job.session_id,
+            options=[undefer(SessionModel.audio_metadata_packed)],
+        )
+        # Stale jobs (session deleted, reprocessed under a new job_id, or
+        # already picked up) are dropped.
+        if (
+            session is None
+            or session.is_deleted
+            or session.job_id != job.job_id
+            or session.processing_status != "queued"
+        ):
+            return None
+        patient_identifier = db.scalar(
+            select(Patient.identifier).where(Patient.id == session.patient_id)
+        )
+        audio_metadata = dict(session.audio_metadata or {})
+        try:
+            version = SessionService.transition_status(
+                db, session.id, session.version, "processing"
+            )
+        except SessionVersionConflict:
+            return None
+        return ClaimedSession(
+            id=session.id,
+            therapist_id=session.therapist_id,
+            version=version,
+            storage_key=audio_metadata.get("storage_key"),
+            audio_metadata=audio_metadata,
+            patient_identifier=patient_identifier,
+        )
+
+
+def _complete(claimed: ClaimedSession, summary: dict, audio_metadata: dict) -> None:
+    with SessionLocal() as db:
+        SessionService.transition_status(
+            db,
+            claimed.id,
+            claimed.version,
+            "completed",
+            summary=summary,
+            audio_metadata=audio_metadata,
+        )
+        resolve_session_errors(db, claimed.id)
+
+
+def _fail(
+    claimed: ClaimedSession, job: ProcessingJob, error: StageError, audio_metadata: dict
+) -> None:
+    retry_count = job.attempt
+    # Only frames, never the exception message, go into the stored stack:
+    # messages can carry transcript text.
+    stack = "".join(traceback.format_tb(error.cause.__traceback__))
+    with SessionLocal() as db:
+        try:
+            SessionService.transition_status(
+                db, claimed.id, claimed.version, "failed", audio_metadata=audio_metadata
+            )
+        except SessionVersionConflict:
+            logger.warning("Session %s changed while failing job %s", claimed.id, job.job_id)
+        db.add(
+            ProcessingError(
+                session_id=claimed.id,
+                job_id=job.job_id,
+                error_type=error.error_type,
+                error_message=(str(error.cause) or type(error.cause).__name__)[
+                    :_MAX_ERROR_MESSAGE
+                ],
+                error_stack=stack[-_MAX_ERROR_STACK:],
+                retry_count=retry_count,
+                max_retries=WORKER_MAX_RETRIES,
+                next_retry_at=next_retry_at(retry_count, datetime.now(timezone.utc)),
+            )
+        )
+        db.commit()
+
+
+class ProcessingPipeline:
+    """download -> transcribe -> summarize -> anonymize -> save -> delete.
+
+    A summary cache hit on the audio's hash skips straight to anonymize.
+
+    Each stage has its own semaphore, so many jobs overlap on the slow
+    network stages while the DB-bound save stage stays narrow. The
+    transcribe limit counts backend calls rather than jobs, since one long
+    session fans out into several segment calls. Database calls run on
+    worker threads with short-lived sync sessions.
+    """
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        summarizer: Summarizer,
+        storage: StorageBackend,
+        stage_limits: dict,
+        cache: SummaryCache,
+        stage_timeout: float = WORKER_STAGE_TIMEOUT_SECONDS,
+    ):
+        self.transcriber = transcriber
+        self.summarizer = summarizer
+        self.storage = storage
+        self.cache = cache
+        self.stage_timeout = stage_timeout
+        self._semaphores = {stage: asyncio.Semaphore(stage_limits[stage]) for stage in STAGES}
+        self.stage_stats = {stage: StageStats(stage_limits[stage]) for stage in STAGES}
+        self.transcription = SegmentedTranscription(
+            transcriber, self._semaphores["transcribe"]
+        )
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    @asynccontextmanager
+    async def _stage(self, stage: str, timings: dict, acquire: bool = True):
+        stats = self.stage_stats[stage]
+        async with self._semaphores[stage] if acquire else nullcontext():
+            stats.active += 1
+            started = time.perf_counter()
+            try:
+                async with asyncio.timeout(self.stage_timeout):
+                    yield
+            except Exception as exc:
+                raise StageError(stage, exc) from exc
+            finally:
+                elapsed = time.perf_counter() - started
+                stats.active -= 1
+                stats.record(elapsed)
+                timings[f"{stage}_ms"] = round(elapsed * 1000, 1)
+
+    async def _summarize_audio(
+        self, claimed: ClaimedSession, timings: dict
+    ) -> Tuple[str, CachedResult]:
+        async with self._stage("download", timings):
+            if not claimed.storage_key:
+                raise ValueError("Session has no storage_key in audio_metadata")
+            audio = await self.storage.read(claimed.storage_key)
+        sha256 = claimed.audio_metadata.get("sha256") or await asyncio.to_thread(
+            lambda: hashlib.sha256(audio).hexdigest()
+        )
+
+        async with self._stage("transcribe", timings, acquire=False):
+            transcript = await self.transcription.transcribe(
+                audio, claimed.audio_metadata, timings
+            )
+            if len(transcript.text) < WORKER_MIN_TRANSCRIPT_CHARS:
+                raise ValueError("Transcript too short, the audio may be corrupted")
+        del audio
+
+        async with self._stage("summarize", timings):
+            summary = await self.summarizer.summarize(transcript)
+        return sha256, CachedResult(transcript.text, transcript.language, summary)
+
+    async def process(self, job: ProcessingJob) -> None:
+        try:
+            await self._process(job)
+        except Exception:
+            # Typically the database going away while recording the outcome;
+            # a session left in processing is failed by the reaper.
+            logger.exception("Job %s failed outside its stages", job.job_id)
+
+    async def _process(self, job: ProcessingJob) -> None:
+        claimed = await asyncio.to_thread(_claim, job)
+        if claimed is None:
+            self.skipped += 1
+            return
+
+        started = time.perf_counter()
+        timings = {"queue_wait_ms": round(max(time.time() - job.enqueued_at, 0) * 1000, 1)}
+        sha256 = claimed.audio_metadata.get("sha256")
+        cached = await self.cache.get(claimed.therapist_id, sha256)
+        try:
+            if cached is None:
+                sha256, cached = await self._summarize_audio(claimed, timings)
+                await self.cache.put(claimed.therapist_id, sha256, cached)
+                cache_status = "miss"
+            else:
+                cache_status = "hit"
+
+            async with self._stage("anonymize", timings):
+                summary = anonymize(cached.summary, [claimed.patient_identifier])
+
+            timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            audio_metadata = {
+                **claimed.audio_metadata,
+                "sha256": sha256,
+                "transcript_language": cached.language,
+                "summary_cache": cache_status,
+                "timings": timings,
+            }
+            async with self._stage("save", timings):
+                await asyncio.to_thread(_complete, claimed, summary, audio_metadata)
+        except StageError as error:
+            self.failed += 1
+            logger.warning("Job %s failed at %s: %s", job.job_id, error.stage, error.error_type)
+            audio_metadata = {**claimed.audio_metadata, "timings": timings}
+            await asyncio.to_thread(_fail, claimed, job, error, audio_metadata)
+            return
+
+        self.completed += 1
+        try:
+            async with self._stage("delete", timings):
+                await self.storage.delete(claimed.storage_key)
+        except StageError as error:
+            # The summary is saved; a leftover upload is an ops problem, not a
+            # failed session.
+            logger.error("Could not delete audio for session %s: %r", claimed.id, error.cause)
+
+    def stats(self) -> dict:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "summary_cache": self.cache.stats(),
+            "stages": {stage: stats.snapshot() for stage, stats in self.stage_stats.items()},
+        }
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, select
+
+from app.core.database import SessionLocal
+from app.models.processingError import ProcessingError
+from app.models.session import Session as SessionModel
+from app.services.session_service import SessionService, SessionVersionConflict
+from app.worker.pipeline import STAGES, WORKER_STAGE_TIMEOUT_SECONDS
+from app.worker.retry_scheduler import WORKER_MAX_RETRIES, next_retry_at
+
+logger = logging.getLogger(__name__)
+
+REAPER_ENABLED = os.getenv("REAPER_ENABLED", "true").lower() == "true"
+REAPER_POLL_SECONDS = float(os.getenv("REAPER_POLL_SECONDS", 60))
+REAPER_BATCH_SIZE = int(os.getenv("REAPER_BATCH_SIZE", 50))
+# Past every stage's timeout a job cannot still be running, so its worker
+# died (or lost the session while recording the outcome).
+WORKER_STALLED_SECONDS = float(
+    os.getenv("WORKER_STALLED_SECONDS", WORKER_STAGE_TIMEOUT_SECONDS * len(STAGES))
+)
+
+
+def _stalled(now: datetime, stalled_seconds: float, limit: int) -> list:
+    with SessionLocal() as db:
+        return db.execute(
+            select(SessionModel.id, SessionModel.version, SessionModel.job_id)
+            .where(
+                SessionModel.processing_status == "processing",
+                SessionModel.processing_started_at
+                < now - timedelta(seconds=stalled_seconds),
+            )
+            .order_by(SessionModel.processing_started_at)
+            .limit(limit)
+        ).all()
+
+
+def _reap(row, now: datetime, stalled_seconds: float) -> bool:
+    """Fail one stalled session with a processing error the retry scheduler
+    picks up. Both land in one commit, and neither if the session moved on."""
+    with SessionLocal() as db:
+        # Failures since the last success: the attempt the lost job was on.
+        attempts = db.scalar(
+            select(func.count())
+            .select_from(ProcessingError)
+            .where(
+                ProcessingError.session_id == row.id,
+                ProcessingError.is_resolved == False,
+            )
+        )
+        db.add(
+            ProcessingError(
+                session_id=row.id,
+                job_id=row.job_id,
+                error_type="worker_lost",
+                error_message=f"Still processing after {stalled_seconds:.0f}s",
+                error_stack="",
+                retry_count=attempts,
+                max_retries=WORKER_MAX_RETRIES,
+                next_retry_at=next_retry_at(attempts, now),
+            )
+        )
+        try:
+            SessionService.transition_status(
+                db, row.id, row.version, "failed", from_status="processing"
+            )
+        except SessionVersionConflict:
+            return False
+        return True
+
+
+class SessionReaper:
+    """Fails sessions left in "processing" by a worker that died.
+
+    Safe on every worker node: each session is failed under its version, so
+    only one node's update (and error row) wins.
+    """
+
+    def __init__(
+        self,
+        poll_seconds: float = REAPER_POLL_SECONDS,
+        batch_size: int = REAPER_BATCH_SIZE,
+        stalled_seconds: float = WORKER_STALLED_SECONDS,
+    ):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self.stalled_seconds = stalled_seconds
+        self._stopping: Optional[asyncio.Event] = None
+        self.reaped = 0
+
+    async def run_once(self) -> int:
+        now = datetime.now(timezone.utc)
+        stalled = await asyncio.to_thread(
+            _stalled, now, self.stalled_seconds, self.batch_size
+        )
+        reaped = 0
+        for row in stalled:
+            if await asyncio.to_thread(_reap, row, now, self.stalled_seconds):
+                logger.warning("Session %s stalled in job %s; marked failed", row.id, row.job_id)
+                reaped += 1
+        self.reaped += reaped
+        return reaped
+
+    async def run(self) -> None:
+        self._stopping = asyncio.Event()
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Session reaper run failed")
+            try:
+                async with asyncio.timeout(self.poll_seconds):
+                    await self._stopping.wait()
+            except TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def stats(self) -> dict:
+        return {"reaped": self.reaped}
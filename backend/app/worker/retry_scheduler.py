@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import os
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.processingError import ProcessingError
+from app.models.session import Session as SessionModel
+from app.services.queue_service import ProcessingJob, QueueFullError, QueueService
+from app.services.session_service import SessionService, SessionVersionConflict
+
+logger = logging.getLogger(__name__)
+
+WORKER_MAX_RETRIES = int(os.getenv("WORKER_MAX_RETRIES", 3))
+WORKER_RETRY_BASE_SECONDS = int(os.getenv("WORKER_RETRY_BASE_SECONDS", 60))
+WORKER_RETRY_MAX_SECONDS = int(os.getenv("WORKER_RETRY_MAX_SECONDS", 3600))
+# Each delay is spread by +/- this fraction so sessions that failed together
+# (a provider outage) do not all come back at the same instant.
+WORKER_RETRY_JITTER = float(os.getenv("WORKER_RETRY_JITTER", 0.2))
+RETRY_SCHEDULER_ENABLED = os.getenv("RETRY_SCHEDULER_ENABLED", "true").lower() == "true"
+RETRY_POLL_SECONDS = float(os.getenv("RETRY_POLL_SECONDS", 15))
+RETRY_BATCH_SIZE = int(os.getenv("RETRY_BATCH_SIZE", 50))
+RETRY_LEASE_SECONDS = int(os.getenv("RETRY_LEASE_SECONDS", 300))
+
+
+def next_retry_at(retry_count: int, now: datetime) -> Optional[datetime]:
+    """When to retry after the ``retry_count``-th retry failed, or None when
+    retries are exhausted."""
+    if retry_count >= WORKER_MAX_RETRIES:
+        return None
+    delay = min(WORKER_RETRY_BASE_SECONDS * 2**retry_count, WORKER_RETRY_MAX_SECONDS)
+    delay *= random.uniform(1 - WORKER_RETRY_JITTER, 1 + WORKER_RETRY_JITTER)
+    return now + timedelta(seconds=delay)
+
+
+def retry_job_id(error_id: uuid.UUID) -> str:
+    # Derived from the error row, so a retry re-sent after a crash carries
+    # the same job_id and is dropped by queue dedup and the worker's claim.
+    return str(uuid.uuid5(error_id, "retry"))
+
+
+@dataclass
+class LeasedRetry:
+    error_id: uuid.UUID
+    session_id: uuid.UUID
+    job_id: str
+    retry_count: int
+
+
+def _lease_due(now: datetime, limit: int) -> List[LeasedRetry]:
+    """Claim due errors for this node.
+
+    SKIP LOCKED lets every node poll at once without blocking on or
+    double-claiming rows. The claim is recorded by pushing next_retry_at a
+    lease into the future, so the row locks only last this short
+    transaction and a node that dies mid-retry hands the row back when the
+    lease runs out.
+    """
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(
+                ProcessingError.id,
+                ProcessingError.session_id,
+                ProcessingError.job_id,
+                ProcessingError.retry_count,
+            )
+            .where(
+                ProcessingError.is_resolved == False,
+                ProcessingError.next_retry_at <= now,
+            )
+            .order_by(ProcessingError.next_retry_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        leased = [LeasedRetry(*row) for row in rows]
+        if leased:
+            db.execute(
+                update(ProcessingError)
+                .where(ProcessingError.id.in_([retry.error_id for retry in leased]))
+                .values(next_retry_at=now + timedelta(seconds=RETRY_LEASE_SECONDS))
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        return leased
+
+
+def _requeue(retry: LeasedRetry) -> Optional[ProcessingJob]:
+    """Move the session back to queued under the retry's job_id.
+
+    Returns None when the retry is moot: the session was deleted, or has
+    moved on from the failed job (reprocessed by hand, or retried already).
+    """
+    job_id = retry_job_id(retry.error_id)
+    with SessionLocal() as db:
+        session = db.get(SessionModel, retry.session_id)
+        if session is None or session.is_deleted:
+            return None
+        job = ProcessingJob(
+            job_id=job_id,
+            session_id=session.id,
+            therapist_id=session.therapist_id,
+            attempt=retry.retry_count + 1,
+        )
+        if session.processing_status == "queued" and session.job_id == job_id:
+            # Requeued by an earlier lease that died before enqueuing.
+            return job
+        if session.processing_status != "failed" or session.job_id != retry.job_id:
+            return None
+        try:
+            SessionService.transition_status(
+                db, session.id, session.version, "queued", job_id=job_id
+            )
+        except SessionVersionConflict:
+            return None
+        return job
+
+
+def _consume(error_id: uuid.UUID) -> None:
+    # The retry is in flight; a new failure writes its own error row.
+    with SessionLocal() as db:
+        db.execute(
+            update(ProcessingError)
+            .where(ProcessingError.id == error_id)
+            .values(next_retry_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+def resolve_session_errors(db: Session, session_id: uuid.UUID) -> None:
+    now = datetime.now(timezone.utc)
+    db.execute(
+        update(ProcessingError)
+        .where(
+            ProcessingError.session_id == session_id,
+            ProcessingError.is_resolved == False,
+        )
+        .values(is_resolved=True, resolved_at=now, next_retry_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+class RetryScheduler:
+    """Polls processing_errors for due retries and re-enqueues their sessions.
+
+    Safe to run on every worker node: claims are made with SKIP LOCKED
+    leases and the re-enqueued job_id is deterministic.
+    """
+
+    def __init__(
+        self,
+        poll_seconds: float = RETRY_POLL_SECONDS,
+        batch_size: int = RETRY_BATCH_SIZE,
+    ):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self._stopping: Optional[asyncio.Event] = None
+        self.requeued = 0
+        self.dropped = 0
+
+    async def run_once(self) -> int:
+        leased = await asyncio.to_thread(
+            _lease_due, datetime.now(timezone.utc), self.batch_size
+        )
+        for retry in leased:
+            job = await asyncio.to_thread(_requeue, retry)
+            if job is not None:
+                try:
+                    await QueueService.enqueue(job)
+                except QueueFullError:
+                    # Leave the lease to expire; the next poll tries again.
+                    logger.warning("Queue full, retry of session %s deferred", retry.session_id)
+                    continue
+                self.requeued += 1
+            else:
+                self.dropped += 1
+            await asyncio.to_thread(_consume, retry.error_id)
+        return len(leased)
+
+    async def run(self) -> None:
+        self._stopping = asyncio.Event()
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Retry scheduler poll failed")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.poll_seconds)
+            except TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def stats(self) -> dict:
+        return {"requeued": self.requeued, "dropped": self.dropped}
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from app.services.queue_service import (
+    QUEUE_BACKEND,
+    ProcessingJob,
+    QueueBackend,
+    get_queue,
+)
+from app.services.storage_service import get_storage
+from app.services.summary_cache import get_summary_cache
+from app.worker.audit_retention import AUDIT_RETENTION_ENABLED, AuditRetention
+from app.worker.backends import get_summarizer, get_transcriber
+from app.worker.erasure import ERASURE_ENABLED, ErasureRunner
+from app.worker.export_purge import EXPORT_PURGE_ENABLED, ExportPurge
+from app.worker.pipeline import ProcessingPipeline, stage_limits_from_env
+from app.worker.reaper import REAPER_ENABLED, SessionReaper
+from app.worker.retry_scheduler import RETRY_SCHEDULER_ENABLED, RetryScheduler
+
+logger = logging.getLogger(__name__)
+
+WORKER_MAX_IN_FLIGHT = int(os.getenv("WORKER_MAX_IN_FLIGHT", 32))
+WORKER_POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", 1))
+# The in-process queue only exists inside the API process, so by default the
+# worker runs there too.
+WORKER_EMBEDDED = (
+    os.getenv("WORKER_EMBEDDED", str(QUEUE_BACKEND == "inprocess")).lower() == "true"
+)
+
+
+class Worker:
+    """Pulls jobs while fewer than ``max_in_flight`` are running.
+
+    A slot is taken before dequeuing, so when the pipeline is saturated jobs
+    wait on the queue (where other workers can take them) instead of in
+    this process.
+    """
+
+    def __init__(self, queue: QueueBackend, pipeline: ProcessingPipeline, max_in_flight: int):
+        self.queue = queue
+        self.pipeline = pipeline
+        self.max_in_flight = max_in_flight
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._tasks: set = set()
+
+    async def run(self) -> None:
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._stopping = asyncio.Event()
+        while not self._stopping.is_set():
+            await self._slots.acquire()
+            job = None
+            if not self._stopping.is_set():
+                job = await self.queue.dequeue(timeout=WORKER_POLL_SECONDS)
+            if job is None:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._handle(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _handle(self, job: ProcessingJob) -> None:
+        try:
+            await self.pipeline.process(job)
+        except Exception:
+            logger.exception("Unhandled error processing job %s", job.job_id)
+        finally:
+            await self.queue.ack(job)
+            self._slots.release()
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._tasks),
+            "max_in_flight": self.max_in_flight,
+            **self.pipeline.stats(),
+        }
+
+
+def build_worker() -> Worker:
+    pipeline = ProcessingPipeline(
+        transcriber=get_transcriber(),
+        summarizer=get_summarizer(),
+        storage=get_storage(),
+        stage_limits=stage_limits_from_env(),
+        cache=get_summary_cache(),
+    )
+    return Worker(get_queue(), pipeline, WORKER_MAX_IN_FLIGHT)
+
+
+def build_retry_scheduler() -> Optional[RetryScheduler]:
+    return RetryScheduler() if RETRY_SCHEDULER_ENABLED else None
+
+
+def build_audit_retention() -> Optional[AuditRetention]:
+    return AuditRetention() if AUDIT_RETENTION_ENABLED else None
+
+
+def build_erasure_runner() -> Optional[ErasureRunner]:
+    return ErasureRunner() if ERASURE_ENABLED else None
+
+
+def build_export_purge() -> Optional[ExportPurge]:
+    return ExportPurge() if EXPORT_PURGE_ENABLED else None
+
+
+def build_reaper() -> Optional[SessionReaper]:
+    return SessionReaper() if REAPER_ENABLED else None
+
+
+_embedded: Optional[Worker] = None
+_embedded_scheduler: Optional[RetryScheduler] = None
+_embedded_retention: Optional[AuditRetention] = None
+_embedded_erasure: Optional[ErasureRunner] = None
+_embedded_purge: Optional[ExportPurge] = None
+_embedded_reaper: Optional[SessionReaper] = None
+_embedded_tasks: list = []
+
+
+def _embedded_services() -> list:
+    services = (
+        _embedded,
+        _embedded_scheduler,
+        _embedded_retention,
+        _embedded_erasure,
+        _embedded_purge,
+        _embedded_reaper,
+    )
+    return [service for service in services if service is not None]
+
+
+def start_embedded_worker() -> None:
+    global _embedded, _embedded_scheduler, _embedded_retention, _embedded_erasure
+    global _embedded_purge, _embedded_reaper
+    if not WORKER_EMBEDDED or _embedded is not None:
+        return
+    _embedded = build_worker()
+    _embedded_scheduler = build_retry_scheduler()
+    _embedded_retention = build_audit_retention()
+    _embedded_erasure = build_erasure_runner()
+    _embedded_purge = build_export_purge()
+    _embedded_reaper = build_reaper()
+    for service in _embedded_services():
+        _embedded_tasks.append(asyncio.create_task(service.run()))
+
+
+async def stop_embedded_worker() -> None:
+    global _embedded, _embedded_scheduler, _embedded_retention, _embedded_erasure
+    global _embedded_purge, _embedded_reaper
+    if _embedded is None:
+        return
+    for service in _embedded_services():
+        service.stop()
+    await asyncio.gather(*_embedded_tasks)
+    _embedded_tasks.clear()
+    _embedded = _embedded_scheduler = _embedded_retention = _embedded_erasure = None
+    _embedded_purge = _embedded_reaper = None
+
+
+def embedded_worker_stats() -> Optional[dict]:
+    if _embedded is None:
+        return None
+    stats = _embedded.stats()
+    if _embedded_scheduler is not None:
+        stats["retries"] = _embedded_scheduler.stats()
+    if _embedded_reaper is not None:
+        stats["reaper"] = _embedded_reaper.stats()
+    if _embedded_retention is not None:
+        stats["audit_retention"] = _embedded_retention.stats()
+    if _embedded_erasure is not None:
+        stats["erasure"] = _embedded_erasure.stats()
+    return stats
@@ -0,0 +1,213 @@
+import asyncio
+import re
+import shutil
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.services.audio_service import AUDIO_PROBE_BYTES, probe_audio
+
+# Silence is searched on 50 ms windows, sampled down to roughly 4 kHz; plenty
+# to find pauses between utterances and fast enough for an hour of audio.
+_WINDOW_SECONDS = 0.05
+_PEAK_SAMPLE_RATE = 4000
+
+
+@dataclass
+class AudioSegment:
+    index: int
+    start_seconds: float
+    end_seconds: float
+    audio: bytes
+
+
+@dataclass
+class _PcmWav:
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    block_align: int
+    data: memoryview
+
+    @property
+    def frames(self) -> int:
+        return len(self.data) // self.block_align
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate
+
+
+def _parse_pcm_wav(audio: bytes) -> Optional[_PcmWav]:
+    info = probe_audio(audio[:AUDIO_PROBE_BYTES])
+    if info.get("format") != "wav" or "data_offset" not in info or not info.get("block_align"):
+        return None
+    start = info["data_offset"]
+    # Piped encoders (ffmpeg) leave the data size unset or too large.
+    end = min(start + info.get("data_size", len(audio)), len(audio))
+    return _PcmWav(
+        channels=info["channels"],
+        sample_rate=info["sample_rate"],
+        bits_per_sample=info["bits_per_sample"],
+        block_align=info["block_align"],
+        data=memoryview(audio)[start:end],
+    )
+
+
+def _wav_bytes(wav: _PcmWav, data: memoryview) -> bytes:
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + len(data),
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        wav.channels,
+        wav.sample_rate,
+        wav.sample_rate * wav.block_align,
+        wav.block_align,
+        wav.bits_per_sample,
+        b"data",
+        len(data),
+    )
+    return header + bytes(data)
+
+
+def _window_peaks(wav: _PcmWav) -> List[int]:
+    samples = array("h")
+    samples.frombytes(wav.data[: len(wav.data) - len(wav.data) % 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    frames_per_window = max(int(wav.sample_rate * _WINDOW_SECONDS), 1)
+    step = max(wav.sample_rate // _PEAK_SAMPLE_RATE, 1) * wav.channels
+    window = frames_per_window * wav.channels
+    peaks = []
+    for start in range(0, len(samples), window):
+        chunk = samples[start : start + window : step]
+        peaks.append(max(max(chunk), -min(chunk)) if chunk else 0)
+    return peaks
+
+
+def _cut_points(wav: _PcmWav, target: float, search: float) -> List[float]:
+    duration = wav.duration
+    # Only 16-bit PCM is scanned for silence; other depths cut on the target.
+    peaks = _window_peaks(wav) if wav.bits_per_sample == 16 else None
+    cuts = []
+    position = 0.0
+    while duration - position > target + search:
+        low = position + target - search
+        high = position + target + search
+        cut = position + target
+        if peaks:
+            first = int(low / _WINDOW_SECONDS)
+            last = min(int(high / _WINDOW_SECONDS), len(peaks))
+            if first < last:
+                quietest = min(range(first, last), key=peaks.__getitem__)
+                cut = (quietest + 0.5) * _WINDOW_SECONDS
+        cuts.append(cut)
+        position = cut
+    return cuts
+
+
+def plan_segments(
+    audio: bytes, target_seconds: float, overlap_seconds: float, search_seconds: float
+) -> Optional[List[AudioSegment]]:
+    """Split PCM WAV audio near ``target_seconds`` at the quietest point
+    within ``search_seconds``. Each segment also repeats the last
+    ``overlap_seconds`` of the previous one, so words on a cut are heard
+    whole by at least one side.
+
+    Returns None for audio that is not PCM WAV.
+    """
+    wav = _parse_pcm_wav(audio)
+    if wav is None:
+        return None
+    duration = wav.duration
+    cuts = _cut_points(wav, target_seconds, search_seconds)
+    if not cuts:
+        return [AudioSegment(0, 0.0, duration, audio)]
+
+    bounds = [0.0, *cuts, duration]
+    segments = []
+    for index in range(len(bounds) - 1):
+        start = max(bounds[index] - overlap_seconds, 0.0) if index else 0.0
+        end = bounds[index + 1]
+        first_byte = int(start * wav.sample_rate) * wav.block_align
+        last_byte = min(int(end * wav.sample_rate) * wav.block_align, len(wav.data))
+        segments.append(
+            AudioSegment(
+                index, start, end, _wav_bytes(wav, wav.data[first_byte:last_byte])
+            )
+        )
+    return segments
+
+
+async def decode_to_wav(audio: bytes, sample_rate: int = 16000) -> Optional[bytes]:
+    """Decode any ffmpeg-readable audio to mono 16-bit PCM WAV, or None when
+    ffmpeg is not installed or cannot read it."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    process = await asyncio.create_subprocess_exec(
+        ffmpeg,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        "pipe:0",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-f",
+        "wav",
+        "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        output, _ = await process.communicate(audio)
+    finally:
+        # A stage timeout or cancellation lands here with ffmpeg still
+        # running; reap it instead of leaving an orphan behind.
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+    if process.returncode != 0 or not output:
+        return None
+    return output
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"\W+", "", word.lower())
+
+
+def _overlap(previous: List[str], current: List[str], max_words: int) -> int:
+    """How many leading words of ``current`` repeat the end of ``previous``."""
+    tail = [_normalize(word) for word in previous[-max_words:]]
+    head = [_normalize(word) for word in current[:max_words]]
+    # The overlap may start with a clipped word on either side, so allow
+    # the match to begin up to two words into the new segment, but demand a
+    # longer match then.
+    for length in range(min(len(tail), len(head)), 1, -1):
+        for skip in range(0, 3 if length > 2 else 1):
+            if head[skip : skip + length] == tail[-length:]:
+                return skip + length
+    return 0
+
+
+def stitch_transcripts(texts: List[str], max_overlap_words: int) -> str:
+    words: List[str] = []
+    for text in texts:
+        current = text.split()
+        if words:
+            current = current[_overlap(words, current, max_overlap_words) :]
+        words.extend(current)
+    return " ".join(words)
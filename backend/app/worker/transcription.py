@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import os
+import time
+from typing import List
+
+from app.worker.backends import Transcriber, Transcript
+from app.worker.segmentation import (
+    AudioSegment,
+    decode_to_wav,
+    plan_segments,
+    stitch_transcripts,
+)
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIBE_SEGMENT_SECONDS = float(os.getenv("TRANSCRIBE_SEGMENT_SECONDS", 300))
+TRANSCRIBE_SEGMENT_OVERLAP_SECONDS = float(os.getenv("TRANSCRIBE_SEGMENT_OVERLAP_SECONDS", 2))
+TRANSCRIBE_SILENCE_SEARCH_SECONDS = float(os.getenv("TRANSCRIBE_SILENCE_SEARCH_SECONDS", 30))
+TRANSCRIBE_FAN_OUT = int(os.getenv("TRANSCRIBE_FAN_OUT", 4))
+TRANSCRIBE_SEGMENT_RETRIES = int(os.getenv("TRANSCRIBE_SEGMENT_RETRIES", 2))
+TRANSCRIBE_RETRY_BASE_SECONDS = float(os.getenv("TRANSCRIBE_RETRY_BASE_SECONDS", 1))
+# Generous bound on speech rate, used to cap the overlap search.
+_WORDS_PER_SECOND = 5
+
+
+class SegmentedTranscription:
+    """Transcribes long audio as silence-aligned segments in parallel.
+
+    ``fan_out`` bounds the segments in flight for one session; ``call_limit``
+    is shared by every session in the worker and bounds calls to the
+    transcription backend overall. A failing segment is retried on its own,
+    so one bad request never costs the whole file.
+    """
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        call_limit: asyncio.Semaphore,
+        segment_seconds: float = TRANSCRIBE_SEGMENT_SECONDS,
+        overlap_seconds: float = TRANSCRIBE_SEGMENT_OVERLAP_SECONDS,
+        search_seconds: float = TRANSCRIBE_SILENCE_SEARCH_SECONDS,
+        fan_out: int = TRANSCRIBE_FAN_OUT,
+        retries: int = TRANSCRIBE_SEGMENT_RETRIES,
+        retry_base_seconds: float = TRANSCRIBE_RETRY_BASE_SECONDS,
+    ):
+        self.transcriber = transcriber
+        self.call_limit = call_limit
+        self.segment_seconds = segment_seconds
+        self.overlap_seconds = overlap_seconds
+        self.search_seconds = min(search_seconds, segment_seconds / 2)
+        self.fan_out = fan_out
+        self.retries = retries
+        self.retry_base_seconds = retry_base_seconds
+
+    async def _segments(self, audio: bytes) -> List[AudioSegment]:
+        options = (self.segment_seconds, self.overlap_seconds, self.search_seconds)
+        segments = await asyncio.to_thread(plan_segments, audio, *options)
+        if segments is None:
+            # Compressed formats are split after decoding to PCM; without
+            # ffmpeg they go to the backend whole.
+            decoded = await decode_to_wav(audio)
+            if decoded is not None:
+                segments = await asyncio.to_thread(plan_segments, decoded, *options)
+        return segments or []
+
+    async def _transcribe_segment(
+        self, segment: AudioSegment, limit: asyncio.Semaphore, durations: dict
+    ) -> Transcript:
+        metadata = {
+            "format": "wav",
+            "segment_index": segment.index,
+            "start_seconds": segment.start_seconds,
+        }
+        async with limit:
+            for attempt in range(self.retries + 1):
+                try:
+                    async with self.call_limit:
+                        started = time.perf_counter()
+                        transcript = await self.transcriber.transcribe(
+                            segment.audio, metadata
+                        )
+                        durations[segment.index] = time.perf_counter() - started
+                        return transcript
+                except Exception as exc:
+                    if attempt == self.retries:
+                        raise
+                    logger.info(
+                        "Segment %s failed (%r), retry %s", segment.index, exc, attempt + 1
+                    )
+                    await asyncio.sleep(self.retry_base_seconds * 2**attempt)
+
+    async def transcribe(
+        self, audio: bytes, audio_metadata: dict, timings: dict
+    ) -> Transcript:
+        segments = await self._segments(audio)
+        if len(segments) <= 1:
+            async with self.call_limit:
+                return await self.transcriber.transcribe(audio, audio_metadata)
+
+        limit = asyncio.Semaphore(self.fan_out)
+        durations: dict = {}
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(self._transcribe_segment(segment, limit, durations))
+                    for segment in segments
+                ]
+        except ExceptionGroup as errors:
+            # The first failure cancels the rest; report it, not the group.
+            raise errors.exceptions[0] from None
+
+        transcripts = [task.result() for task in tasks]
+        timings["segments"] = len(segments)
+        timings["segment_max_ms"] = round(max(durations.values()) * 1000, 1)
+        text = stitch_transcripts(
+            [transcript.text for transcript in transcripts],
+            int(self.overlap_seconds * _WORDS_PER_SECOND) + 2,
+        )
+        return Transcript(text=text, language=transcripts[0].language)
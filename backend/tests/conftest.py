@@ -0,0 +1,101 @@
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+
+# The app reads its configuration at import time, so the environment has to
+# be in place before anything under app/ is imported.
+_TMP = tempfile.mkdtemp(prefix="theramind-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["DATABASE_ASYNC"] = "false"
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["STORAGE_LOCAL_DIR"] = f"{_TMP}/storage"
+os.environ["NOTIFY_BACKEND"] = "inprocess"
+os.environ["QUEUE_BACKEND"] = "inprocess"
+os.environ["SUMMARY_CACHE_BACKEND"] = "memory"
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateTable, DropTable
+
+from app.core.database import SessionLocal, engine
+from app.models import Patient, ProcessingError, Session, SessionRollup, Therapist
+
+# SQLite stand-ins for the PostgreSQL-only types and functions the models
+# use. Indexes are not created: several are PostgreSQL-specific.
+compiles(JSONB, "sqlite")(lambda type_, compiler, **kw: "JSON")
+compiles(TSVECTOR, "sqlite")(lambda type_, compiler, **kw: "TEXT")
+
+
+@event.listens_for(engine, "connect")
+def _register_functions(dbapi_connection, connection_record):
+    for name, arity, function in (
+        ("to_tsvector", 2, lambda config, text: text),
+        ("session_search_config", 1, lambda audio_metadata: "simple"),
+        ("session_summary_text", 1, lambda summary: summary),
+    ):
+        dbapi_connection.create_function(name, arity, function, deterministic=True)
+
+
+TABLES = [
+    Therapist.__table__,
+    Patient.__table__,
+    Session.__table__,
+    ProcessingError.__table__,
+    SessionRollup.__table__,
+]
+
+
+@pytest.fixture(autouse=True)
+def tables():
+    with engine.begin() as connection:
+        for table in TABLES:
+            connection.execute(CreateTable(table))
+    yield
+    with engine.begin() as connection:
+        for table in reversed(TABLES):
+            connection.execute(DropTable(table))
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as db:
+        yield db
+
+
+@pytest.fixture
+def patient(db):
+    therapist = Therapist(
+        email=f"{uuid.uuid4().hex}@example.com",
+        hashed_password="x",
+        full_name="Therapist",
+    )
+    db.add(therapist)
+    db.flush()
+    patient = Patient(identifier="P-001", therapist_id=therapist.id)
+    db.add(patient)
+    db.commit()
+    return patient
+
+
+@pytest.fixture
+def make_session(db, patient):
+    def make(processing_status: str = "pending", **values) -> Session:
+        session = Session(
+            therapist_id=patient.therapist_id,
+            patient_id=patient.id,
+            session_date=datetime(2026, 3, 2, 14, tzinfo=timezone.utc),
+            session_duration_minutes=50,
+            processing_status=processing_status,
+            job_id=values.pop("job_id", str(uuid.uuid4())),
+            audio_metadata=values.pop("audio_metadata", {}),
+            summary=values.pop("summary", {}),
+            **values,
+        )
+        db.add(session)
+        db.commit()
+        return session
+
+    return make
@@ -0,0 +1,168 @@
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.worker import audit_retention
+from app.worker.audit_retention import (
+    AuditRetention,
+    _maintain,
+    partition_end,
+    retention_cutoff,
+)
+
+
+class FakeConnection:
+    """Records the SQL the maintenance code issues; PostgreSQL is not needed
+    to check which statements run, in which order, and what is cleaned up."""
+
+    def __init__(self, attached=(), detached=(), locked=True):
+        self.attached = list(attached)
+        self.detached = list(detached)
+        self.locked = locked
+        self.fail_on = None
+        self.statements = []
+        self.invalidated = False
+        self.closed = False
+
+    def execution_options(self, **options):
+        return self
+
+    def execute(self, statement, parameters=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError(f"failed: {sql}")
+        if "pg_try_advisory_lock" in sql:
+            return SimpleNamespace(scalar=lambda: self.locked)
+        return SimpleNamespace(all=lambda: self.attached)
+
+    def scalars(self, statement):
+        self.statements.append(str(statement))
+        return SimpleNamespace(all=lambda: self.detached)
+
+    def invalidate(self):
+        self.invalidated = True
+
+    def close(self):
+        self.closed = True
+
+    def issued(self, fragment: str) -> list:
+        return [sql for sql in self.statements if fragment in sql]
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    connection = FakeConnection()
+    monkeypatch.setattr(
+        audit_retention, "engine", SimpleNamespace(connect=lambda: connection)
+    )
+    return connection
+
+
+@pytest.fixture
+def archived(monkeypatch):
+    names = []
+
+    async def archive_partition(self, name):
+        names.append(name)
+        return f"audit-archive/{name}.ndjson.gz"
+
+    monkeypatch.setattr(AuditRetention, "archive_partition", archive_partition)
+    return names
+
+
+def test_retention_cutoff():
+    assert retention_cutoff(date(2026, 10, 18), 24) == date(2024, 10, 1)
+    assert retention_cutoff(date(2026, 1, 31), 1) == date(2025, 12, 1)
+
+
+def test_partition_end():
+    assert partition_end("audit_logs_y2024m11") == date(2024, 12, 1)
+    assert partition_end("audit_logs_y2024m12") == date(2025, 1, 1)
+    assert partition_end("audit_logs_default") is None
+
+
+def test_expired_partitions_are_detached_without_concurrently():
+    connection = FakeConnection(
+        attached=[
+            ("audit_logs_y2024m09", False),
+            ("audit_logs_y2024m10", False),
+            ("audit_logs_default", False),
+        ],
+        detached=["audit_logs_y2024m09"],
+    )
+
+    detached = _maintain(connection, date(2026, 10, 18), date(2024, 10, 1))
+
+    assert detached == ["audit_logs_y2024m09"]
+    assert connection.issued("DETACH PARTITION") == [
+        'ALTER TABLE audit_logs DETACH PARTITION "audit_logs_y2024m09"'
+    ]
+    assert connection.issued("CONCURRENTLY") == []
+    # The detach runs under a lock timeout, which is reset afterwards.
+    detach = connection.statements.index(connection.issued("DETACH PARTITION")[0])
+    assert connection.statements[detach - 1].startswith("SET lock_timeout")
+    assert connection.statements[detach + 1] == "RESET lock_timeout"
+
+
+def test_interrupted_concurrent_detach_is_finalized():
+    connection = FakeConnection(attached=[("audit_logs_y2024m09", True)])
+
+    _maintain(connection, date(2026, 10, 18), date(2024, 10, 1))
+
+    assert connection.issued("DETACH PARTITION") == [
+        'ALTER TABLE audit_logs DETACH PARTITION "audit_logs_y2024m09" FINALIZE'
+    ]
+
+
+def test_lock_timeout_is_reset_when_the_detach_fails():
+    connection = FakeConnection(attached=[("audit_logs_y2024m09", False)])
+    connection.fail_on = "DETACH PARTITION"
+
+    with pytest.raises(RuntimeError):
+        _maintain(connection, date(2026, 10, 18), date(2024, 10, 1))
+
+    assert connection.statements[-1] == "RESET lock_timeout"
+
+
+def test_run_once_archives_detached_partitions(connection, archived):
+    connection.detached = ["audit_logs_y2024m08", "audit_logs_y2024m09"]
+
+    keys = asyncio.run(AuditRetention(retention_months=24).run_once())
+
+    assert archived == ["audit_logs_y2024m08", "audit_logs_y2024m09"]
+    assert keys == [f"audit-archive/{name}.ndjson.gz" for name in archived]
+    assert len(connection.issued("pg_advisory_unlock")) == 1
+    assert connection.closed
+
+
+def test_run_once_skips_when_another_node_holds_the_lock(connection, archived):
+    connection.locked = False
+
+    assert asyncio.run(AuditRetention().run_once()) == []
+    assert connection.issued("audit_logs_ensure_partitions") == []
+    assert connection.issued("pg_advisory_unlock") == []
+    assert archived == []
+    assert connection.closed
+
+
+def test_run_once_releases_the_lock_when_maintenance_fails(connection, archived):
+    connection.fail_on = "audit_logs_ensure_partitions"
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(AuditRetention().run_once())
+
+    assert len(connection.issued("pg_advisory_unlock")) == 1
+    assert not connection.invalidated
+    assert connection.closed
+
+
+def test_run_once_discards_the_connection_when_unlock_fails(connection, archived):
+    connection.fail_on = "pg_advisory_unlock"
+
+    asyncio.run(AuditRetention().run_once())
+
+    assert connection.invalidated
+    assert connection.closed
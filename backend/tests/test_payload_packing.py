@@ -0,0 +1,169 @@
+import importlib.util
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import undefer
+
+from app.core import compression
+from app.models import Session
+from app.models.session import pack_payload, unpack_payload
+
+UPLOAD = {"parts": [{"number": n, "etag": f"{n:032x}"} for n in range(1, 101)]}
+SMALL_UPLOAD = {"parts": [{"number": 1, "etag": "0" * 32}]}
+AUDIO_METADATA = {"format": "mp3", "storage_key": "audio/1", "upload": UPLOAD}
+
+_MIGRATION = (
+    Path(__file__).resolve().parents[1]
+    / "alembic/versions/e3b6a1d8f954_repacks_sessions_payloads_by_size.py"
+)
+
+
+def _migration():
+    pytest.importorskip("alembic.op")
+    spec = importlib.util.spec_from_file_location("repack_migration", _MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_large_packed_keys_move_to_the_packed_column():
+    values = pack_payload({"audio_metadata": AUDIO_METADATA, "summary": {"a": 1}})
+
+    assert values["audio_metadata"] == {"format": "mp3", "storage_key": "audio/1"}
+    assert values["audio_metadata_packed"] == {"upload": UPLOAD}
+    # summary has no packed keys, so it is written whole.
+    assert values["summary"] == {"a": 1}
+    assert values["summary_packed"] is None
+    assert unpack_payload(values) == {
+        "audio_metadata": AUDIO_METADATA,
+        "summary": {"a": 1},
+    }
+
+
+def test_small_packed_keys_stay_inline():
+    audio_metadata = {**AUDIO_METADATA, "upload": SMALL_UPLOAD}
+    values = pack_payload({"audio_metadata": audio_metadata})
+
+    assert values["audio_metadata"] == audio_metadata
+    assert values["audio_metadata_packed"] is None
+    assert unpack_payload(values) == {"audio_metadata": audio_metadata}
+
+
+def test_nothing_is_packed_with_the_codec_off(monkeypatch):
+    monkeypatch.setattr(compression, "SESSION_PAYLOAD_CODEC", "off")
+    values = pack_payload({"audio_metadata": AUDIO_METADATA})
+
+    assert values["audio_metadata"] == AUDIO_METADATA
+    assert values["audio_metadata_packed"] is None
+
+
+def test_columns_not_written_are_left_alone():
+    values = pack_payload({"processing_status": "queued"})
+
+    assert values == {"processing_status": "queued"}
+    assert unpack_payload(values) == values
+
+
+def test_packing_clears_a_previously_packed_key():
+    # An upload that finished and was dropped from audio_metadata must not
+    # survive in the packed column.
+    values = pack_payload({"audio_metadata": {"format": "mp3"}})
+
+    assert values["audio_metadata_packed"] is None
+
+
+@pytest.mark.parametrize("codec", ["zstd", "zlib"])
+def test_codecs_read_each_others_payloads(monkeypatch, codec):
+    data = json.dumps(UPLOAD).encode()
+    monkeypatch.setattr(compression, "SESSION_PAYLOAD_CODEC", codec)
+    packed = compression.compress(data)
+    monkeypatch.setattr(
+        compression, "SESSION_PAYLOAD_CODEC", "zlib" if codec == "zstd" else "zstd"
+    )
+
+    assert len(packed) < len(data)
+    assert compression.decompress(packed) == data
+
+
+def test_unknown_codec_is_refused_at_startup(monkeypatch):
+    monkeypatch.setattr(compression, "SESSION_PAYLOAD_CODEC", "lz4")
+
+    with pytest.raises(ValueError):
+        compression.check_payload_codec()
+
+
+def test_missing_zstd_is_refused_at_startup(monkeypatch):
+    monkeypatch.setattr(compression, "_zstd_codec", None)
+
+    with pytest.raises(RuntimeError):
+        compression.check_payload_codec()
+    with pytest.raises(RuntimeError):
+        compression.compress(b"{}")
+
+
+def test_packed_keys_are_merged_back_on_load(db, make_session):
+    session = make_session("pending")
+    db.execute(
+        update(Session)
+        .where(Session.id == session.id)
+        .values(**pack_payload({"audio_metadata": AUDIO_METADATA}))
+    )
+    db.commit()
+    db.expire_all()
+
+    stored = db.execute(
+        select(Session.audio_metadata, Session.audio_metadata_packed).where(
+            Session.id == session.id
+        )
+    ).one()
+    assert "upload" not in stored.audio_metadata
+    assert stored.audio_metadata_packed == {"upload": UPLOAD}
+    assert unpack_payload(dict(stored._mapping)) == {"audio_metadata": AUDIO_METADATA}
+
+    db.expire_all()
+    loaded = db.scalars(
+        select(Session)
+        .where(Session.id == session.id)
+        .options(undefer(Session.audio_metadata_packed))
+    ).one()
+    assert loaded.audio_metadata == AUDIO_METADATA
+
+
+def test_migration_repacks_rows_by_size():
+    migration = _migration()
+    timings = {"transcribe": 1.5}
+    row = SimpleNamespace(
+        id="00000000-0000-0000-0000-000000000001",
+        version=3,
+        audio_metadata={"format": "mp3"},
+        summary={"a": 1},
+        # Packed under the old key list: a small upload and the timings.
+        audio_metadata_packed=compression.compress(
+            json.dumps({"upload": SMALL_UPLOAD, "timings": timings}).encode()
+        ),
+        summary_packed=None,
+    )
+
+    values = migration._repack(row)
+
+    assert json.loads(values["audio_metadata"]) == {
+        "format": "mp3",
+        "upload": SMALL_UPLOAD,
+        "timings": timings,
+    }
+    assert values["audio_metadata_packed"] is None
+    assert json.loads(values["summary"]) == {"a": 1}
+    assert values["summary_packed"] is None
+
+    row.audio_metadata_packed = compression.compress(
+        json.dumps({"upload": UPLOAD}).encode()
+    )
+    values = migration._repack(row)
+
+    assert json.loads(values["audio_metadata"]) == {"format": "mp3"}
+    assert json.loads(
+        compression.decompress(values["audio_metadata_packed"])
+    ) == {"upload": UPLOAD}
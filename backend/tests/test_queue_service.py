@@ -0,0 +1,79 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from app.services.queue_service import (
+    InProcessQueueBackend,
+    ProcessingJob,
+    QueueFullError,
+)
+
+
+def _job(job_id: str = "job-1") -> ProcessingJob:
+    return ProcessingJob(job_id=job_id, session_id=uuid.uuid4(), therapist_id=uuid.uuid4())
+
+
+def _run(coroutine_function):
+    # The in-process queue binds to the loop it is first used on.
+    return asyncio.run(coroutine_function(InProcessQueueBackend(10, 3600)))
+
+
+def test_enqueue_dedups_on_job_id():
+    async def scenario(backend):
+        assert await backend.enqueue(_job()) is True
+        assert await backend.enqueue(_job()) is False
+        assert await backend.enqueue(_job("job-2")) is True
+        return await backend.depth()
+
+    assert _run(scenario) == 2
+
+
+def test_ack_releases_the_job_id():
+    async def scenario(backend):
+        await backend.enqueue(_job())
+        job = await backend.dequeue(timeout=0)
+        # Still guarded while in flight.
+        assert await backend.enqueue(_job()) is False
+        await backend.ack(job)
+        return await backend.enqueue(_job())
+
+    assert _run(scenario) is True
+
+
+def test_dequeue_with_zero_timeout_does_not_block():
+    async def scenario(backend):
+        started = time.monotonic()
+        job = await backend.dequeue(timeout=0)
+        return job, time.monotonic() - started
+
+    job, waited = _run(scenario)
+    assert job is None
+    assert waited < 0.1
+
+
+def test_dequeue_returns_jobs_in_order():
+    async def scenario(backend):
+        for job_id in ("a", "b", "c"):
+            await backend.enqueue(_job(job_id))
+        return [(await backend.dequeue(timeout=1)).job_id for _ in range(3)]
+
+    assert _run(scenario) == ["a", "b", "c"]
+
+
+def test_full_queue_raises_and_keeps_the_job_id_free():
+    async def scenario(backend):
+        for index in range(10):
+            await backend.enqueue(_job(f"job-{index}"))
+        with pytest.raises(QueueFullError):
+            await backend.enqueue(_job("overflow"))
+        await backend.ack(await backend.dequeue(timeout=0))
+        return await backend.enqueue(_job("overflow"))
+
+    assert _run(scenario) is True
+
+
+def test_job_json_round_trip():
+    job = _job()
+    assert ProcessingJob.from_json(job.to_json()) == job
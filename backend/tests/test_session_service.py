@@ -0,0 +1,128 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from app.models import Session, SessionRollup
+from app.schemas.session import SessionCreate
+from app.services.session_service import (
+    PROCESSING_TRANSITIONS,
+    SessionService,
+    SessionVersionConflict,
+    _transition_statement,
+)
+
+STATUSES = sorted(PROCESSING_TRANSITIONS)
+TARGETS = sorted(set().union(*PROCESSING_TRANSITIONS.values()))
+
+
+def _reload(db, session: Session) -> Session:
+    db.expire_all()
+    return db.get(Session, session.id)
+
+
+@pytest.mark.parametrize(
+    "source,target",
+    [
+        (source, target)
+        for source, targets in PROCESSING_TRANSITIONS.items()
+        for target in targets
+    ],
+)
+def test_allowed_transition_bumps_version(db, make_session, source, target):
+    session = make_session(source)
+
+    version = SessionService.transition_status(
+        db, session.id, session.version, target, from_status=source
+    )
+
+    session = _reload(db, session)
+    assert session.processing_status == target
+    assert session.version == version == 2
+
+
+@pytest.mark.parametrize(
+    "source,target",
+    [
+        (source, target)
+        for source in STATUSES
+        for target in TARGETS
+        if target not in PROCESSING_TRANSITIONS[source]
+    ],
+)
+def test_disallowed_transition_is_a_conflict(db, make_session, source, target):
+    session = make_session(source)
+
+    with pytest.raises(SessionVersionConflict):
+        SessionService.transition_status(db, session.id, session.version, target)
+
+    session = _reload(db, session)
+    assert session.processing_status == source
+    assert session.version == 1
+
+
+def test_stale_version_is_a_conflict(db, make_session):
+    session = make_session("pending")
+    SessionService.transition_status(db, session.id, 1, "queued")
+
+    with pytest.raises(SessionVersionConflict):
+        SessionService.transition_status(db, session.id, 1, "processing")
+
+    assert _reload(db, session).processing_status == "queued"
+
+
+def test_leaving_completed_must_be_named(db, make_session):
+    session = make_session("completed")
+
+    with pytest.raises(SessionVersionConflict):
+        SessionService.transition_status(db, session.id, 1, "queued")
+
+    SessionService.transition_status(
+        db, session.id, 1, "queued", from_status="completed"
+    )
+    session = _reload(db, session)
+    assert session.processing_status == "queued"
+    assert session.processing_completed_at is None
+
+
+def test_processing_timestamps(db, make_session):
+    session = make_session("queued")
+
+    SessionService.transition_status(db, session.id, 1, "processing")
+    session = _reload(db, session)
+    assert session.processing_started_at is not None
+    assert session.processing_completed_at is None
+
+    SessionService.transition_status(db, session.id, 2, "failed")
+    assert _reload(db, session).processing_completed_at is not None
+
+
+def test_completion_is_counted_and_reprocess_takes_it_back(db, make_session):
+    session = make_session("processing")
+
+    SessionService.transition_status(db, session.id, 1, "completed")
+    rollup = db.scalars(select(SessionRollup)).one()
+    assert (rollup.session_count, rollup.total_minutes) == (1, 50)
+
+    SessionService.transition_status(
+        db, session.id, 2, "queued", from_status="completed"
+    )
+    db.expire_all()
+    rollup = db.scalars(select(SessionRollup)).one()
+    assert (rollup.session_count, rollup.total_minutes) == (0, 0)
+
+
+@pytest.mark.parametrize("status", ["pending", "archived"])
+def test_unreachable_status_is_rejected(status):
+    with pytest.raises(ValueError):
+        _transition_statement(None, 1, status, {})
+
+
+@pytest.mark.parametrize("key", ["storage_key", "sha256", "upload"])
+def test_create_rejects_server_audio_keys(patient, key):
+    with pytest.raises(ValidationError):
+        SessionCreate(
+            patient_id=patient.id,
+            session_date="2026-03-02T14:00:00Z",
+            session_duration_minutes=50,
+            audio_metadata={"format": "mp3", key: "x"},
+        )
@@ -0,0 +1,99 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.models import ProcessingError, Session
+from app.services.queue_service import ProcessingJob
+from app.services.session_service import SessionService
+from app.worker import reaper as reaper_module
+from app.worker.pipeline import _claim
+from app.worker.reaper import SessionReaper
+
+
+def _job(session: Session, job_id: Optional[str] = None) -> ProcessingJob:
+    return ProcessingJob(
+        job_id=job_id or session.job_id,
+        session_id=session.id,
+        therapist_id=session.therapist_id,
+    )
+
+
+def _reload(db, session: Session) -> Session:
+    db.expire_all()
+    return db.get(Session, session.id)
+
+
+def test_claim_moves_a_queued_session_to_processing(db, make_session):
+    session = make_session("queued", audio_metadata={"storage_key": "audio/1"})
+
+    claimed = _claim(_job(session))
+
+    assert claimed.version == 2
+    assert claimed.storage_key == "audio/1"
+    assert claimed.patient_identifier == "P-001"
+    assert _reload(db, session).processing_status == "processing"
+
+
+def test_claim_happens_once(db, make_session):
+    session = make_session("queued")
+
+    assert _claim(_job(session)) is not None
+    assert _claim(_job(session)) is None
+
+
+def test_claim_drops_stale_jobs(db, make_session):
+    reprocessed = make_session("queued")
+    deleted = make_session("queued", is_deleted=True)
+    pending = make_session("pending")
+
+    assert _claim(_job(reprocessed, job_id="old-job")) is None
+    assert _claim(_job(deleted)) is None
+    assert _claim(_job(pending)) is None
+    assert _claim(
+        ProcessingJob(job_id="x", session_id=uuid.uuid4(), therapist_id=uuid.uuid4())
+    ) is None
+    assert _reload(db, reprocessed).processing_status == "queued"
+
+
+def test_reaper_fails_stalled_sessions(db, make_session):
+    now = datetime.now(timezone.utc)
+    stalled = make_session(
+        "processing", processing_started_at=now - timedelta(hours=2)
+    )
+    running = make_session("processing", processing_started_at=now)
+
+    reaper = SessionReaper(stalled_seconds=3600)
+    assert asyncio.run(reaper.run_once()) == 1
+
+    assert _reload(db, stalled).processing_status == "failed"
+    assert _reload(db, running).processing_status == "processing"
+    error = db.scalars(select(ProcessingError)).one()
+    assert error.session_id == stalled.id
+    assert error.job_id == stalled.job_id
+    assert error.error_type == "worker_lost"
+    assert error.retry_count == 0
+    assert error.next_retry_at is not None
+    assert reaper.stats() == {"reaped": 1}
+
+
+def test_reaper_skips_sessions_that_moved_on(db, make_session, monkeypatch):
+    session = make_session(
+        "processing",
+        processing_started_at=datetime.now(timezone.utc) - timedelta(hours=2),
+    )
+    stalled = reaper_module._stalled
+
+    def finish_first(*args):
+        # The worker records its outcome between the scan and the reap.
+        rows = stalled(*args)
+        SessionService.transition_status(db, session.id, 1, "completed")
+        return rows
+
+    monkeypatch.setattr(reaper_module, "_stalled", finish_first)
+
+    assert asyncio.run(SessionReaper(stalled_seconds=3600).run_once()) == 0
+    assert _reload(db, session).processing_status == "completed"
+    assert db.scalars(select(ProcessingError)).all() == []